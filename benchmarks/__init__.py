@@ -0,0 +1 @@
+"""Бенчмарки СЭТ. Запуск: python -m benchmarks.<модуль> --help"""
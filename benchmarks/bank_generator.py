@@ -0,0 +1,178 @@
+"""Детерминированный генератор синтетических банков вопросов.
+
+    python -m benchmarks.bank_generator OUT --files 200 --questions 60 --depth 3 --seed 1
+    python -m benchmarks.bank_generator OUT --mix single=5,multiple=2,matching=2,freeform=1 --image-ratio 0.3
+
+Одинаковые параметры и seed дают байт-в-байт одинаковые файлы: папки
+и тексты на кириллице, все четыре типа вопросов в заданной пропорции,
+ссылки на картинки из общей папки images/ в корне банка.
+"""
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+QUESTION_TYPES = ("single", "multiple", "matching", "freeform")
+DEFAULT_MIX = {"single": 4, "multiple": 3, "matching": 2, "freeform": 1}
+
+FOLDER_WORDS = ("Раздел", "Тема", "Модуль", "Глава", "Блок")
+SUBJECT_WORDS = (
+    "электробезопасность", "охрана труда", "пожарная безопасность", "теплотехника",
+    "сети связи", "ёмкость канала", "релейная защита", "метрология", "гидравлика", "сварка",
+)
+TEXT_WORDS = (
+    "какой", "параметр", "определяет", "допустимое", "значение", "напряжения", "при", "работе",
+    "оборудования", "в", "условиях", "повышенной", "влажности", "согласно", "правилам", "эксплуатации",
+    "установки", "защиты", "линии", "нагрузки", "схемы", "измерения", "сопротивления", "изоляции",
+)
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """«single=4,multiple=3» → веса типов; неуказанные типы не генерируются."""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in QUESTION_TYPES:
+            raise ValueError(f"Неизвестный тип вопроса: {name}")
+        mix[name] = int(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Пустая смесь типов вопросов")
+    return mix
+
+
+@dataclass
+class BankSpec:
+    files: int = 50
+    questions: int = 40
+    depth: int = 2
+    fanout: int = 4
+    mix: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    image_ratio: float = 0.2
+    images: int = 20
+    seed: int = 1
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(TEXT_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:]
+
+
+def bank_lines(title: str, questions: int, rng: random.Random, mix: Optional[Dict[str, int]] = None,
+               image_names: Sequence[str] = (), image_ratio: float = 0.0, kinds: Optional[Sequence[str]] = None) -> List[str]:
+    """Строки одного файла банка в формате парсера.
+
+    kinds — явная последовательность типов по кругу (как в прогоне киоска);
+    иначе типы выбираются по весам mix.
+    """
+    mix = mix or DEFAULT_MIX
+    names, weights = zip(*[(k, w) for k, w in mix.items() if w > 0])
+    lines = [title, ""]
+    for n in range(questions):
+        kind = kinds[n % len(kinds)] if kinds else rng.choices(names, weights)[0]
+        image = ""
+        if image_names and rng.random() < image_ratio:
+            image = f" !(Рисунок {n + 1})[{rng.choice(image_names)}]"
+        text = f"{_sentence(rng, rng.randint(5, 14))} {n + 1}?"
+
+        if kind == "single":
+            count = rng.randint(3, 5)
+            lines += [f"{n + 1}. {text}{image}"]
+            lines += [f"{chr(65 + i)}) {_sentence(rng, rng.randint(1, 4))}" for i in range(count)]
+            lines.append(chr(65 + rng.randrange(count)))
+        elif kind == "multiple":
+            count = rng.randint(4, 6)
+            lines += [f"{n + 1}. {text}{image}"]
+            lines += [f"{chr(65 + i)}) {_sentence(rng, rng.randint(1, 4))}" for i in range(count)]
+            answer = sorted(rng.sample(range(count), rng.randint(2, count - 1)))
+            lines.append(", ".join(chr(65 + i) for i in answer))
+        elif kind == "matching":
+            pairs = rng.randint(2, 4)
+            lines += [f"{n + 1}. Сопоставьте: {text}{image}"]
+            lines += [f"{chr(65 + i)}) {_sentence(rng, 2)}" for i in range(pairs)]
+            lines += [f"{chr(65 + pairs + i)}) {_sentence(rng, 2)}" for i in range(pairs)]
+            values = list(range(pairs))
+            rng.shuffle(values)
+            lines.append(", ".join(f"{chr(65 + i)}-{chr(65 + pairs + v)}" for i, v in enumerate(values)))
+        else:
+            lines += [f"{n + 1}. {text}{image}", rng.choice(SUBJECT_WORDS)]
+        lines.append("")
+    return lines
+
+
+def write_bank(path: str, lines: List[str]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lines))
+
+
+def write_images(images_dir: str, count: int, rng: random.Random, size=(64, 48)) -> List[str]:
+    """Маленькие однотонные PNG: сами картинки бенчмаркам не важны, важны ссылки на них."""
+    from PIL import Image
+
+    os.makedirs(images_dir, exist_ok=True)
+    names = []
+    for n in range(count):
+        name = f"рис_{n:03d}.png"
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        Image.new("RGB", size, color).save(os.path.join(images_dir, name))
+        names.append(name)
+    return names
+
+
+def _folder_path(index: int, spec: BankSpec, rng: random.Random) -> List[str]:
+    parts = []
+    for level in range(rng.randint(0, spec.depth)):
+        word = FOLDER_WORDS[level % len(FOLDER_WORDS)]
+        parts.append(f"{word} {(index + level * 7) % spec.fanout + 1}")
+    return parts
+
+
+def generate_banks(target_dir: str, spec: BankSpec) -> List[str]:
+    """Пишет spec.files банков во вложенные папки target_dir. Возвращает пути файлов."""
+    rng = random.Random(spec.seed)
+    image_names = write_images(os.path.join(target_dir, "images"), spec.images, rng) if spec.images and spec.image_ratio > 0 else []
+
+    paths = []
+    for index in range(spec.files):
+        folder = os.path.join(target_dir, *_folder_path(index, spec, rng))
+        subject = SUBJECT_WORDS[index % len(SUBJECT_WORDS)]
+        path = os.path.join(folder, f"банк_{index:04d}.txt")
+        lines = bank_lines(f"{subject.capitalize()}, билет {index + 1}", spec.questions, rng, spec.mix, image_names, spec.image_ratio)
+        write_bank(path, lines)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target", help="папка для банков (создаётся)")
+    parser.add_argument("--files", type=int, default=BankSpec.files)
+    parser.add_argument("--questions", type=int, default=BankSpec.questions, help="вопросов в файле")
+    parser.add_argument("--depth", type=int, default=BankSpec.depth, help="наибольшая вложенность папок")
+    parser.add_argument("--fanout", type=int, default=BankSpec.fanout, help="папок на уровне")
+    parser.add_argument("--mix", default="single=4,multiple=3,matching=2,freeform=1", help="веса типов вопросов")
+    parser.add_argument("--image-ratio", type=float, default=BankSpec.image_ratio, help="доля вопросов с картинкой")
+    parser.add_argument("--images", type=int, default=BankSpec.images, help="различных картинок")
+    parser.add_argument("--seed", type=int, default=BankSpec.seed)
+    args = parser.parse_args(argv)
+
+    spec = BankSpec(
+        files=args.files, questions=args.questions, depth=args.depth, fanout=args.fanout,
+        mix=parse_mix(args.mix), image_ratio=args.image_ratio, images=args.images, seed=args.seed,
+    )
+    paths = generate_banks(args.target, spec)
+    print(f"Создано банков: {len(paths)} в {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Проверка холодного старта: сколько стоит `import main` до первого экрана.
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --runs 7 --budget-ms 250 --json
+
+Каждый прогон — отдельный процесс с `python -X importtime`, из его вывода
+берётся накопленное время импорта main. Код возврата 1 — если медиана
+превысила бюджет или до главного окна загрузился модуль, который должен
+грузиться при первом использовании (экран теста, результаты, Telegram...).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Set, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 300.0
+
+# Эти модули главному окну не нужны и должны импортироваться лениво
+DEFERRED_MODULES = (
+    "ui.name_input",
+    "ui.preparation",
+    "ui.quiz_window",
+    "ui.results_window",
+    "ui.error_review_window",
+    "ui.test_selection_window",
+    "ui.settings_window",
+    "ui.widgets.zoom_viewer",
+    "core.quiz_logic",
+    "core.bank_catalog",
+    "core.search_index",
+    "core.image_loader",
+    "core.image_pyramid",
+    "core.thumbnail_cache",
+    "services.telegram_service",
+    "urllib.request",
+)
+OWN_PACKAGES = ("core", "ui", "services", "main")
+
+
+def _import_once() -> Tuple[Dict[str, Tuple[int, int]], str]:
+    """Один холодный импорт: {модуль: (собственное, накопленное) мкс}."""
+    code = f"import sys; sys.path.insert(0, {PROJECT_ROOT!r}); import main"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # заголовок таблицы
+        modules[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    error = proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else ""
+    return modules, error
+
+
+def measure(runs: int) -> Dict:
+    totals: List[float] = []
+    loaded: Set[str] = set()
+    self_times: Dict[str, List[int]] = {}
+    for _ in range(runs):
+        modules, error = _import_once()
+        if "main" not in modules:
+            return {"error": error or "import main не выполнился"}
+        totals.append(modules["main"][1] / 1000)
+        loaded.update(modules)
+        for name, (own, _cumulative) in modules.items():
+            if name.split(".")[0] in OWN_PACKAGES:
+                self_times.setdefault(name, []).append(own)
+
+    own_modules = sorted(
+        ((name, round(statistics.median(values) / 1000, 2)) for name, values in self_times.items()),
+        key=lambda item: -item[1],
+    )
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "max_ms": round(max(totals), 1),
+        "modules": len(loaded),
+        "eager_deferred": [name for name in DEFERRED_MODULES if name in loaded],
+        "own_self_ms": own_modules,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="число холодных запусков")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="бюджет медианы import main")
+    parser.add_argument("--top", type=int, default=10, help="сколько своих модулей показать")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    args = parser.parse_args(argv)
+
+    report = measure(max(1, args.runs))
+    if "error" in report:
+        print(f"ПРОВАЛ: {report['error']}")
+        return 1
+
+    failures = []
+    if report["median_ms"] > args.budget_ms:
+        failures.append(f"import main {report['median_ms']} мс > {args.budget_ms} мс")
+    if report["eager_deferred"]:
+        failures.append("загружены до главного окна: " + ", ".join(report["eager_deferred"]))
+    report["budget_ms"] = args.budget_ms
+    report["failures"] = failures
+    report["own_self_ms"] = report["own_self_ms"][:args.top]
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"import main: медиана {report['median_ms']} мс (мин {report['min_ms']}, макс {report['max_ms']}), "
+              f"модулей {report['modules']}, бюджет {args.budget_ms} мс")
+        for name, ms in report["own_self_ms"]:
+            print(f"  {ms:8.2f} мс  {name}")
+        print("ПРОВАЛ: " + "; ".join(failures) if failures else "OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
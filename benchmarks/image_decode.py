@@ -0,0 +1,141 @@
+"""Сравнение старого и нового пути декодирования картинок вопросов.
+
+    python -m benchmarks.image_decode                 # синтетический корпус 4000×3000
+    python -m benchmarks.image_decode --corpus DIR    # свои картинки
+
+Каждый вариант запускается в отдельном процессе, чтобы пиковый RSS
+не смешивался между вариантами.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+
+
+def _peak_rss_mb() -> float:
+    # VmHWM сбрасывается при exec, а ru_maxrss в Linux наследуется от родителя
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux отдаёт КБ, macOS — байты
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _decode_legacy(path, size):
+    """Прежний путь из QuizWindow: полное декодирование в RGBA, затем LANCZOS."""
+    from PIL import Image
+
+    with Image.open(path) as src:
+        image = src.convert("RGBA")
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    return image
+
+
+def _decode_reduced(path, size):
+    from core.image_loader import decode_image
+
+    return decode_image(path, size)
+
+
+VARIANTS = {"legacy": _decode_legacy, "reduced": _decode_reduced}
+
+
+def generate_corpus(target_dir: str, count: int, width: int = 4000, height: int = 3000) -> None:
+    """Синтетические «сканы»: шум поверх градиента, в JPEG, BMP и PNG."""
+    from PIL import Image
+
+    os.makedirs(target_dir, exist_ok=True)
+    for i in range(count):
+        gradient = Image.linear_gradient("L").resize((width, height))
+        noise = Image.effect_noise((width, height), 40 + i)
+        image = Image.merge("RGB", (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+        fmt = ("JPEG", "BMP", "PNG")[i % 3]
+        ext = {"JPEG": "jpg", "BMP": "bmp", "PNG": "png"}[fmt]
+        image.save(os.path.join(target_dir, f"scan_{i:03d}.{ext}"), format=fmt)
+
+
+def _run_worker(variant: str, corpus: str, size) -> dict:
+    # Импорт PIL до замера базовой памяти
+    import PIL.Image  # noqa: F401
+    import core.image_loader  # noqa: F401
+
+    decode = VARIANTS[variant]
+    files = sorted(os.path.join(corpus, f) for f in os.listdir(corpus) if f.lower().endswith(IMAGE_EXTS))
+    base_rss = _peak_rss_mb()
+    timings = []
+    for path in files:
+        started = time.perf_counter()
+        image = decode(path, size)
+        timings.append(time.perf_counter() - started)
+        del image
+
+    total = sum(timings)
+    return {
+        "variant": variant,
+        "files": len(files),
+        "total_s": round(total, 4),
+        "mean_ms": round(total / len(files) * 1000, 2) if files else 0.0,
+        "max_ms": round(max(timings) * 1000, 2) if timings else 0.0,
+        "peak_rss_delta_mb": round(_peak_rss_mb() - base_rss, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="папка с картинками (по умолчанию генерируется)")
+    parser.add_argument("--count", type=int, default=9, help="размер синтетического корпуса")
+    parser.add_argument("--size", default="280x220", help="целевая рамка, например 280x220")
+    parser.add_argument("--json", action="store_true", help="вывести только JSON")
+    parser.add_argument("--worker", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    size = tuple(int(x) for x in args.size.lower().split("x"))
+
+    if args.worker:
+        print(json.dumps(_run_worker(args.worker, args.corpus, size)))
+        return 0
+
+    with tempfile.TemporaryDirectory(prefix="pyquiz-bench-") as tmp:
+        corpus = args.corpus
+        if not corpus:
+            corpus = os.path.join(tmp, "corpus")
+            generate_corpus(corpus, args.count)
+
+        results = []
+        for variant in sorted(VARIANTS):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.image_decode", "--worker", variant, "--corpus", corpus, "--size", args.size],
+                cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{'вариант':<10}{'файлов':>8}{'всего, с':>12}{'ср., мс':>10}{'макс., мс':>11}{'пик RSS, МБ':>14}")
+    for r in results:
+        print(f"{r['variant']:<10}{r['files']:>8}{r['total_s']:>12}{r['mean_ms']:>10}{r['max_ms']:>11}{r['peak_rss_delta_mb']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""Длительный прогон киоска: главное меню → имя → подготовка → тест → результаты по кругу.
+
+    python -m benchmarks.kiosk_soak --cycles 200
+    xvfb-run -a python -m benchmarks.kiosk_soak --cycles 50 --json
+
+Без DISPLAY скрипт сам поднимает Xvfb, если он установлен. Настройки,
+кэши и результаты живут во временной папке и не трогают данные киоска.
+После прогрева каждый цикл снимает RSS, число виджетов и картинок Tk,
+ожидающие after-вызовы и топ аллокаций tracemalloc. Код возврата 1 —
+если рост за прогон превысил пороги.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+SOAK_NAME = "Soak Test"
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return float("nan")
+    # Не текущий, а пиковый RSS, но для поиска утечек тоже годится
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _start_xvfb():
+    """Поднимает Xvfb на свободном дисплее, если графики нет."""
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        raise SystemExit("Нет DISPLAY и не найден Xvfb: установите xvfb или запустите через xvfb-run")
+
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    # Xvfb пишет номер дисплея в -displayfd, когда готов принимать клиентов
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        proc.kill()
+        raise SystemExit("Xvfb не запустился")
+    os.environ["DISPLAY"] = f":{number}"
+    return proc
+
+
+def _prepare_user_data(data_home: str, questions: int, images: int) -> str:
+    """Изолированные данные пользователя: настройки киоска и банк со всеми типами вопросов."""
+    os.environ["HOME"] = data_home
+    os.environ["LOCALAPPDATA"] = data_home
+
+    from PIL import Image
+    from benchmarks.bank_generator import QUESTION_TYPES, bank_lines, write_bank
+    from core.file_manager import FileManager
+
+    file_manager = FileManager()
+    settings = {
+        "TIMER": 0,
+        "MAX_QUESTIONS": questions,
+        "DISABLE_MINIMIZE_AND_FOCUS_LOSS": True,
+        "NAME_RESTRICT_TO_LIST": False,
+        "AUTO_NEXT": False,
+        "TELEGRAM_SEND_ON_RESULT": False,
+        "TELEGRAM_SEND_ON_SAVE": False,
+        "HIDE_BUILTIN_TESTS": True,
+    }
+    with open(os.path.join(file_manager.get_user_data_dir(), "settings.json"), "w", encoding="utf-8") as f:
+        json.dump(settings, f, ensure_ascii=False, indent=2)
+
+    tests_dir = file_manager.get_user_tests_dir()
+    images_dir = os.path.join(tests_dir, "images")
+    os.makedirs(images_dir, exist_ok=True)
+    for n in range(images):
+        Image.effect_noise((1600, 1200), 30 + n).convert("RGB").save(os.path.join(images_dir, f"soak_{n}.jpg"), quality=85)
+
+    image_names = [f"soak_{n}.jpg" for n in range(images)]
+    lines = bank_lines("Прогон киоска", questions, random.Random(0), image_names=image_names, image_ratio=0.5, kinds=QUESTION_TYPES)
+
+    bank_path = os.path.join(tests_dir, "soak.txt")
+    write_bank(bank_path, lines)
+    return bank_path
+
+
+def _count_widgets(widget) -> int:
+    total = 0
+    stack = list(widget.winfo_children())
+    while stack:
+        child = stack.pop()
+        total += 1
+        stack.extend(child.winfo_children())
+    return total
+
+
+class SoakRun:
+    """Сценарий прогона на событиях Tk: каждый шаг — отдельный after, без вложенных циклов."""
+
+    STEP_MS = 30
+    SETTLE_MS = 600
+
+    def __init__(self, app, bank_path: str, cycles: int, warmup: int, open_images: bool, track_allocations: bool, top: int):
+        self.app = app
+        self.root = app.root
+        self.bank_path = bank_path
+        self.cycles = cycles
+        self.warmup = warmup
+        self.open_images = open_images
+        self.track_allocations = track_allocations
+        self.top = top
+        self.samples = []
+        self.error = None
+        self.callback_errors = []
+        self._scenario = self._run()
+        self._baseline_snapshot = None
+        self._previous_snapshot = None
+
+    def start(self):
+        # Ошибки внутри after/command приложения Tk только печатает — собираем их в отчёт
+        self.root.report_callback_exception = self._on_callback_error
+        self.root.after(self.STEP_MS, self._step)
+
+    def _on_callback_error(self, exc_type, exc_value, exc_tb):
+        import traceback
+        text = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
+        self.callback_errors.append(text)
+        print(text, file=sys.stderr)
+
+    def _step(self):
+        try:
+            delay = next(self._scenario)
+        except StopIteration:
+            self.root.quit()
+            return
+        except Exception as e:
+            import traceback
+            self.error = traceback.format_exc()
+            print(f"Сценарий прерван: {e}", file=sys.stderr)
+            self.root.quit()
+            return
+        self.root.after(delay or self.STEP_MS, self._step)
+
+    def _current(self):
+        return self.app.navigator.current
+
+    def _run(self):
+        from core.parser import QuizParser
+        from ui.main_window import MainWindow
+        from ui.quiz_window import QuizWindow
+        from ui.results_window import ResultsWindow
+
+        # Дальше в главное меню возвращает кнопка «Новый тест» экрана результатов
+        self.app.restart_app()
+        for cycle in range(self.cycles + self.warmup):
+            yield None
+            assert isinstance(self._current(), MainWindow), type(self._current())
+
+            self.app.on_tests_selected([QuizParser.parse_question_file(self.bank_path)])
+            yield None
+
+            name_screen = self._current()
+            if hasattr(name_screen, "name_combo"):
+                name_screen.name_combo.set(SOAK_NAME)
+            else:
+                name_screen.name_entry.insert(0, SOAK_NAME)
+            name_screen._submit()
+            yield None
+
+            self._current()._start_test()
+            yield None
+
+            quiz = self._current()
+            assert isinstance(quiz, QuizWindow), type(quiz)
+            while not quiz._closed:
+                if self.open_images and quiz.current_question.images:
+                    desc, path = quiz.current_question.images[0]
+                    quiz._open_image_popup(path, desc, quiz.current_question.image_base_dir)
+                    yield None
+                    quiz._close_image_overlay()
+                self._answer(quiz)
+                quiz._next_question()
+                yield None
+
+            while not isinstance(self._current(), ResultsWindow):
+                yield None
+            yield None
+            self._current()._new_test()
+
+            # Даём отработать отложенному удалению прошлых экранов
+            yield self.SETTLE_MS
+            if cycle >= self.warmup:
+                self._sample(cycle - self.warmup + 1)
+
+    @staticmethod
+    def _answer(quiz):
+        from core.models import QuestionType
+
+        qtype = quiz.current_question.question_type
+        if qtype in (QuestionType.SINGLE, QuestionType.MULTIPLE):
+            next(iter(quiz.user_inputs.values())).set(True)
+        elif qtype == QuestionType.MATCHING:
+            for dropdown in quiz.matching_inputs.values():
+                # Общий всплывающий список должен переживать экраны без утечек
+                dropdown.open_dropdown()
+                dropdown.close_dropdown()
+                dropdown.set(dropdown.options[0])
+        else:
+            quiz.freeform_entry.insert(0, "ответ")
+
+    def _sample(self, cycle: int):
+        gc.collect()
+        sample = {
+            "cycle": cycle,
+            "rss_mb": round(_rss_mb(), 1),
+            "widgets": _count_widgets(self.root),
+            "tk_images": len(self.root.image_names()),
+            "pending_after": len(self.root.tk.splitlist(self.root.tk.call("after", "info"))),
+            "gc_objects": len(gc.get_objects()),
+        }
+        if self.track_allocations:
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+            if self._baseline_snapshot is None:
+                self._baseline_snapshot = snapshot
+            reference = self._previous_snapshot or snapshot
+            sample["traced_mb"] = round(tracemalloc.get_traced_memory()[0] / (1024 * 1024), 2)
+            sample["top_allocators"] = [
+                {"where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "size_diff_kb": round(s.size_diff / 1024, 1), "count_diff": s.count_diff}
+                for s in snapshot.compare_to(reference, "lineno")[:self.top]
+                if s.size_diff > 0
+            ]
+            self._previous_snapshot = snapshot
+        self.samples.append(sample)
+        print(
+            f"цикл {cycle:>4}: RSS {sample['rss_mb']:>7} МБ, виджетов {sample['widgets']:>5}, "
+            f"картинок {sample['tk_images']:>4}, after {sample['pending_after']:>3}",
+            file=sys.stderr,
+        )
+
+    def growth_since_baseline(self, top: int):
+        if not self.samples:
+            return {}
+        first, last = self.samples[0], self.samples[-1]
+        growth = {key: round(last[key] - first[key], 2) for key in ("rss_mb", "widgets", "tk_images", "pending_after", "gc_objects")}
+        if self._baseline_snapshot is not None and self._previous_snapshot is not None:
+            growth["top_allocators"] = [
+                {"where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "size_diff_kb": round(s.size_diff / 1024, 1), "count_diff": s.count_diff}
+                for s in self._previous_snapshot.compare_to(self._baseline_snapshot, "lineno")[:top]
+                if s.size_diff > 0
+            ]
+        return growth
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=100, help="число замеряемых циклов")
+    parser.add_argument("--warmup", type=int, default=3, help="циклы прогрева без замера")
+    parser.add_argument("--questions", type=int, default=8, help="вопросов в одном тесте")
+    parser.add_argument("--images", type=int, default=3, help="картинок в банке (0 — без картинок)")
+    parser.add_argument("--no-image-popup", action="store_true", help="не открывать увеличенную картинку")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="без tracemalloc (быстрее, но без топа аллокаций)")
+    parser.add_argument("--top", type=int, default=10, help="сколько мест аллокаций показывать")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=40.0)
+    parser.add_argument("--max-widget-growth", type=int, default=20)
+    parser.add_argument("--max-image-growth", type=int, default=10)
+    parser.add_argument("--max-after-growth", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    args = parser.parse_args(argv)
+
+    xvfb = _start_xvfb()
+    data_home = tempfile.mkdtemp(prefix="pyquiz-soak-")
+    try:
+        bank_path = _prepare_user_data(data_home, args.questions, args.images)
+        if not args.no_tracemalloc:
+            tracemalloc.start(10)
+
+        from main import PyQuizApp
+
+        app = PyQuizApp()
+        run = SoakRun(app, bank_path, args.cycles, args.warmup, not args.no_image_popup, not args.no_tracemalloc, args.top)
+        started = time.perf_counter()
+        run.start()
+        app.navigator.run()
+        elapsed = time.perf_counter() - started
+        try:
+            app.root.destroy()
+        except Exception:
+            pass
+    finally:
+        shutil.rmtree(data_home, ignore_errors=True)
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait(timeout=10)
+
+    growth = run.growth_since_baseline(args.top)
+    limits = {
+        "rss_mb": args.max_rss_growth_mb,
+        "widgets": args.max_widget_growth,
+        "tk_images": args.max_image_growth,
+        "pending_after": args.max_after_growth,
+    }
+    failures = [f"{key}: +{growth[key]} > {limit}" for key, limit in limits.items() if growth.get(key, 0) > limit]
+    if run.error:
+        failures.append("сценарий прерван ошибкой")
+    if run.callback_errors:
+        failures.append(f"ошибок в обработчиках Tk: {len(run.callback_errors)}")
+
+    report = {
+        "cycles": len(run.samples),
+        "elapsed_s": round(elapsed, 1),
+        "growth": growth,
+        "limits": limits,
+        "failures": failures,
+        "error": run.error,
+        "callback_errors": run.callback_errors[:20],
+        "samples": run.samples,
+    }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(f"Циклов: {report['cycles']} за {report['elapsed_s']} с")
+        for key in limits:
+            print(f"  рост {key}: {growth.get(key, 0)} (порог {limits[key]})")
+        for item in growth.get("top_allocators", []):
+            print(f"  +{item['size_diff_kb']} КБ ({item['count_diff']:+d}) {item['where']}")
+        if run.error:
+            print(run.error)
+        print("ПРОВАЛ: " + "; ".join(failures) if failures else "OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
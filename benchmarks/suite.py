@@ -0,0 +1,395 @@
+"""Микро- и макробенчмарки ядра СЭТ на синтетическом корпусе, без графики.
+
+    python -m benchmarks.suite                         # средний корпус, таблица
+    python -m benchmarks.suite --size large --json -o bench.json
+    python -m benchmarks.suite --only parse_banks --only grade_session --repeat 10
+    python -m benchmarks.suite --list
+
+Корпус строит benchmarks.bank_generator с фиксированным seed, данные
+пользователя (кэши, результаты) живут во временной папке. Для каждого
+замера — несколько повторов после одного прогревочного; в отчёте
+минимум, медиана, среднее и время на элемент.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.bank_generator import BankSpec, generate_banks  # noqa: E402
+
+SIZES = {
+    "small": BankSpec(files=20, questions=30, depth=1, images=10),
+    "medium": BankSpec(files=200, questions=50, depth=3, images=40),
+    "large": BankSpec(files=1000, questions=80, depth=4, fanout=6, images=80),
+}
+RESULT_FILES = {"small": 50, "medium": 500, "large": 3000}
+
+
+@dataclass
+class Context:
+    spec: BankSpec
+    tests_dir: str
+    files: List[str]
+    scratch_dir: str
+    size_name: str = "medium"
+    quizzes: List = field(default_factory=list)
+
+    @property
+    def questions(self):
+        return [q for quiz in self.quizzes for q in quiz.questions]
+
+
+@dataclass
+class Measurement:
+    """Подготовленный замер: run() повторяется, before_each() — вне замера."""
+
+    run: Callable[[], object]
+    items: int
+    before_each: Optional[Callable[[], None]] = None
+
+
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, kind: str):
+    def register(func):
+        BENCHMARKS[name] = (kind, func)
+        return func
+    return register
+
+
+# --- микро ---
+
+@benchmark("parse_answer_line", "micro")
+def _bench_parse_answer_line(ctx: Context) -> Measurement:
+    from core.parser import QuizParser
+
+    lines = ["B", "A, C, D", "A-E, B-F, C-D", "A-C,B-D", "Z", "ответ"] * 2000
+    return Measurement(lambda: [QuizParser.parse_answer_line(line) for line in lines], len(lines))
+
+
+@benchmark("tokenize", "micro")
+def _bench_tokenize(ctx: Context) -> Measurement:
+    from core.search_index import tokenize
+
+    texts = [q.text for q in ctx.questions]
+    return Measurement(lambda: [tokenize(t) for t in texts], len(texts))
+
+
+@benchmark("check_answer", "micro")
+def _bench_check_answer(ctx: Context) -> Measurement:
+    from core.quiz_logic import QuizEngine
+
+    engine = QuizEngine(ctx.questions, "Бенчмарк")
+    pairs = [(q, _answer_for(q, correct=i % 2 == 0)) for i, q in enumerate(engine.prepared_questions)]
+
+    def run():
+        engine.reset()
+        for question, answer in pairs:
+            engine.check_answer(question, answer)
+
+    return Measurement(run, len(pairs))
+
+
+# --- макро ---
+
+@benchmark("tree_scan", "macro")
+def _bench_tree_scan(ctx: Context) -> Measurement:
+    from core.file_manager import FileManager
+
+    file_manager = FileManager()
+    return Measurement(lambda: file_manager.find_question_files_recursive(include_base=False), len(ctx.files))
+
+
+@benchmark("selection_tree", "macro")
+def _bench_selection_tree(ctx: Context) -> Measurement:
+    from core.file_manager import FileManager
+    from core.selection_tree import SelectionTree
+
+    tree = FileManager().find_question_files_recursive(include_base=False)
+
+    def run():
+        model = SelectionTree(tree)
+        model.select_all()
+        return model.selected_paths()
+
+    return Measurement(run, len(ctx.files))
+
+
+@benchmark("parse_banks", "macro")
+def _bench_parse_banks(ctx: Context) -> Measurement:
+    from core.parser import QuizParser
+
+    return Measurement(lambda: [QuizParser.parse_question_file(p) for p in ctx.files], len(ctx.files))
+
+
+@benchmark("catalog_cold", "macro")
+def _bench_catalog_cold(ctx: Context) -> Measurement:
+    from core.bank_catalog import BankCatalog
+
+    path = os.path.join(ctx.scratch_dir, "catalog.json")
+
+    def reset():
+        if os.path.exists(path):
+            os.remove(path)
+
+    def run():
+        catalog = BankCatalog(path)
+        catalog.refresh(ctx.files)
+        catalog.save()
+
+    return Measurement(run, len(ctx.files), before_each=reset)
+
+
+@benchmark("catalog_warm", "macro")
+def _bench_catalog_warm(ctx: Context) -> Measurement:
+    from core.bank_catalog import BankCatalog
+
+    path = os.path.join(ctx.scratch_dir, "catalog_warm.json")
+    catalog = BankCatalog(path)
+    catalog.refresh(ctx.files)
+    catalog.save()
+    return Measurement(lambda: BankCatalog(path).refresh(ctx.files), len(ctx.files))
+
+
+@benchmark("search_index_cold", "macro")
+def _bench_search_index_cold(ctx: Context) -> Measurement:
+    from core.search_index import SearchIndex
+
+    path = os.path.join(ctx.scratch_dir, "index.json")
+
+    def reset():
+        if os.path.exists(path):
+            os.remove(path)
+
+    def run():
+        index = SearchIndex(path)
+        index.update(ctx.files)
+        index.save()
+
+    return Measurement(run, len(ctx.files), before_each=reset)
+
+
+@benchmark("search_query", "macro")
+def _bench_search_query(ctx: Context) -> Measurement:
+    from core.search_index import SearchIndex
+
+    index = SearchIndex(os.path.join(ctx.scratch_dir, "index_query.json"))
+    index.update(ctx.files)
+    queries = ["напряж", "защиты линии", "ёмкость", "сопротивления изоляции", "параметр при работе"]
+    return Measurement(lambda: [index.search(q) for q in queries], len(queries))
+
+
+@benchmark("engine_prepare", "macro")
+def _bench_engine_prepare(ctx: Context) -> Measurement:
+    from core.quiz_logic import QuizEngine
+
+    questions = ctx.questions
+    return Measurement(lambda: QuizEngine(questions, "Бенчмарк"), len(questions))
+
+
+@benchmark("grade_session", "macro")
+def _bench_grade_session(ctx: Context) -> Measurement:
+    from core.quiz_logic import QuizEngine
+
+    engine = QuizEngine(ctx.questions, "Бенчмарк")
+
+    def run():
+        engine.reset()
+        position = 0
+        while True:
+            question = engine.get_next_question()
+            if question is None:
+                break
+            engine.check_answer(question, _answer_for(question, correct=position % 3 != 0))
+            position += 1
+        return engine.calculate_result()
+
+    return Measurement(run, len(engine.prepared_questions))
+
+
+@benchmark("results_load", "macro")
+def _bench_results_load(ctx: Context) -> Measurement:
+    from core.file_manager import FileManager
+
+    file_manager = FileManager()
+    count = _write_results(ctx, file_manager)
+    return Measurement(file_manager.load_results, count)
+
+
+# --- вспомогательное ---
+
+def _answer_for(question, correct: bool):
+    from core.models import QuestionType
+
+    qtype = question.question_type
+    if qtype == QuestionType.FREEFORM:
+        return question.correct_answer[0] if correct else "неверно"
+    if qtype == QuestionType.MATCHING:
+        pairs = list(question.correct_answer)
+        if correct or len(pairs) < 2:
+            return pairs
+        return [(pairs[0][0], pairs[1][1]), (pairs[1][0], pairs[0][1])] + pairs[2:]
+    if qtype == QuestionType.MULTIPLE:
+        return set(question.correct_answer) if correct else {question.options[0][0]}
+    if correct:
+        return question.correct_answer
+    return next((opt[0] for opt in question.options if opt[0] != question.correct_answer), "")
+
+
+def _write_results(ctx: Context, file_manager) -> int:
+    from core.quiz_logic import QuizEngine
+
+    results_dir = file_manager.get_user_results_dir()
+    existing = len([f for f in os.listdir(results_dir) if f.endswith(".json")])
+    wanted = RESULT_FILES[ctx.size_name]
+    sample = ctx.questions[:40]
+    for n in range(existing, wanted):
+        engine = QuizEngine(sample, f"Студент {n:04d}")
+        for position, question in enumerate(engine.prepared_questions):
+            engine.check_answer(question, _answer_for(question, correct=(n + position) % 4 != 0))
+        result = engine.calculate_result()
+        data = {
+            "student_name": result.student_name,
+            "timestamp": f"2026-01-{n % 28 + 1:02d} 10:{n % 60:02d}:00",
+            "total_questions": result.total_questions,
+            "correct_answers": result.correct_answers,
+            "percentage": result.percentage,
+            "grade_12": result.grade_12,
+            "grade_5": result.grade_5,
+            "passed": result.passed,
+            "timeout": False,
+            "detailed_results": result.detailed_results,
+            "focus_incidents": [],
+        }
+        with open(os.path.join(results_dir, f"bench_{n:05d}.json"), "w", encoding="utf-8") as f:
+            # Ответы «несколько» — множества; в JSON они пишутся списками
+            json.dump(data, f, ensure_ascii=False, indent=2, default=sorted)
+    return wanted
+
+
+def _measure(measurement: Measurement, repeat: int) -> Dict:
+    if measurement.before_each:
+        measurement.before_each()
+    measurement.run()  # прогрев
+
+    timings = []
+    for _ in range(repeat):
+        if measurement.before_each:
+            measurement.before_each()
+        started = time.perf_counter()
+        measurement.run()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    median = statistics.median(timings)
+    return {
+        "items": measurement.items,
+        "repeat": repeat,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(median, 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "stdev_ms": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        "per_item_us": round(median * 1000 / measurement.items, 2) if measurement.items else None,
+    }
+
+
+def run_suite(size: str, repeat: int, only: Optional[List[str]] = None, seed: Optional[int] = None) -> Dict:
+    spec = BankSpec(**asdict(SIZES[size]))
+    if seed is not None:
+        spec.seed = seed
+
+    data_home = tempfile.mkdtemp(prefix="pyquiz-bench-")
+    saved_env = {key: os.environ.get(key) for key in ("HOME", "LOCALAPPDATA")}
+    os.environ["HOME"] = data_home
+    os.environ["LOCALAPPDATA"] = data_home
+    try:
+        from core.file_manager import FileManager
+        from core.parser import QuizParser
+
+        tests_dir = FileManager().get_user_tests_dir()
+        started = time.perf_counter()
+        files = generate_banks(tests_dir, spec)
+        generated_s = time.perf_counter() - started
+
+        scratch_dir = os.path.join(data_home, "scratch")
+        os.makedirs(scratch_dir, exist_ok=True)
+        ctx = Context(spec=spec, tests_dir=tests_dir, files=files, scratch_dir=scratch_dir, size_name=size)
+        ctx.quizzes = [QuizParser.parse_question_file(p) for p in files]
+
+        results = []
+        for name, (kind, factory) in BENCHMARKS.items():
+            if only and name not in only:
+                continue
+            random.seed(spec.seed)  # одинаковое перемешивание вопросов в движке
+            measured = _measure(factory(ctx), repeat)
+            results.append({"name": name, "kind": kind, **measured})
+            print(f"{name}: {measured['median_ms']} мс", file=sys.stderr)
+
+        return {
+            "meta": {
+                "size": size,
+                "spec": asdict(spec),
+                "questions": len(ctx.questions),
+                "generated_s": round(generated_s, 2),
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(data_home, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium", help="размер синтетического корпуса")
+    parser.add_argument("--repeat", type=int, default=5, help="повторов каждого замера")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="запустить только эти замеры")
+    parser.add_argument("--seed", type=int, help="seed генератора корпуса")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    parser.add_argument("-o", "--output", help="записать JSON-отчёт в файл")
+    parser.add_argument("--list", action="store_true", help="список замеров")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, (kind, _factory) in BENCHMARKS.items():
+            print(f"{kind:<6} {name}")
+        return 0
+
+    report = run_suite(args.size, max(1, args.repeat), args.only, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    meta = report["meta"]
+    print(f"Корпус {meta['size']}: файлов {meta['spec']['files']}, вопросов {meta['questions']} (Python {meta['python']})")
+    print(f"{'замер':<20}{'вид':<7}{'элем.':>8}{'мин, мс':>11}{'медиана, мс':>13}{'на элем., мкс':>15}")
+    for r in report["results"]:
+        print(f"{r['name']:<20}{r['kind']:<7}{r['items']:>8}{r['min_ms']:>11}{r['median_ms']:>13}{str(r['per_item_us']):>15}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
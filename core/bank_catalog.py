@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import image_refs, profiling
+from .file_manager import FileManager
+from .models import QuestionType, Quiz
+from .parser import QuizParser
+
+
+MAX_TOPICS = 10
+MAX_WARNINGS = 50
+
+TYPE_TITLES = {
+    QuestionType.SINGLE.value: "один ответ",
+    QuestionType.MULTIPLE.value: "несколько",
+    QuestionType.MATCHING.value: "сопоставление",
+    QuestionType.FREEFORM.value: "ввод",
+}
+
+
+@dataclass
+class BankInfo:
+    """Сводка по одному файлу банка, достаточная для показа без разбора."""
+
+    name: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    question_count: int = 0
+    type_counts: Dict[str, int] = field(default_factory=dict)  # QuestionType.value → число
+    topics: List[str] = field(default_factory=list)
+    image_count: int = 0
+    warnings: List[str] = field(default_factory=list)
+    error: str = ""  # файл не удалось разобрать целиком
+    images_checked: bool = True  # False — запись из загрузки теста, картинки проверит фоновое обновление
+
+    def summary(self) -> str:
+        """Короткая строка для списка файлов: «24 вопр. · 🖼 3 · ⚠ 2»."""
+        if self.error:
+            return "⚠ не читается"
+        parts = [f"{self.question_count} вопр."]
+        if self.image_count:
+            parts.append(f"🖼 {self.image_count}")
+        if self.warnings:
+            parts.append(f"⚠ {len(self.warnings)}")
+        return " · ".join(parts)
+
+
+def missing_image_warnings(quiz: Quiz) -> List[str]:
+    """Замечания о ненайденных картинках; парсер их больше не ищет, поэтому проверка здесь."""
+    warnings: List[str] = []
+    for question in quiz.questions:
+        for _desc, ref in question.images:
+            if image_refs.resolve_image(ref, question.image_base_dir) is None:
+                warnings.append(f"картинка не найдена: {ref} (вопрос «{question.text[:40]}»)")
+    return warnings
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BankCatalog:
+    """Каталог банков: число вопросов по типам, темы, картинки и замечания разбора.
+
+    Хранится в cache/catalog/catalog.json и обновляется при каждом
+    просмотре банков, но только для файлов с изменившимся mtime/размером.
+    Если после изменения mtime хэш содержимого прежний, файл не
+    разбирается повторно. Окна выбора и подготовки читают каталог,
+    не разбирая сами файлы.
+    """
+
+    VERSION = 1
+
+    def __init__(self, catalog_path: Optional[str] = None):
+        self.catalog_path = catalog_path or os.path.join(FileManager().get_user_cache_dir("catalog"), "catalog.json")
+        self._files: Dict[str, BankInfo] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self.revision = 0  # растёт при каждом изменении, чтобы UI знал, когда перерисоваться
+        self._load()
+
+    # --- хранение ---
+
+    def _load(self):
+        try:
+            with open(self.catalog_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return
+        for path, entry in data.get("files", {}).items():
+            try:
+                self._files[path] = BankInfo(**entry)
+            except TypeError:
+                continue
+
+    def save(self):
+        # Сохранения из загрузки банков и окна выбора идут по очереди; свой tmp-файл
+        # у каждого процесса и потока, чтобы не писать в один и тот же
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = {"version": self.VERSION, "files": {p: asdict(info) for p, info in self._files.items()}}
+                self._dirty = False
+            tmp_path = f"{self.catalog_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.catalog_path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp_path, self.catalog_path)
+            except OSError as e:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                print(f"Не удалось сохранить каталог банков: {e}")
+
+    # --- чтение ---
+
+    def get(self, path: str) -> Optional[BankInfo]:
+        return self._files.get(path)
+
+    def question_count(self, path: str) -> Optional[int]:
+        """Число вопросов файла; None — файла нет в каталоге."""
+        info = self._files.get(path)
+        return None if info is None else info.question_count
+
+    def estimate_questions(self, paths: Iterable[str]) -> Tuple[int, int]:
+        """Сумма вопросов по файлам из каталога и число файлов, которых в нём нет."""
+        total = unknown = 0
+        for path in paths:
+            info = self._files.get(path)
+            if info is None:
+                unknown += 1
+            else:
+                total += info.question_count
+        return total, unknown
+
+    def type_totals(self, paths: Iterable[str]) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for path in paths:
+            info = self._files.get(path)
+            if info is None:
+                continue
+            for qtype, count in info.type_counts.items():
+                totals[qtype] = totals.get(qtype, 0) + count
+        return totals
+
+    @property
+    def file_count(self) -> int:
+        return len(self._files)
+
+    # --- обновление ---
+
+    @staticmethod
+    def build_info(quiz: Quiz, warnings: List[str], st: os.stat_result, sha256: str) -> BankInfo:
+        type_counts: Dict[str, int] = {}
+        topics: List[str] = []
+        image_count = 0
+        for question in quiz.questions:
+            qtype = question.question_type.value
+            type_counts[qtype] = type_counts.get(qtype, 0) + 1
+            if question.source_topic and question.source_topic not in topics and len(topics) < MAX_TOPICS:
+                topics.append(question.source_topic)
+            image_count += len(question.images)
+        return BankInfo(
+            name=quiz.name,
+            mtime_ns=st.st_mtime_ns,
+            size=st.st_size,
+            sha256=sha256,
+            question_count=len(quiz.questions),
+            type_counts=type_counts,
+            topics=topics,
+            image_count=image_count,
+            warnings=warnings[:MAX_WARNINGS],
+        )
+
+    def is_fresh(self, path: str, st: Optional[os.stat_result] = None) -> bool:
+        info = self._files.get(path)
+        if info is None:
+            return False
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return False
+        return info.mtime_ns == st.st_mtime_ns and info.size == st.st_size
+
+    def _store(self, path: str, info: BankInfo):
+        with self._lock:
+            self._files[path] = info
+            self._dirty = True
+            self.revision += 1
+
+    def add_quiz(self, path: str, quiz: Quiz, warnings: List[str], st: Optional[os.stat_result] = None):
+        """Заносит уже разобранный файл (например, при загрузке теста), если запись устарела.
+
+        Картинки здесь не ищутся — загрузка теста не должна трогать диск ради
+        вопросов, которые могут не попасть в выборку. Замечания о них добавит
+        следующий refresh (images_checked=False).
+        """
+        try:
+            st = st or os.stat(path)
+            if self.is_fresh(path, st):
+                return
+            info = self.build_info(quiz, warnings, st, _sha256(path))
+            info.images_checked = not info.image_count
+            self._store(path, info)
+        except OSError:
+            pass
+
+    def refresh_file(self, path: str, st: Optional[os.stat_result] = None,
+                     on_parsed: Optional[Callable[[str, Quiz, os.stat_result], None]] = None) -> bool:
+        """Обновляет запись файла, если он изменился. True — файл был разобран заново."""
+        st = st or os.stat(path)
+        if self.is_fresh(path, st):
+            info = self._files.get(path)
+            if info is not None and not info.images_checked:
+                self._check_images(path, info)
+            return False
+
+        try:
+            sha256 = _sha256(path)
+        except OSError as e:
+            print(f"Каталог: пропуск {path}: {e}")
+            return False
+
+        old = self._files.get(path)
+        if old is not None and old.sha256 == sha256 and not old.error:
+            # Файл только «потрогали»: содержимое то же, разбирать незачем
+            old.mtime_ns, old.size = st.st_mtime_ns, st.st_size
+            self._store(path, old)
+            return False
+
+        warnings: List[str] = []
+        try:
+            quiz = QuizParser.parse_question_file(path, warnings=warnings)
+        except Exception as e:
+            info = BankInfo(name=os.path.basename(path), mtime_ns=st.st_mtime_ns, size=st.st_size, sha256=sha256, error=str(e))
+            self._store(path, info)
+            return True
+
+        # Каталог обновляется в фоне, так что картинки можно проверить здесь;
+        # заодно найденные пути запомнятся к показу вопросов
+        warnings.extend(missing_image_warnings(quiz))
+        self._store(path, self.build_info(quiz, warnings, st, sha256))
+        if on_parsed is not None:
+            on_parsed(path, quiz, st)
+        return True
+
+    def _check_images(self, path: str, info: BankInfo):
+        """Досматривает картинки записи из загрузки теста; сам файл берётся из QuizCache."""
+        from .quiz_cache import get_quiz_cache
+
+        try:
+            quiz = get_quiz_cache().parse(path)
+        except Exception:
+            return
+        info.warnings = (info.warnings + missing_image_warnings(quiz))[:MAX_WARNINGS]
+        info.images_checked = True
+        self._store(path, info)
+
+    @profiling.timed("catalog.refresh")
+    def refresh(self, paths: Iterable[str], should_stop=None, prune: bool = True,
+                on_parsed: Optional[Callable[[str, Quiz, os.stat_result], None]] = None) -> int:
+        """Доводит каталог до текущего набора файлов. Возвращает число разобранных заново.
+
+        on_parsed(path, quiz, stat) получает каждый разобранный файл —
+        например, чтобы заодно обновить поисковый индекс.
+        """
+        paths = list(paths)
+        # Картинки могли доложить с прошлого обновления — ищем их заново
+        image_refs.forget_misses()
+        if prune:
+            wanted = set(paths)
+            with self._lock:
+                for stale in [p for p in self._files if p not in wanted]:
+                    del self._files[stale]
+                    self._dirty = True
+                    self.revision += 1
+
+        parsed = 0
+        for path in paths:
+            if should_stop is not None and should_stop():
+                break
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if self.refresh_file(path, st, on_parsed=on_parsed):
+                parsed += 1
+        return parsed
+
+
+def describe_types(type_counts: Dict[str, int]) -> str:
+    """«один ответ 12 · несколько 4 · ввод 2» в порядке QuestionType."""
+    return " · ".join(
+        f"{TYPE_TITLES[qtype.value]} {type_counts[qtype.value]}"
+        for qtype in QuestionType
+        if type_counts.get(qtype.value)
+    )
+
+
+_shared: Optional[BankCatalog] = None
+_shared_lock = threading.Lock()
+
+
+def get_bank_catalog() -> BankCatalog:
+    """Общий каталог процесса: загружается с диска один раз, окна и загрузка банков видят одни записи."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = BankCatalog()
+        return _shared
@@ -0,0 +1,80 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from . import profiling
+from .models import Quiz
+from .quiz_cache import QuizCache, get_quiz_cache
+
+MAX_SUMMARY_ERRORS = 10
+
+
+@dataclass
+class BankLoadResult:
+    quizzes: List[Quiz] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)  # (путь, причина)
+    cancelled: bool = False
+
+
+class BankLoadJob:
+    """Загрузка выбранных банков для экзамена вне потока Tk.
+
+    run() выполняется в рабочем потоке; files_done и questions только
+    растут, так что окно может читать их из on_progress без блокировок.
+    Разбор идёт через QuizCache, заодно обновляется каталог банков.
+    """
+
+    def __init__(self, paths: Iterable[str], cache: Optional[QuizCache] = None,
+                 on_progress: Optional[Callable[[], None]] = None):
+        self.paths = list(paths)
+        self.cache = cache or get_quiz_cache()
+        self.on_progress = on_progress  # вызывается в рабочем потоке после каждого файла
+        self.files_done = 0
+        self.questions = 0
+        self._cancel = threading.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.paths)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self) -> BankLoadResult:
+        from .bank_catalog import get_bank_catalog
+
+        result = BankLoadResult()
+        catalog = get_bank_catalog()
+        with profiling.span("main.load_banks"):
+            for path in self.paths:
+                if self._cancel.is_set():
+                    result.cancelled = True
+                    break
+                warnings: List[str] = []
+                try:
+                    quiz = self.cache.parse(path, warnings=warnings)
+                except Exception as e:
+                    result.errors.append((path, str(e)))
+                else:
+                    result.quizzes.append(quiz)
+                    catalog.add_quiz(path, quiz, warnings)
+                    self.questions += len(quiz.questions)
+                self.files_done += 1
+                if self.on_progress is not None:
+                    self.on_progress()
+            catalog.save()
+        return result
+
+
+def error_summary(errors: List[Tuple[str, str]], limit: int = MAX_SUMMARY_ERRORS) -> str:
+    """Одно сообщение на все ошибки загрузки вместо окна на каждый файл."""
+    lines = [f"Не удалось загрузить файлов: {len(errors)}", ""]
+    lines += [f"• {os.path.basename(path)}: {reason}" for path, reason in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"… и ещё {len(errors) - limit}")
+    return "\n".join(lines)
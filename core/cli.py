@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+from .file_manager import FileManager
+from .parser import QuizParser
+
+
+def _collect_bank_files(paths: List[str]) -> List[str]:
+    """Файлы тестов из указанных путей; без путей — все базовые и пользовательские банки."""
+    if not paths:
+        return FileManager().get_all_test_files()
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _dirnames, filenames in os.walk(path):
+                files.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".txt"))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            print(f"Путь не найден: {path}")
+    return sorted(files)
+
+
+def _warm_thumbnails(args) -> int:
+    from .image_loader import warm_thumbnail_cache
+    from .thumbnail_cache import get_thumbnail_cache
+
+    cache = get_thumbnail_cache()
+    total_warmed = total_missing = 0
+    for filepath in _collect_bank_files(args.paths):
+        try:
+            quiz = QuizParser.parse_question_file(filepath)
+        except Exception as e:
+            print(f"Пропуск {filepath}: {e}")
+            continue
+        warmed, missing = warm_thumbnail_cache(quiz.questions, cache)
+        total_warmed += warmed
+        total_missing += missing
+        if warmed or missing:
+            print(f"{filepath}: миниатюр {warmed}, не найдено {missing}")
+
+    print(f"Готово: изображений {total_warmed}, не найдено {total_missing}. Кэш: {cache.cache_dir}")
+    return 0
+
+
+def _search(args) -> int:
+    from .search_index import SearchIndex
+
+    index = SearchIndex()
+    started = time.perf_counter()
+    files = _collect_bank_files(args.paths)
+    updated = index.update(files, prune=not args.paths)
+    index.save()
+    indexed_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    hits = index.search(" ".join(args.query), limit=args.limit, paths=set(files) if args.paths else None)
+    search_ms = (time.perf_counter() - started) * 1000
+
+    for hit in hits:
+        print(f"{hit.path}:{hit.question_index + 1}: {hit.snippet}")
+    print(
+        f"Найдено: {len(hits)} за {search_ms:.1f} мс "
+        f"(файлов в индексе {index.file_count}, переиндексировано {updated} за {indexed_ms:.0f} мс)"
+    )
+    return 0 if hits else 1
+
+
+def _catalog(args) -> int:
+    from .bank_catalog import BankCatalog, describe_types
+
+    catalog = BankCatalog()
+    started = time.perf_counter()
+    files = _collect_bank_files(args.paths)
+    parsed = catalog.refresh(files, prune=not args.paths)
+    catalog.save()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    total_warnings = 0
+    for path in files:
+        info = catalog.get(path)
+        if info is None:
+            continue
+        print(f"{path}: {info.summary()}")
+        if info.error:
+            print(f"    ошибка: {info.error}")
+            continue
+        types = describe_types(info.type_counts)
+        if types:
+            print(f"    {types}")
+        if info.topics:
+            print(f"    темы: {', '.join(info.topics)}")
+        total_warnings += len(info.warnings)
+        if args.warnings:
+            for warning in info.warnings:
+                print(f"    ⚠ {warning}")
+
+    print(f"Файлов: {len(files)}, разобрано заново {parsed} за {elapsed_ms:.0f} мс, замечаний {total_warnings}")
+    return 0
+
+
+def _prefork(args) -> int:
+    from . import prefork
+
+    if args.status or args.stop:
+        reply = prefork.request({"command": "stop" if args.stop else "ping"})
+        if reply is None:
+            print("Помощник запуска не запущен")
+            return 1
+        print(json.dumps(reply, ensure_ascii=False))
+        return 0
+    return prefork.serve()
+
+
+def _launch(args) -> int:
+    from . import prefork
+
+    started = time.perf_counter()
+    pid = prefork.request_launch()
+    if pid is not None:
+        print(f"Запущено помощником: pid {pid} за {(time.perf_counter() - started) * 1000:.0f} мс")
+        return 0
+
+    # Помощника нет — обычный запуск в этом же процессе
+    main_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    os.execv(sys.executable, [sys.executable, main_path])
+    return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pyquiz", description="Служебные команды СЭТ")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    warm = sub.add_parser("warm-thumbnails", help="заранее подготовить миниатюры картинок банка")
+    warm.add_argument("paths", nargs="*", help="файлы или папки с тестами (по умолчанию все банки)")
+    warm.set_defaults(handler=_warm_thumbnails)
+
+    search = sub.add_parser("search", help="найти вопросы по словам во всех банках")
+    search.add_argument("query", nargs="+", help="слова запроса (ищутся по началу слова)")
+    search.add_argument("-p", "--path", dest="paths", action="append", default=[], help="искать только в этих файлах или папках")
+    search.add_argument("-n", "--limit", type=int, default=50, help="максимум результатов")
+    search.set_defaults(handler=_search)
+
+    catalog = sub.add_parser("catalog", help="обновить и показать каталог банков (вопросы по типам, темы, замечания)")
+    catalog.add_argument("paths", nargs="*", help="файлы или папки с тестами (по умолчанию все банки)")
+    catalog.add_argument("-w", "--warnings", action="store_true", help="показать замечания разбора построчно")
+    catalog.set_defaults(handler=_catalog)
+
+    pre = sub.add_parser("prefork", help="помощник быстрого запуска: держит прогретые модули и банки (Linux)")
+    pre.add_argument("--status", action="store_true", help="показать, запущен ли помощник")
+    pre.add_argument("--stop", action="store_true", help="остановить помощник")
+    pre.set_defaults(handler=_prefork)
+
+    launch = sub.add_parser("launch", help="запустить программу через помощник, а без него — как обычно")
+    launch.set_defaults(handler=_launch)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -4,6 +4,8 @@ import shutil
 from typing import Dict, List, Union, Optional
 import json
 
+from core import profiling
+
 def resource_path(relative_path):
     """Возвращает абсолютный путь к ресурсу"""
     try:
@@ -12,6 +14,20 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+def write_json_atomic(filepath: str, data) -> None:
+    """Пишет JSON через временный файл: обрыв записи не оставит усечённый файл."""
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
 class FileManager:
     """Менеджер файлов приложения"""
 
@@ -53,6 +69,12 @@ class FileManager:
         os.makedirs(results_dir, exist_ok=True)
         return results_dir
 
+    def get_user_cache_dir(self, *parts: str) -> str:
+        """Путь к папке кэшей (миниатюры, индексы)"""
+        cache_dir = os.path.join(self.get_user_data_dir(), "cache", *parts)
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+
     def get_base_tests_dir(self) -> str:
         """Путь к базовой директории тестов"""
         return resource_path("tests")
@@ -66,6 +88,7 @@ class FileManager:
         user_dir = self.get_user_data_dir()
         return os.path.join(user_dir, "names_user.txt")
 
+    @profiling.timed("tree.scan")
     def find_question_files_recursive(self, include_base: bool = True) -> Dict:
         """
         Рекурсивный поиск файлов тестов
@@ -163,23 +186,19 @@ class FileManager:
 
         shutil.copy2(source_path, dest_path)
 
-        # Пытаемся скопировать папку images рядом с исходным тестом
+        # Пытаемся скопировать папку images рядом с исходным тестом:
+        # дубли по содержимому — жёсткими ссылками, несжатые картинки пережимаются без потерь
         src_dir = os.path.dirname(source_path)
         src_images = os.path.join(src_dir, "images")
         if os.path.isdir(src_images):
-            dest_images = os.path.join(user_tests_dir, "images")
-            os.makedirs(dest_images, exist_ok=True)
-            for dirpath, _dirnames, filenames in os.walk(src_images):
-                rel = os.path.relpath(dirpath, src_images)
-                target_dir = dest_images if rel == "." else os.path.join(dest_images, rel)
-                os.makedirs(target_dir, exist_ok=True)
-                for fname in filenames:
-                    src_file = os.path.join(dirpath, fname)
-                    dst_file = os.path.join(target_dir, fname)
-                    try:
-                        shutil.copy2(src_file, dst_file)
-                    except Exception:
-                        pass
+            from .image_import import import_images
+            try:
+                import_images(src_images, os.path.join(user_tests_dir, "images"),
+                              work_dir=self.get_user_cache_dir())
+                from .image_refs import forget_misses
+                forget_misses()
+            except Exception as e:
+                print(f"Ошибка импорта изображений: {e}")
 
         return dest_path
 
@@ -202,9 +221,7 @@ class FileManager:
             filename = f"{student_name}_{timestamp}.json"
 
         filepath = os.path.join(results_dir, filename)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        write_json_atomic(filepath, result_data)
 
         return filepath
 
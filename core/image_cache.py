@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def estimate_image_bytes(image: Any) -> int:
+    """Оценка памяти под пиксели: ширина × высота × байт на пиксель (PIL и PhotoImage)."""
+    try:
+        width, height = image.width(), image.height()  # ImageTk.PhotoImage
+    except TypeError:
+        width, height = image.width, image.height  # PIL.Image
+    bands = len(image.getbands()) if hasattr(image, "getbands") else 4
+    return max(0, int(width) * int(height) * bands)
+
+
+class ImageMemoryCache:
+    """LRU-кэш декодированных картинок, ограниченный суммарным объёмом пикселей.
+
+    Общий для миниатюр и увеличенного просмотра: ключ включает целевой размер,
+    значения — PIL.Image или ImageTk.PhotoImage. max_bytes=0 отключает кэш.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(0, int(max_bytes))
+        self._items: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None) -> None:
+        if nbytes is None:
+            nbytes = estimate_image_bytes(value)
+        # Картинка больше всего бюджета не кэшируется вовсе
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._items[key] = (value, nbytes)
+            self._total_bytes += nbytes
+
+            while self._total_bytes > self.max_bytes and self._items:
+                _key, (_value, size) = self._items.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "items": len(self._items),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
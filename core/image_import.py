@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from . import tasks
+from .image_loader import decode_image
+
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+MANIFEST_NAME = ".import_manifest.json"
+WORK_DIR_PREFIX = ".pyquiz-import-"
+STALE_WORK_DIR_S = 3600
+
+# Предел для max_side, если место на диске важнее деталей. По умолчанию картинки
+# хранятся в исходном разрешении: схемы рассматривают с увеличением (ZoomImageView)
+DOWNSCALE_SIDE = 2560
+# Меньше этого файл не трогаем: выигрыш не окупает перекодирование
+MIN_TRANSCODE_BYTES = 256 * 1024
+# Режимы, которые PNG сохраняет без преобразования пикселей
+LOSSLESS_PNG_MODES = ("1", "L", "LA", "I", "I;16", "P", "RGB", "RGBA")
+# Ниже этого числа задач пул процессов дороже, чем работа в текущем процессе
+POOL_THRESHOLD = 8
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _save_format(ext: str, has_alpha: bool) -> Tuple[str, Dict]:
+    """Формат хранения для расширения файла. Имя файла не меняется: PIL определяет формат по содержимому."""
+    if ext in (".jpg", ".jpeg") and not has_alpha:
+        return "JPEG", {"quality": 85, "optimize": True, "progressive": True}
+    if ext == ".webp":
+        return "WEBP", {"quality": 85, "method": 4}
+    # PNG и несжатые BMP храним как PNG без потерь
+    return "PNG", {"compress_level": 6}
+
+
+def transcode_image(src: str, dst: str, max_side: Optional[int] = None) -> bool:
+    """Перекодирует картинку в dst. Возвращает False, если выгоды нет и нужна обычная копия.
+
+    Без max_side разрешение и пиксели не меняются: PNG и BMP пережимаются
+    в PNG без потерь, JPEG/WEBP копируются как есть. С max_side картинка
+    больше предела уменьшается и сохраняется в своём формате.
+    """
+    ext = os.path.splitext(src)[1].lower()
+    if ext == ".gif":
+        # Анимацию не трогаем
+        return False
+    try:
+        size = os.path.getsize(src)
+        with Image.open(src) as probe:
+            width, height = probe.size
+            fmt = probe.format
+            animated = getattr(probe, "is_animated", False)
+        if animated:
+            return False
+        downscale = max_side is not None and max(width, height) > max_side
+
+        if downscale:
+            image = decode_image(src, (max_side, max_side))
+            if image is None:
+                return False
+            save_format, options = _save_format(ext, image.mode == "RGBA")
+            image.save(dst, format=save_format, **options)
+        else:
+            uncompressed = fmt == "BMP"
+            if fmt not in ("PNG", "BMP") or (size < MIN_TRANSCODE_BYTES and not uncompressed):
+                return False
+            with Image.open(src) as image:
+                if image.mode not in LOSSLESS_PNG_MODES:
+                    return False
+                image.save(dst, format="PNG", optimize=True)
+    except Exception:
+        return False
+
+    if os.path.getsize(dst) >= size:
+        os.remove(dst)
+        return False
+    return True
+
+
+def _hash_job(src: str) -> str:
+    return file_sha256(src)
+
+
+def _transcode_job(args: Tuple[str, str, Optional[int]]) -> bool:
+    return transcode_image(*args)
+
+
+def _map_chunk(func, items: List) -> List:
+    return [func(item) for item in items]
+
+
+def _run_jobs(func, items: List, processes: Optional[int]) -> List:
+    """func по всем items; большие наборы — пачками в пуле процессов общего TaskRunner.
+
+    processes=1 — всё в текущем процессе. При остановке исполнителя
+    (выход из программы) незапущенные пачки отменяются, и импорт
+    прерывается исключением.
+    """
+    if len(items) < POOL_THRESHOLD or processes == 1:
+        return _map_chunk(func, items)
+    runner = tasks.get_runner()
+    chunk = max(1, len(items) // 32)
+    handles = [
+        runner.submit(_map_chunk, func, items[start:start + chunk], process=True, name="image_import")
+        for start in range(0, len(items), chunk)
+    ]
+    try:
+        return [result for handle in handles for result in handle.result()]
+    finally:
+        for handle in handles:
+            handle.cancel()
+
+
+def _load_manifest(dest_dir: str) -> Dict[str, str]:
+    path = os.path.join(dest_dir, MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_manifest(dest_dir: str, manifest: Dict[str, str]) -> None:
+    path = os.path.join(dest_dir, MANIFEST_NAME)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
+
+
+def _remove_stale_work_dirs(work_dir: str) -> None:
+    """Убирает временные папки, оставшиеся от прерванного импорта."""
+    try:
+        names = os.listdir(work_dir)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        path = os.path.join(work_dir, name)
+        try:
+            # Свежую папку может прямо сейчас использовать импорт в другом процессе
+            if name.startswith(WORK_DIR_PREFIX) and now - os.path.getmtime(path) > STALE_WORK_DIR_S:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+def _copy_replace(src: str, dst: str) -> None:
+    """Копия через временный файл: не пишет внутрь inode, на который могут ссылаться дубли."""
+    tmp = f"{dst}.tmp"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def _link_or_copy(src: str, dst: str) -> bool:
+    """Жёсткая ссылка на уже сохранённую копию; при неудаче — обычное копирование. True = ссылка."""
+    tmp = f"{dst}.tmp"
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dst)
+        return True
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    _copy_replace(src, dst)
+    return False
+
+
+def import_images(src_dir: str, dest_dir: str, max_side: Optional[int] = None, processes: Optional[int] = None,
+                  work_dir: Optional[str] = None) -> Dict[str, int]:
+    """Импорт папки images теста: дедупликация по содержимому и перекодирование в пуле процессов.
+
+    Имена и относительные пути файлов сохраняются, поэтому текст теста не меняется.
+    Уменьшение больших картинок включается явно через max_side (например, DOWNSCALE_SIDE).
+    Промежуточные файлы пишутся в work_dir (по умолчанию — рядом с родителем dest_dir),
+    а не внутрь dest_dir, где их при сбое нашёл бы поиск картинок.
+    Манифест в dest_dir (хэш исходника → сохранённый файл) позволяет при повторном
+    импорте пропускать уже загруженные картинки и ставить жёсткие ссылки на дубли.
+    """
+    stats = {"files": 0, "transcoded": 0, "linked": 0, "skipped": 0, "copied": 0, "bytes_in": 0, "bytes_out": 0}
+    if not os.path.isdir(src_dir):
+        return stats
+
+    os.makedirs(dest_dir, exist_ok=True)
+    manifest = _load_manifest(dest_dir)
+
+    sources: List[Tuple[str, str]] = []
+    for dirpath, _dirnames, filenames in os.walk(src_dir):
+        for fname in filenames:
+            src_file = os.path.join(dirpath, fname)
+            sources.append((src_file, os.path.relpath(src_file, src_dir)))
+    stats["files"] = len(sources)
+
+    hashes = _run_jobs(_hash_job, [src for src, _rel in sources], processes)
+
+    # Хэш → сохранённый путь: и из прошлых импортов, и из текущего
+    stored: Dict[str, str] = {
+        digest: rel for digest, rel in manifest.items()
+        if os.path.isfile(os.path.join(dest_dir, rel))
+    }
+
+    def _remember(digest: str, rel: str) -> None:
+        # Файл rel перезаписан — старые записи манифеста на него больше не верны
+        for old_digest in [d for d, r in stored.items() if r == rel and d != digest]:
+            del stored[old_digest]
+        stored.setdefault(digest, rel)
+
+    placements: List[Tuple[str, str, str]] = []  # уникальное содержимое: (src, rel, hash)
+    duplicates: List[Tuple[str, str, str]] = []
+    planned = set()
+    for (src, rel), digest in zip(sources, hashes):
+        stats["bytes_in"] += os.path.getsize(src)
+        if stored.get(digest) == rel:
+            stats["skipped"] += 1
+            continue
+        if digest in stored or digest in planned:
+            duplicates.append((src, rel, digest))
+        else:
+            planned.add(digest)
+            placements.append((src, rel, digest))
+
+    # os.replace из временной папки требует той же файловой системы, что и dest_dir
+    work_dir = work_dir or os.path.dirname(os.path.abspath(dest_dir))
+    os.makedirs(work_dir, exist_ok=True)
+    _remove_stale_work_dirs(work_dir)
+    with tempfile.TemporaryDirectory(prefix=WORK_DIR_PREFIX, dir=work_dir) as tmp_dir:
+        jobs = []
+        for index, (src, rel, _digest) in enumerate(placements):
+            tmp_out = os.path.join(tmp_dir, f"{index}{os.path.splitext(rel)[1].lower()}")
+            jobs.append((src, tmp_out, max_side))
+        image_jobs = [job for job in jobs if os.path.splitext(job[0])[1].lower() in IMAGE_EXTS]
+        transcoded = dict(zip((job[1] for job in image_jobs), _run_jobs(_transcode_job, image_jobs, processes)))
+
+        for (src, rel, digest), (_src, tmp_out, _max_side) in zip(placements, jobs):
+            dst = os.path.join(dest_dir, rel)
+            try:
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                if transcoded.get(tmp_out):
+                    os.replace(tmp_out, dst)
+                    stats["transcoded"] += 1
+                else:
+                    _copy_replace(src, dst)
+                    stats["copied"] += 1
+                stats["bytes_out"] += os.path.getsize(dst)
+            except OSError:
+                continue
+            _remember(digest, rel)
+
+    for src, rel, digest in duplicates:
+        dst = os.path.join(dest_dir, rel)
+        target = stored.get(digest)
+        try:
+            if target is not None and os.path.exists(dst) and os.path.samefile(dst, os.path.join(dest_dir, target)):
+                stats["skipped"] += 1
+                continue
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            if target is not None and _link_or_copy(os.path.join(dest_dir, target), dst):
+                stats["linked"] += 1
+            else:
+                if target is None:
+                    _copy_replace(src, dst)
+                stats["copied"] += 1
+                stats["bytes_out"] += os.path.getsize(dst)
+        except OSError:
+            continue
+        _remember(digest, rel)
+
+    _save_manifest(dest_dir, stored)
+    return stats
@@ -0,0 +1,164 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+from . import image_refs, profiling, tasks
+from .models import Question
+from .thumbnail_cache import ThumbnailCache, get_thumbnail_cache
+
+
+ThumbKey = Tuple[str, int, int, str]  # (ссылка, ширина, высота, папка банка)
+
+# Рамки миниатюр, которые запрашивает QuizWindow (маленький и обычный экран)
+THUMBNAIL_SIZES: Tuple[Tuple[int, int], ...] = ((220, 180), (280, 220))
+
+
+def resolve_image_path(image_path: str, base_dir: str = "") -> Optional[str]:
+    """Надежно резолвит путь к картинке в рантайме (с памятью по банкам, см. core.image_refs)."""
+    return image_refs.resolve_image(image_path, base_dir)
+
+
+def _has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA", "RGBa", "La") or (image.mode == "P" and "transparency" in image.info)
+
+
+def decode_image(path: str, max_size: Optional[Tuple[int, int]] = None) -> Optional[Image.Image]:
+    """Декодирует картинку сразу в уменьшенном разрешении, если задана рамка.
+
+    JPEG масштабируется ещё в декодере (draft, DCT 1/2..1/8), остальные форматы
+    сначала целочисленно ужимаются reduce() (JPEG 2000 — прямо при загрузке),
+    и только потом идёт LANCZOS. Без альфа-канала результат в RGB, а не RGBA.
+    """
+    try:
+        with Image.open(path) as src:
+            target_mode = "RGBA" if _has_alpha(src) else "RGB"
+            image = src
+            if max_size:
+                # Запас x2 перед финальным LANCZOS, как reducing_gap в Pillow
+                max_w, max_h = max(1, max_size[0]) * 2, max(1, max_size[1]) * 2
+                if src.format == "JPEG":
+                    src.draft("RGB", (max_w, max_h))
+                if image.mode not in ("RGB", "RGBA", "L", "LA"):
+                    image = image.convert(target_mode)
+                factor = min(image.width // max_w, image.height // max_h)
+                if factor >= 2:
+                    image = image.reduce(factor)
+            if image.mode != target_mode:
+                image = image.convert(target_mode)
+            elif image is src:
+                image = src.copy()
+        if max_size:
+            image.thumbnail(max_size, Image.Resampling.LANCZOS)
+    except Exception:
+        return None
+    if image.width <= 0 or image.height <= 0:
+        return None
+    return image
+
+
+@profiling.timed("image.load")
+def load_thumbnail(path: str, max_w: int, max_h: int, cache: Optional[ThumbnailCache] = None) -> Optional[Image.Image]:
+    """Декодирует картинку и уменьшает её до заданной рамки. Без Tk — можно вызывать из потока."""
+    if cache is not None:
+        cached = cache.get(path, max_w, max_h)
+        if cached is not None:
+            return cached
+
+    image = decode_image(path, (max_w, max_h))
+    if image is None:
+        return None
+    if cache is not None:
+        cache.put(path, max_w, max_h, image)
+    return image
+
+
+def warm_thumbnail_cache(questions: Iterable[Question], cache: Optional[ThumbnailCache] = None,
+                         sizes: Iterable[Tuple[int, int]] = THUMBNAIL_SIZES) -> Tuple[int, int]:
+    """Заполняет кэш миниатюр для всех картинок банка. Возвращает (готово, не найдено)."""
+    cache = cache or get_thumbnail_cache()
+    seen = set()
+    warmed = missing = 0
+    for question in questions:
+        for _desc, img_path in question.images:
+            resolved = resolve_image_path(img_path, question.image_base_dir)
+            if not resolved:
+                missing += 1
+                continue
+            if resolved in seen:
+                continue
+            seen.add(resolved)
+            for max_w, max_h in sizes:
+                load_thumbnail(resolved, max_w, max_h, cache)
+            warmed += 1
+    return warmed, missing
+
+
+class ImagePrefetcher:
+    """Фоновое декодирование картинок для ближайших вопросов.
+
+    Задания общего исполнителя (core.tasks) ищут файлы по ссылкам и готовят
+    PIL-миниатюры заранее, в Tk-потоке остаётся только обёртка в PhotoImage.
+    """
+
+    def __init__(self, lookahead: int = 3, cache: Optional[ThumbnailCache] = None, runner: Optional[tasks.TaskRunner] = None):
+        self.lookahead = lookahead
+        self.cache = cache
+        self._runner = runner or tasks.get_runner()
+        self._futures: Dict[ThumbKey, tasks.TaskHandle] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def prefetch(self, questions: Iterable[Question], max_w: int, max_h: int) -> None:
+        """Ставит в очередь картинки указанных вопросов; устаревшие задания отменяются."""
+        if self._closed:
+            return
+
+        wanted: List[ThumbKey] = []
+        for question in questions:
+            for _desc, img_path in question.images:
+                key = (img_path, max_w, max_h, question.image_base_dir)
+                if key not in wanted:
+                    wanted.append(key)
+
+        with self._lock:
+            for key in list(self._futures):
+                if key not in wanted and self._futures[key].cancel():
+                    del self._futures[key]
+
+            for key in wanted:
+                if key not in self._futures:
+                    self._futures[key] = self._runner.submit(self._decode, *key, name="prefetch")
+
+    def get(self, image_path: str, max_w: int, max_h: int, base_dir: str = "") -> Tuple[Optional[Image.Image], Optional[str]]:
+        """Возвращает (миниатюра, резолвленный путь); при промахе декодирует синхронно."""
+        key = (image_path, max_w, max_h, base_dir)
+        with self._lock:
+            future = self._futures.pop(key, None)
+
+        # Если задание ещё не стартовало — дешевле сделать его здесь, чем ждать очередь
+        if future is not None and (future.running() or future.done()):
+            try:
+                return future.result()
+            except Exception:
+                pass
+        elif future is not None:
+            future.cancel()
+
+        return self._decode(image_path, max_w, max_h, base_dir)
+
+    def resolve(self, image_path: str, base_dir: str = "") -> Optional[str]:
+        return resolve_image_path(image_path, base_dir)
+
+    def _decode(self, image_path: str, max_w: int, max_h: int, base_dir: str = "") -> Tuple[Optional[Image.Image], Optional[str]]:
+        resolved = self.resolve(image_path, base_dir)
+        if not resolved:
+            return None, None
+        return load_thumbnail(resolved, max_w, max_h, self.cache), resolved
+
+    def shutdown(self) -> None:
+        self._closed = True
+        with self._lock:
+            for handle in self._futures.values():
+                handle.cancel()
+            self._futures.clear()
@@ -0,0 +1,123 @@
+import math
+import threading
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from .image_cache import ImageMemoryCache
+from .image_loader import decode_image
+
+
+class ImagePyramid:
+    """Ленивая многоуровневая пирамида картинки для просмотра с зумом.
+
+    Уровень L — картинка, уменьшенная в 2^L раз. Уровни строятся по запросу:
+    из ближайшего уже готового более детального уровня через reduce(),
+    иначе прямым декодированием в нужном разрешении (для JPEG — через draft).
+    Полное разрешение (уровень 0) декодируется только при сильном приближении.
+    Тайлы режутся из уровня лениво и кэшируются по объёму пикселей.
+    """
+
+    TILE_SIZE = 256
+
+    def __init__(self, path: str, tile_cache_bytes: int = 32 * 1024 * 1024):
+        self.path = path
+        with Image.open(path) as probe:
+            self.width, self.height = probe.size
+        # Самый грубый уровень целиком помещается в один тайл
+        self.max_level = max(0, math.ceil(math.log2(max(self.width, self.height, 1) / self.TILE_SIZE)))
+        self._levels: Dict[int, Image.Image] = {}
+        self._tiles = ImageMemoryCache(tile_cache_bytes)
+        self._lock = threading.Lock()
+
+    def level_for_zoom(self, zoom: float) -> int:
+        """Самый грубый уровень, который при данном зуме ещё не увеличивается."""
+        if zoom >= 1.0:
+            return 0
+        return max(0, min(self.max_level, int(math.floor(math.log2(1.0 / zoom)))))
+
+    def fit_zoom(self, box_w: int, box_h: int) -> float:
+        return min(box_w / self.width, box_h / self.height)
+
+    def has_level(self, level: int) -> bool:
+        return level in self._levels
+
+    def nearest_built(self, level: int) -> Optional[int]:
+        """Ближайший готовый уровень на замену: лучше грубее (мало тайлов), чем детальнее."""
+        built = sorted(self._levels)
+        if not built:
+            return None
+        coarser = [l for l in built if l >= level]
+        return coarser[0] if coarser else built[-1]
+
+    def level_image(self, level: int) -> Optional[Image.Image]:
+        return self._levels.get(level)
+
+    def level_scale(self, level: int) -> float:
+        """Отношение размера уровня к оригиналу."""
+        image = self._levels.get(level)
+        if image is not None:
+            return image.width / self.width
+        return 1.0 / (2 ** level)
+
+    def build_level(self, level: int) -> Optional[Image.Image]:
+        """Строит уровень (можно из фонового потока)."""
+        level = max(0, min(self.max_level, level))
+        with self._lock:
+            if level in self._levels:
+                return self._levels[level]
+            finer = [l for l in self._levels if l < level]
+            # Ссылку на источник берём под замком: release_finest может удалить уровень
+            source_level = max(finer) if finer else None
+            source = self._levels[source_level] if finer else None
+
+        if source is not None:
+            image = source.reduce(2 ** (level - source_level))
+        elif level == 0:
+            image = decode_image(self.path)
+        else:
+            scale = 2 ** level
+            image = decode_image(self.path, (max(1, self.width // scale), max(1, self.height // scale)))
+
+        if image is None:
+            return None
+        with self._lock:
+            self._levels.setdefault(level, image)
+            return self._levels[level]
+
+    def tile(self, level: int, tx: int, ty: int) -> Optional[Image.Image]:
+        key = (level, tx, ty)
+        cached = self._tiles.get(key)
+        if cached is not None:
+            return cached
+
+        image = self._levels.get(level)
+        if image is None:
+            return None
+        size = self.TILE_SIZE
+        box = (tx * size, ty * size, min(image.width, (tx + 1) * size), min(image.height, (ty + 1) * size))
+        if box[0] >= box[2] or box[1] >= box[3]:
+            return None
+        tile = image.crop(box)
+        self._tiles.put(key, tile)
+        return tile
+
+    def tile_grid(self, level: int) -> Tuple[int, int]:
+        image = self._levels.get(level)
+        if image is None:
+            return 0, 0
+        return math.ceil(image.width / self.TILE_SIZE), math.ceil(image.height / self.TILE_SIZE)
+
+    @property
+    def nbytes(self) -> int:
+        total = self._tiles.total_bytes
+        for image in self._levels.values():
+            total += image.width * image.height * len(image.getbands())
+        return total
+
+    def release_finest(self, keep_from_level: int) -> None:
+        """Освобождает уровни детальнее keep_from_level (например, после отдаления)."""
+        with self._lock:
+            for level in [l for l in self._levels if l < keep_from_level]:
+                del self._levels[level]
+        self._tiles.clear()
@@ -0,0 +1,132 @@
+"""Поиск файлов картинок по ссылкам из банков.
+
+Парсер только запоминает ссылку `!(Подпись)[ссылка]` и папку банка
+(Question.image_base_dir), не обращаясь к диску. Путь ищется здесь при
+первом показе вопроса и запоминается для каждого банка: вопросы, не
+попавшие в выборку MAX_QUESTIONS, диск не трогают вовсе.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .file_manager import FileManager
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Промах помнится недолго: картинку могут доложить или импортировать, не перезапуская программу
+MISS_TTL_S = 30.0
+
+_memo: Dict[str, Dict[str, str]] = {}  # папка банка → ссылка → найденный путь
+_misses: Dict[Tuple[str, str], float] = {}  # (папка банка, ссылка) → когда не нашли
+_memo_lock = threading.Lock()
+
+
+def normalize_ref(ref: str) -> str:
+    return ref.strip().replace("\\", os.sep).replace("/", os.sep)
+
+
+def _candidates(rel: str, base_dir: str, file_manager: FileManager) -> List[str]:
+    tests_root = os.path.join(PROJECT_ROOT, "tests")
+    cwd = os.getcwd()
+    candidates = []
+    if base_dir:
+        candidates += [os.path.join(base_dir, rel), os.path.join(base_dir, "images", rel)]
+    candidates += [
+        os.path.join(tests_root, "images", rel),
+        os.path.join(PROJECT_ROOT, "images", rel),
+        os.path.join(cwd, rel),
+        os.path.join(cwd, "images", rel),
+        os.path.join(file_manager.get_base_tests_dir(), rel),
+        os.path.join(file_manager.get_user_tests_dir(), rel),
+        os.path.join(file_manager.get_base_tests_dir(), "images", rel),
+        os.path.join(file_manager.get_user_tests_dir(), "images", rel),
+    ]
+    return candidates
+
+
+def _search_roots(base_dir: str, file_manager: FileManager) -> List[str]:
+    tests_root = os.path.join(PROJECT_ROOT, "tests")
+    cwd = os.getcwd()
+    roots = []
+    if base_dir:
+        roots += [os.path.dirname(base_dir), base_dir]
+    roots += [
+        tests_root,
+        os.path.join(PROJECT_ROOT, "images"),
+        file_manager.get_base_tests_dir(),
+        file_manager.get_user_tests_dir(),
+        cwd,
+    ]
+    return roots
+
+
+def _find_by_basename(filename: str, roots: List[str]) -> Optional[str]:
+    """Ищет файл изображения по имени в наборах директорий (ограниченно)."""
+    target = os.path.basename(filename).lower()
+    seen = set()
+    for root in roots:
+        if not root or root in seen or not os.path.isdir(root):
+            continue
+        seen.add(root)
+        try:
+            for dirpath, _dirnames, files in os.walk(root):
+                for f in files:
+                    if f.lower() == target:
+                        return os.path.join(dirpath, f)
+        except Exception:
+            continue
+    return None
+
+
+def _lookup(ref: str, base_dir: str) -> Optional[str]:
+    normalized = normalize_ref(ref)
+    if os.path.isabs(normalized) and os.path.exists(normalized):
+        return normalized  # уже найденный путь (например, из клика по миниатюре)
+
+    rel = normalized.lstrip("/\\")
+    file_manager = FileManager()
+    for candidate in _candidates(rel, base_dir, file_manager):
+        if os.path.exists(candidate):
+            return candidate
+    return _find_by_basename(rel, _search_roots(base_dir, file_manager))
+
+
+def resolve_image(ref: str, base_dir: str = "") -> Optional[str]:
+    """Путь к картинке ссылки ref из банка в папке base_dir; None — не найдена.
+
+    Найденный путь запоминается для банка; если файл с тех пор удалили,
+    он ищется заново. Промах запоминается на MISS_TTL_S, чтобы повторные
+    показы не обходили папки, или до forget_misses().
+    """
+    if not ref:
+        return None
+    with _memo_lock:
+        cached = _memo.get(base_dir, {}).get(ref)
+        missed_at = _misses.get((base_dir, ref))
+    if cached is not None and os.path.exists(cached):
+        return cached
+    if missed_at is not None and time.monotonic() - missed_at < MISS_TTL_S:
+        return None
+
+    resolved = _lookup(ref, base_dir)
+    with _memo_lock:
+        if resolved is None:
+            _memo.get(base_dir, {}).pop(ref, None)
+            _misses[(base_dir, ref)] = time.monotonic()
+        else:
+            _memo.setdefault(base_dir, {})[ref] = resolved
+            _misses.pop((base_dir, ref), None)
+    return resolved
+
+
+def forget_misses():
+    """Забыть промахи: вызывается после импорта картинок и перед обновлением каталога."""
+    with _memo_lock:
+        _misses.clear()
+
+
+def clear():
+    with _memo_lock:
+        _memo.clear()
+        _misses.clear()
@@ -0,0 +1,230 @@
+"""Монитор задержек цикла событий Tk.
+
+Проба через root.after(INTERVAL_MS) замеряет, насколько позже срока она
+сработала: это и есть задержка отклика интерфейса. Задержки копятся в
+гистограмму. Если проба не срабатывает дольше порога, сторожевой поток
+снимает стек Python у потока Tk (sys._current_frames) — по нему видно,
+какой код держит интерфейс.
+
+Включается настройкой LAG_MONITOR или PYQUIZ_PROFILE=lag. Сводка попадает
+в отчёт профилирования (раздел event_loop_lag) и в результат теста.
+"""
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from . import profiling
+
+INTERVAL_MS = 25
+THRESHOLD_MS = 250
+MAX_STALLS = 20
+STACK_DEPTH = 25
+BUCKETS_MS = (5, 10, 20, 50, 100, 250, 500, 1000, 2000)
+
+_monitor: Optional["LagMonitor"] = None
+
+
+class LagHistogram:
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, lag_ms: float):
+        index = 0
+        while index < len(BUCKETS_MS) and lag_ms >= BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += lag_ms
+        if lag_ms > self.max_ms:
+            self.max_ms = lag_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<{BUCKETS_MS[0]}"]
+        labels += [f"{low}-{high}" for low, high in zip(BUCKETS_MS, BUCKETS_MS[1:])]
+        labels.append(f">={BUCKETS_MS[-1]}")
+        return {
+            "probes": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class LagMonitor:
+    """Проба в цикле Tk плюс сторожевой поток, снимающий стек при зависании."""
+
+    def __init__(self, root, interval_ms: int = INTERVAL_MS, threshold_ms: int = THRESHOLD_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._after_id = None
+        self._tk_thread: Optional[int] = None
+        self._expected = 0.0
+        self._last_beat = 0.0
+        self._open_stall: Optional[Dict[str, Any]] = None
+
+        self._total = LagHistogram()
+        self._stalls = deque(maxlen=MAX_STALLS)
+        self._stall_count = 0
+        self._session = LagHistogram()
+        self._session_stalls: List[Dict[str, Any]] = []
+        self._session_started: Optional[str] = None
+
+    # --- запуск ---
+
+    def start(self):
+        """Вызывается из потока Tk."""
+        self._tk_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._schedule(self._last_beat)
+        threading.Thread(target=self._watch, name="pyquiz-lag-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _schedule(self, now: float):
+        self._expected = now + self.interval_ms / 1000
+        try:
+            self._after_id = self.root.after(self.interval_ms, self._probe)
+        except Exception:
+            # Корневое окно уничтожено — мониторить больше нечего
+            self._stop.set()
+
+    # --- поток Tk ---
+
+    def _probe(self):
+        if self._stop.is_set():
+            return
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._expected) * 1000)
+        with self._lock:
+            self._last_beat = now
+            self._total.add(lag_ms)
+            self._session.add(lag_ms)
+            stall, self._open_stall = self._open_stall, None
+            if stall is not None:
+                stall["lag_ms"] = round(lag_ms, 1)
+        if lag_ms >= self.threshold_ms:
+            profiling.record("tk.lag", lag_ms / 1000)
+        self._schedule(now)
+
+    # --- сторожевой поток ---
+
+    def _watch(self):
+        period = max(self.interval_ms, self.threshold_ms // 4) / 1000
+        while not self._stop.wait(period):
+            with self._lock:
+                stalled_ms = (time.perf_counter() - self._last_beat) * 1000 - self.interval_ms
+                if stalled_ms < self.threshold_ms or self._open_stall is not None:
+                    continue
+            # Стек снимаем вне блокировки: проба не должна ждать сторожа
+            stall = {
+                "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "lag_ms": None,  # допишет проба, когда цикл Tk оживёт
+                "stack": self._tk_stack(),
+            }
+            with self._lock:
+                if self._open_stall is not None:
+                    continue
+                self._open_stall = stall
+                self._stalls.append(stall)
+                self._stall_count += 1
+                if self._session_started is not None and len(self._session_stalls) < MAX_STALLS:
+                    self._session_stalls.append(stall)
+            profiling.instant("tk.stall", stalled_ms=round(stalled_ms, 1))
+
+    def _tk_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._tk_thread)
+        if frame is None:
+            return []
+        lines = []
+        for entry in traceback.extract_stack(frame)[-STACK_DEPTH:]:
+            where = f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}"
+            lines.append(f"{where}: {entry.line}" if entry.line else where)
+        return lines
+
+    # --- сводки ---
+
+    def start_session(self):
+        """Начало теста: сводка для результата считается с этого момента."""
+        with self._lock:
+            self._session = LagHistogram()
+            self._session_stalls = []
+            self._session_started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def session_summary(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._session_started is None:
+                return {}
+            return {
+                "started": self._session_started,
+                "threshold_ms": self.threshold_ms,
+                "histogram": self._session.to_dict(),
+                "stalls": [dict(stall) for stall in self._session_stalls],
+            }
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "interval_ms": self.interval_ms,
+                "threshold_ms": self.threshold_ms,
+                "histogram": self._total.to_dict(),
+                "stall_count": self._stall_count,
+                "stalls": [dict(stall) for stall in self._stalls],
+            }
+
+
+# --- API модуля ---
+
+def is_requested(settings) -> bool:
+    profiler = profiling.get_profiler()
+    return bool(getattr(settings, "LAG_MONITOR", False)) or (profiler is not None and "lag" in profiler.options)
+
+
+def apply_settings(root, settings) -> Optional[LagMonitor]:
+    """Запускает или останавливает монитор по настройкам; вызывается из потока Tk."""
+    global _monitor
+    if is_requested(settings):
+        if _monitor is None:
+            _monitor = LagMonitor(root)
+            _monitor.start()
+            profiler = profiling.get_profiler()
+            if profiler is not None:
+                profiler.add_section("event_loop_lag", _monitor.summary)
+    elif _monitor is not None:
+        _monitor.stop()
+        _monitor = None
+    return _monitor
+
+
+def get_monitor() -> Optional[LagMonitor]:
+    return _monitor
+
+
+def start_session():
+    monitor = _monitor
+    if monitor is not None:
+        monitor.start_session()
+
+
+def session_summary() -> Dict[str, Any]:
+    monitor = _monitor
+    return monitor.session_summary() if monitor is not None else {}
@@ -14,8 +14,9 @@ class Question:
     options: List[str]
     question_type: QuestionType
     correct_answer: Any  # Может быть str, set, list кортежей, или list строк
-    images: List[Tuple[str, str]] = field(default_factory=list)  # (описание, путь)
+    images: List[Tuple[str, str]] = field(default_factory=list)  # (описание, ссылка из файла)
     source_topic: str = ""
+    image_base_dir: str = ""  # папка банка, от которой ищутся картинки (core.image_refs)
 
 @dataclass
 class Quiz:
@@ -36,4 +37,6 @@ class TestResult:
     timestamp: str
     time_left: Optional[Tuple[int, int]] = None
     timeout: bool = False
-    detailed_results: List[Dict[str, Any]] = field(default_factory=list)
\ No newline at end of file
+    detailed_results: List[Dict[str, Any]] = field(default_factory=list)
+    focus_incidents: List[Dict[str, Any]] = field(default_factory=list)  # журнал потери фокуса
+    event_loop_lag: Dict[str, Any] = field(default_factory=dict)  # сводка монитора задержек Tk, если включён
\ No newline at end of file
@@ -1,6 +1,7 @@
 import re
 import os
 from typing import Any, List, Optional, Tuple
+from . import profiling
 from .models import Question, QuestionType, Quiz
 
 class QuizParser:
@@ -18,22 +19,6 @@ class QuizParser:
         """Удаляет префикс нумерации вида `1.2. ` из строки."""
         return re.sub(r"^\d+(?:\.\d+)*\.\s*", "", text).strip()
 
-    @staticmethod
-    def _find_image_by_basename(filename: str, roots: List[str]) -> Optional[str]:
-        """Ищет файл изображения по имени в наборах директорий (ограниченно)."""
-        target = os.path.basename(filename).lower()
-        for root in roots:
-            if not root or not os.path.isdir(root):
-                continue
-            try:
-                for dirpath, _dirnames, files in os.walk(root):
-                    for f in files:
-                        if f.lower() == target:
-                            return os.path.join(dirpath, f)
-            except Exception:
-                continue
-        return None
-
     @staticmethod
     def parse_answer_line(line: str) -> Tuple[Optional[QuestionType], Any]:
         """Парсит строку ответа"""
@@ -63,8 +48,18 @@ class QuizParser:
             return None, None
 
     @staticmethod
-    def parse_question_file(filepath: str) -> Quiz:
-        """Парсит файл с вопросами"""
+    def _warn(warnings: Optional[List[str]], line_no: int, message: str):
+        if warnings is not None:
+            warnings.append(f"строка {line_no}: {message}")
+
+    @staticmethod
+    @profiling.timed("parse")
+    def parse_question_file(filepath: str, warnings: Optional[List[str]] = None) -> Quiz:
+        """Парсит файл с вопросами.
+
+        В warnings (если передан список) складываются пропущенные вопросы.
+        Картинки на диске не ищутся: в вопросе остаются ссылки и папка банка.
+        """
         try:
             with open(filepath, "r", encoding="utf-8") as f:
                 lines = [line.rstrip() for line in f]
@@ -82,6 +77,7 @@ class QuizParser:
 
         tests_root = os.path.abspath("tests")
         file_abs = os.path.abspath(filepath)
+        image_base_dir = os.path.dirname(file_abs)
         if file_abs.startswith(tests_root):
             source_topic = os.path.dirname(os.path.relpath(file_abs, tests_root)).replace(os.sep, " / ")
         else:
@@ -95,46 +91,14 @@ class QuizParser:
 
 
             question_text = QuizParser._strip_section_prefix(line)
+            question_line_no = i + 1
             i += 1
             options = []
             images = []
 
-            # Извлекаем изображения из текста вопроса
-            file_dir = os.path.dirname(filepath)
-            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-            tests_root_abs = os.path.join(project_root, "tests")
-            cwd = os.getcwd()
+            # Изображения только запоминаются: путь ищется при первом показе (core.image_refs)
             for match in QuizParser.IMAGE_RE.finditer(question_text):
-                rel_image_path = match.group(2).strip().replace("\\", os.sep).replace("/", os.sep)
-                rel_image_path = rel_image_path.lstrip("/\\")
-
-                candidates = [
-                    os.path.join(file_dir, rel_image_path),
-                    os.path.join(file_dir, "images", rel_image_path),
-                    os.path.join(tests_root_abs, "images", rel_image_path),
-                    os.path.join(project_root, "images", rel_image_path),
-                    os.path.join(project_root, "tests", "images", rel_image_path),
-                    os.path.join(cwd, rel_image_path),
-                    os.path.join(cwd, "images", rel_image_path),
-                ]
-                resolved = next((c for c in candidates if os.path.exists(c)), None)
-
-                if not resolved:
-                    fallback = QuizParser._find_image_by_basename(
-                        rel_image_path,
-                        [
-                            os.path.dirname(file_dir),
-                            file_dir,
-                            os.path.join(file_dir, "images"),
-                            tests_root_abs,
-                            os.path.join(tests_root_abs, "images"),
-                            os.path.join(project_root, "images"),
-                            cwd,
-                        ],
-                    )
-                    resolved = fallback or candidates[0]
-
-                images.append((match.group(1).strip(), resolved))
+                images.append((match.group(1).strip(), match.group(2).strip()))
 
             # Очищаем текст вопроса от markdown-вставок изображений
             question_text = QuizParser.IMAGE_RE.sub("", question_text).strip()
@@ -177,24 +141,30 @@ class QuizParser:
                         question_type=QuestionType.FREEFORM,
                         correct_answer=correct_answers,
                         images=images,
+                        image_base_dir=image_base_dir,
                         source_topic=source_topic
                     ))
+                else:
+                    QuizParser._warn(warnings, question_line_no, "вопрос без вариантов и без ответа пропущен")
                 continue
 
             # Обычный вопрос
             if i >= len(lines):
+                QuizParser._warn(warnings, question_line_no, "файл закончился до строки ответа")
                 break
 
             answer_line = lines[i].strip()
             i += 1
 
             if not QuizParser.ANSWER_CANDIDATE_RE.match(answer_line.upper()):
+                QuizParser._warn(warnings, question_line_no, f"не найдена строка ответа, вопрос пропущен: {answer_line[:40]}")
                 while i < len(lines) and not lines[i].strip():
                     i += 1
                 continue
 
             qtype, correct = QuizParser.parse_answer_line(answer_line)
             if not qtype or not correct:
+                QuizParser._warn(warnings, question_line_no, f"не разобран ответ «{answer_line}», вопрос пропущен")
                 continue
 
             # Проверка валидности
@@ -216,8 +186,11 @@ class QuizParser:
                     question_type=qtype,
                     correct_answer=correct,
                     images=images,
+                    image_base_dir=image_base_dir,
                     source_topic=source_topic
                 ))
+            else:
+                QuizParser._warn(warnings, question_line_no, f"ответ «{answer_line}» не совпадает с вариантами, вопрос пропущен")
 
             # Пропуск пустых строк
             while i < len(lines) and not lines[i].strip():
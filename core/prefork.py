@@ -0,0 +1,249 @@
+"""Резидентный помощник быстрого запуска (Linux/macOS).
+
+    python main.py prefork          # держать процесс с прогретыми модулями и банками
+    python main.py launch           # ярлык: попросить помощника, иначе обычный запуск
+
+Помощник один раз импортирует customtkinter, все экраны и PIL, загружает
+настройки и разбирает банки в QuizCache, а затем слушает Unix-сокет в
+папке данных. По запросу «launch» он делает fork(): дочерний процесс уже
+содержит всё прогретое и сразу создаёт окно. Tk в помощнике не создаётся —
+соединение с X-сервером у каждого экземпляра своё.
+
+Протокол — одна JSON-строка в каждую сторону:
+    {"command": "launch", "env": {...}, "cwd": "..."} → {"pid": 1234}
+    {"command": "ping"} → {"pid": <помощник>, "banks": N, "launches": N}
+    {"command": "stop"} → {"stopped": true}
+"""
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from .file_manager import FileManager
+
+SOCKET_NAME = "prefork.sock"
+CONNECT_TIMEOUT = 2.0
+
+# Всё, что экземпляр приложения импортирует лениво, помощник грузит заранее
+WARM_MODULES = (
+    "customtkinter",
+    "PIL.Image",
+    "PIL.ImageTk",
+    "ui.main_window",
+    "ui.navigation",
+    "ui.name_input",
+    "ui.preparation",
+    "ui.quiz_window",
+    "ui.results_window",
+    "ui.error_review_window",
+    "ui.test_selection_window",
+    "ui.settings_window",
+    "core.quiz_logic",
+    "core.bank_catalog",
+    "core.search_index",
+    "services.telegram_service",
+)
+
+
+def is_supported() -> bool:
+    return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+
+def socket_path() -> str:
+    return os.path.join(FileManager().get_user_data_dir(), SOCKET_NAME)
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]):
+    conn.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def _receive(conn: socket.socket) -> Dict[str, Any]:
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data.decode("utf-8")) if data.strip() else {}
+
+
+# --- клиент ---
+
+def request(message: Dict[str, Any], path: Optional[str] = None, timeout: float = CONNECT_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """Запрос к помощнику; None — помощник не запущен или не ответил."""
+    if not is_supported():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(path or socket_path())
+            _send(conn, message)
+            return _receive(conn)
+    except (OSError, ValueError):
+        return None
+
+
+def request_launch(path: Optional[str] = None) -> Optional[int]:
+    """Просит помощника запустить экземпляр с окружением текущего процесса. Возвращает pid."""
+    reply = request({"command": "launch", "env": dict(os.environ), "cwd": os.getcwd()}, path)
+    if not reply or "pid" not in reply:
+        return None
+    return int(reply["pid"])
+
+
+# --- помощник ---
+
+class PreforkServer:
+    """Процесс с прогретым интерпретатором, порождающий экземпляры приложения через fork()."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or socket_path()
+        self.launches = 0
+        self._listener: Optional[socket.socket] = None
+
+    def warm(self) -> Dict[str, Any]:
+        """Импорты, настройки и банки. Потоки здесь не запускаются: после fork() они бы пропали."""
+        import importlib
+
+        started = time.perf_counter()
+        for name in WARM_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"Помощник: модуль {name} не загружен: {e}")
+        imported_ms = (time.perf_counter() - started) * 1000
+
+        from .quiz_cache import get_quiz_cache
+        from .settings import SettingsManager
+
+        settings = SettingsManager().load()
+        started = time.perf_counter()
+        files = FileManager().get_all_test_files(include_base=not settings.HIDE_BUILTIN_TESTS)
+        parsed = get_quiz_cache().warm(files)
+        return {"imported_ms": round(imported_ms), "banks": parsed, "parsed_ms": round((time.perf_counter() - started) * 1000)}
+
+    def _bind(self) -> socket.socket:
+        if os.path.exists(self.path):
+            if request({"command": "ping"}, self.path, timeout=0.5) is not None:
+                raise RuntimeError(f"Помощник уже запущен: {self.path}")
+            os.unlink(self.path)  # сокет остался от упавшего процесса
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        os.chmod(self.path, 0o600)
+        listener.listen(8)
+        return listener
+
+    def serve_forever(self):
+        # Дочерние экземпляры не оставляют зомби; в самих экземплярах обработчик сбрасывается
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        self._listener = self._bind()
+        print(f"Помощник запуска слушает {self.path} (pid {os.getpid()})")
+        try:
+            while True:
+                conn, _addr = self._listener.accept()
+                conn.settimeout(CONNECT_TIMEOUT)
+                with conn:
+                    try:
+                        message = _receive(conn)
+                    except (OSError, ValueError):
+                        continue
+                    if not self._handle(conn, message):
+                        break
+        finally:
+            self._listener.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+    def _handle(self, conn: socket.socket, message: Dict[str, Any]) -> bool:
+        """False — помощнику пора завершиться."""
+        command = message.get("command")
+        if command == "ping":
+            from .quiz_cache import get_quiz_cache
+
+            _send(conn, {"pid": os.getpid(), "banks": len(get_quiz_cache()), "launches": self.launches})
+        elif command == "stop":
+            _send(conn, {"stopped": True})
+            return False
+        elif command == "launch":
+            pid = os.fork()
+            if pid == 0:
+                conn.close()
+                self._run_instance(message)  # не возвращается
+            self.launches += 1
+            _send(conn, {"pid": pid})
+            # Пока экземпляр стартует, подхватываем изменённые банки для следующего запуска
+            self._refresh_banks()
+        else:
+            _send(conn, {"error": f"неизвестная команда: {command}"})
+        return True
+
+    @staticmethod
+    def _refresh_banks():
+        from .quiz_cache import get_quiz_cache
+        from .settings import SettingsManager
+
+        try:
+            settings = SettingsManager().load()
+            get_quiz_cache().warm(FileManager().get_all_test_files(include_base=not settings.HIDE_BUILTIN_TESTS))
+        except Exception as e:
+            print(f"Помощник: не удалось обновить банки: {e}")
+
+    def _run_instance(self, message: Dict[str, Any]):
+        """Дочерний процесс: окружение запросившего ярлыка и обычный старт приложения."""
+        code = 1
+        try:
+            self._listener.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            os.setsid()
+            env = message.get("env")
+            if isinstance(env, dict):
+                os.environ.clear()
+                os.environ.update({str(k): str(v) for k, v in env.items()})
+            cwd = message.get("cwd")
+            if cwd and os.path.isdir(cwd):
+                os.chdir(cwd)
+
+            from . import profiling, tasks
+
+            profiling.enable_from_environment()
+
+            FileManager()._setup_directories()
+            _app_class()().run()
+            tasks.wait_critical()
+            profiling.write_report()
+            code = 0
+        except BaseException as e:
+            print(f"Экземпляр из помощника завершился с ошибкой: {e}")
+        finally:
+            sys.stdout.flush()
+            os._exit(code)
+
+
+def _app_class():
+    # Помощник обычно запущен как «python main.py prefork»: класс уже есть в __main__
+    app_class = getattr(sys.modules.get("__main__"), "PyQuizApp", None)
+    if app_class is None:
+        from main import PyQuizApp as app_class
+    return app_class
+
+
+def serve(path: Optional[str] = None) -> int:
+    if not is_supported():
+        print("Помощник запуска работает только там, где есть fork() и Unix-сокеты")
+        return 1
+    server = PreforkServer(path)
+    stats = server.warm()
+    print(f"Прогрето: импорты {stats['imported_ms']} мс, банков {stats['banks']} за {stats['parsed_ms']} мс")
+    try:
+        server.serve_forever()
+    except RuntimeError as e:
+        print(e)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,312 @@
+"""Встроенное профилирование: замеры этапов и отчёт в папку данных.
+
+Включается переменной окружения PYQUIZ_PROFILE или настройкой PROFILE:
+
+    PYQUIZ_PROFILE=1 python main.py                       # только замеры этапов
+    PYQUIZ_PROFILE=cprofile,tracemalloc python main.py    # плюс cProfile и tracemalloc
+    PYQUIZ_PROFILE=trace python main.py                   # плюс трасса для chrome://tracing
+    PYQUIZ_PROFILE=lag python main.py                     # плюс монитор задержек Tk (core.lag_monitor)
+
+Код приложения оборачивает этапы в span("имя") или @timed("имя").
+Пока профилирование выключено, span() отдаёт общий пустой контекст,
+а @timed — одну проверку глобальной переменной, так что накладные
+расходы ничтожны. Отчёт пишется в <данные>/profiles/ по завершении
+теста и при выходе из программы.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .trace_events import TraceRecorder
+
+ENV_VAR = "PYQUIZ_PROFILE"
+OPTIONS = ("cprofile", "tracemalloc", "trace", "lag")
+MAX_SAMPLES = 5000  # на этап; дальше копятся только сумма, число и максимум
+TOP_ENTRIES = 30
+
+_NULL_SPAN = contextlib.nullcontext()
+_profiler: Optional["Profiler"] = None
+_enable_lock = threading.Lock()
+
+
+def parse_options(value: Optional[str]) -> Optional[Set[str]]:
+    """Значение PYQUIZ_PROFILE → набор опций; None — профилирование выключено."""
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return None
+    return {part.strip() for part in value.split(",") if part.strip() in OPTIONS}
+
+
+class _StageStats:
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: List[float] = []
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def pct(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3) if ordered else 0.0
+
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "started")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = self.profiler.begin(self.name)
+        return self
+
+    def __exit__(self, *_exc):
+        self.profiler.end(self.name, self.started)
+        return False
+
+
+class Profiler:
+    """Накопитель замеров одного запуска программы."""
+
+    def __init__(self, options: Set[str]):
+        self.options = set(options)
+        self.started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, _StageStats] = {}
+        # Дополнительные разделы отчёта (например, монитор задержек Tk)
+        self._sections: Dict[str, Callable[[], Any]] = {}
+        self.report_path: Optional[str] = None
+        # События begin/end всех потоков для chrome://tracing и Perfetto
+        self.tracer: Optional[TraceRecorder] = TraceRecorder() if "trace" in self.options else None
+
+        self._cprofile = None
+        if "cprofile" in self.options:
+            import cProfile
+
+            # cProfile видит только поток, в котором включён, — это поток Tk
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+        if "tracemalloc" in self.options:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+
+    def span(self, name: str) -> _Span:
+        return _Span(self, name)
+
+    def begin(self, name: str) -> float:
+        started = time.perf_counter()
+        if self.tracer is not None:
+            self.tracer.begin(name, started)
+        return started
+
+    def end(self, name: str, started: float):
+        ended = time.perf_counter()
+        if self.tracer is not None:
+            self.tracer.end(name, ended)
+        self.record(name, ended - started)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = _StageStats()
+            stats.add(seconds)
+
+    def add_section(self, name: str, provider: Callable[[], Any]):
+        self._sections[name] = provider
+
+    # --- отчёт ---
+
+    def _cprofile_section(self, stem: str) -> Dict[str, Any]:
+        import io
+        import pstats
+
+        self._cprofile.disable()
+        try:
+            prof_path = f"{stem}.prof"
+            self._cprofile.dump_stats(prof_path)
+            out = io.StringIO()
+            pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(TOP_ENTRIES)
+            return {"file": prof_path, "top_cumulative": out.getvalue().splitlines()}
+        finally:
+            self._cprofile.enable()
+
+    def _trace_section(self, stem: str) -> Dict[str, Any]:
+        trace_path = f"{stem}.trace.json"
+        events = self.tracer.write(trace_path)
+        return {"file": trace_path, "events": events, "dropped": self.tracer.dropped}
+
+    @staticmethod
+    def _tracemalloc_section() -> Dict[str, Any]:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return {}
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        return {
+            "current_mb": round(current / (1024 * 1024), 2),
+            "peak_mb": round(peak / (1024 * 1024), 2),
+            "top_allocators": [
+                {"where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "size_kb": round(s.size / 1024, 1), "count": s.count}
+                for s in snapshot.statistics("lineno")[:TOP_ENTRIES]
+            ],
+        }
+
+    def report(self, stem: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            stages = {name: stats.to_dict() for name, stats in sorted(self._stages.items())}
+        report: Dict[str, Any] = {
+            "started": self.started_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "written": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "pid": os.getpid(),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "options": sorted(self.options),
+            "stages": stages,
+        }
+        if self._cprofile is not None and stem:
+            report["cprofile"] = self._cprofile_section(stem)
+        if "tracemalloc" in self.options:
+            report["tracemalloc"] = self._tracemalloc_section()
+        if self.tracer is not None and stem:
+            report["trace"] = self._trace_section(stem)
+        for name, provider in self._sections.items():
+            try:
+                report[name] = provider()
+            except Exception as e:
+                report[name] = {"error": str(e)}
+        return report
+
+    def _report_stem(self) -> str:
+        from .file_manager import FileManager
+
+        profiles_dir = os.path.join(FileManager().get_user_data_dir(), "profiles")
+        os.makedirs(profiles_dir, exist_ok=True)
+        return os.path.join(profiles_dir, f"profile_{self.started_at.strftime('%Y-%m-%d_%H-%M-%S')}_{os.getpid()}")
+
+    def write_report(self) -> Optional[str]:
+        """Пишет (перезаписывает) отчёт этого запуска. Возвращает путь."""
+        try:
+            stem = self._report_stem()
+            report = self.report(stem)
+            tmp_path = f"{stem}.json.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, f"{stem}.json")
+        except Exception as e:
+            print(f"Не удалось записать отчёт профилирования: {e}")
+            return None
+        self.report_path = f"{stem}.json"
+        return self.report_path
+
+
+# --- API модуля ---
+
+def enable(options: Optional[Set[str]] = None) -> Profiler:
+    """Включает профилирование; повторный вызов возвращает уже работающий профайлер."""
+    global _profiler
+    with _enable_lock:
+        if _profiler is None:
+            _profiler = Profiler(options or set())
+            atexit.register(write_report)
+        return _profiler
+
+
+def enable_from_environment() -> Optional[Profiler]:
+    options = parse_options(os.environ.get(ENV_VAR))
+    return enable(options) if options is not None else None
+
+
+def enable_from_settings(settings) -> Optional[Profiler]:
+    if _profiler is None and getattr(settings, "PROFILE", False):
+        return enable(set())
+    return _profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def is_enabled() -> bool:
+    return _profiler is not None
+
+
+def span(name: str):
+    """with span("parse"): ... — замер этапа; без профилирования ничего не делает."""
+    profiler = _profiler
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name)
+
+
+def record(name: str, seconds: float):
+    profiler = _profiler
+    if profiler is not None:
+        profiler.record(name, seconds)
+
+
+def timed(name: str):
+    """Декоратор-замер для функций и методов."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            started = profiler.begin(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.end(name, started)
+        return wrapper
+    return decorate
+
+
+def instant(name: str, **args):
+    """Отметка-событие на трассе (например, нажатие кнопки); без трассы ничего не делает."""
+    profiler = _profiler
+    if profiler is not None and profiler.tracer is not None:
+        profiler.tracer.instant(name, args or None)
+
+
+def write_report() -> Optional[str]:
+    """Отчёт на диск, если профилирование включено (конец теста, выход из программы)."""
+    profiler = _profiler
+    if profiler is None:
+        return None
+    return profiler.write_report()
@@ -0,0 +1,156 @@
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from . import profiling, tasks
+from .models import Quiz
+from .parser import QuizParser
+
+
+class _Entry(NamedTuple):
+    mtime_ns: int
+    size: int
+    quiz: Quiz
+    warnings: List[str]
+
+
+class QuizCache:
+    """Разобранные банки в памяти процесса.
+
+    Запись свежая, пока у файла те же mtime и размер (как в каталоге и
+    поисковом индексе). Разобранные вопросы только читаются: движок теста
+    перемешивает копии, поэтому один Quiz можно отдавать много раз.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def get(self, path: str, st: Optional[os.stat_result] = None) -> Optional[_Entry]:
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return None
+        if entry.mtime_ns != st.st_mtime_ns or entry.size != st.st_size:
+            return None
+        return entry
+
+    def parse(self, path: str, warnings: Optional[List[str]] = None) -> Quiz:
+        """Как QuizParser.parse_question_file, но неизменённый файл не разбирается повторно."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            # Ошибку чтения сообщит парсер, как и без кэша
+            return QuizParser.parse_question_file(path, warnings=warnings)
+
+        entry = self.get(path, st)
+        if entry is None:
+            parsed_warnings: List[str] = []
+            quiz = QuizParser.parse_question_file(path, warnings=parsed_warnings)
+            entry = _Entry(st.st_mtime_ns, st.st_size, quiz, parsed_warnings)
+            with self._lock:
+                self._entries[path] = entry
+        if warnings is not None:
+            warnings.extend(entry.warnings)
+        return entry.quiz
+
+    def warm(self, paths: Iterable[str], should_stop=None) -> int:
+        """Разбирает устаревшие и новые файлы. Возвращает число разобранных."""
+        parsed = 0
+        for path in paths:
+            if should_stop is not None and should_stop():
+                break
+            if self.get(path) is not None:
+                continue
+            try:
+                self.parse(path)
+            except Exception:
+                continue  # ошибку покажет обычная загрузка теста
+            parsed += 1
+        return parsed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class CacheWarmer:
+    """Упреждающий разбор банков фоновым заданием, пока ученик в меню.
+
+    Порядок задаёт вызывающий: обычно сначала прошлый выбор, затем все
+    банки. Задание идёт через общий TaskRunner с паузами между файлами,
+    чтобы не отнимать GIL у Tk; stop() снимает его с очереди или
+    останавливает перед следующим файлом.
+    """
+
+    PAUSE_S = 0.005
+
+    def __init__(self, cache: QuizCache):
+        self.cache = cache
+        self._stop_event: Optional[threading.Event] = None
+        self._task: Optional[tasks.TaskHandle] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, plan: Callable[[], Iterable[Iterable[str]]]):
+        """plan() вызывается уже в фоне (обход папок тоже не в потоке Tk) и отдаёт группы путей по приоритету."""
+        self.stop()
+        runner = tasks.get_runner()
+        if runner.synchronous:
+            return  # в синхронном режиме прогрев только задержал бы показ меню
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+        self._task = runner.submit(self._run, plan, stop_event, name="cache.warm")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self._stop_event = None
+        self._task = None
+
+    def _run(self, plan: Callable[[], Iterable[Iterable[str]]], stop_event: threading.Event):
+        with profiling.span("cache.warm"):
+            try:
+                seen = set()
+                for group in plan():
+                    for path in group:
+                        if stop_event.is_set():
+                            return
+                        if path in seen:
+                            continue
+                        seen.add(path)
+                        if self.cache.warm((path,)):
+                            stop_event.wait(self.PAUSE_S)
+            except Exception as e:
+                print(f"Фоновый разбор банков прерван: {e}")
+
+
+_cache = QuizCache()
+_warmer = CacheWarmer(_cache)
+
+
+def get_quiz_cache() -> QuizCache:
+    """Общий кэш процесса: главное окно, поиск и фоновые прогревы видят одни и те же записи."""
+    return _cache
+
+
+def start_warming(plan: Callable[[], Iterable[Iterable[str]]]):
+    _warmer.start(plan)
+
+
+def stop_warming():
+    """Вызывается при старте экзамена: фоновый разбор не должен делить с ним процессор."""
+    _warmer.stop()
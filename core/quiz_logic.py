@@ -2,6 +2,7 @@ import random
 import string
 from typing import List, Dict, Any, Tuple
 from datetime import datetime
+from . import profiling
 from .models import Question, QuestionType, TestResult
 
 from typing import Optional
@@ -18,6 +19,7 @@ class QuizEngine:
         self._prepare_questions()
         self.reset()
 
+    @profiling.timed("engine.prepare")
     def _prepare_questions(self):
         """Подготовка вопросов: перемешивание и т.д."""
         prepared = []
@@ -65,7 +67,8 @@ class QuizEngine:
             question_type=question.question_type,
             correct_answer=new_correct,
             images=question.images,
-            source_topic=question.source_topic
+            source_topic=question.source_topic,
+            image_base_dir=question.image_base_dir
         )
 
     def reset(self):
@@ -76,6 +79,7 @@ class QuizEngine:
         self.time_left = self.time_limit if self.time_limit > 0 else -1
         self.timer_active = (self.time_limit > 0)
         self.timeout_occurred = False
+        self.focus_incidents = []
 
     def get_next_question(self) -> Optional[Question]:
         """Получение следующего вопроса"""
@@ -85,6 +89,30 @@ class QuizEngine:
         self.current_index += 1
         return self.prepared_questions[self.current_index]
 
+    def peek_upcoming(self, count: int) -> List[Question]:
+        """Следующие вопросы без сдвига текущей позиции"""
+        start = self.current_index + 1
+        return self.prepared_questions[start:start + max(0, count)]
+
+    def record_focus_incident(self, kind: str, merge_window: float = 1.0):
+        """Журнал потери фокуса/сворачивания. События одного переключения окна склеиваются."""
+        now = datetime.now()
+        if self.focus_incidents:
+            last = self.focus_incidents[-1]
+            if (now - last['_at']).total_seconds() <= merge_window:
+                if kind not in last['events']:
+                    last['events'].append(kind)
+                last['_at'] = now
+                return
+
+        self.focus_incidents.append({
+            'timestamp': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'question_number': self.current_index + 1,
+            'events': [kind],
+            '_at': now,
+        })
+
+    @profiling.timed("engine.check_answer")
     def check_answer(self, question: Question, user_answer: Any) -> bool:
         """Проверка ответа пользователя"""
         is_correct = self._compare_answers(
@@ -100,7 +128,8 @@ class QuizEngine:
             'question_type': question.question_type.value,
             'user_answer': user_answer,
             'correct_answer': question.correct_answer,
-            'is_correct': is_correct
+            'is_correct': is_correct,
+            'topic': question.source_topic
         }
         self.results.append(result)
 
@@ -129,6 +158,7 @@ class QuizEngine:
         """Нормализация текста для свободных ответов"""
         return " ".join(text.lower().split())
 
+    @profiling.timed("engine.result")
     def calculate_result(self) -> TestResult:
         """Расчёт итогового результата"""
         total = len(self.prepared_questions)
@@ -150,7 +180,11 @@ class QuizEngine:
             timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             time_left=self._get_time_left_tuple(),
             timeout=self.timeout_occurred,
-            detailed_results=self.results
+            detailed_results=self.results,
+            focus_incidents=[
+                {k: v for k, v in incident.items() if not k.startswith('_')}
+                for incident in self.focus_incidents
+            ]
         )
 
     def _calculate_12_grade(self, percentage: float) -> int:
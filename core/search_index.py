@@ -0,0 +1,254 @@
+import bisect
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from . import profiling
+from .file_manager import FileManager
+from .models import Question, Quiz
+from .quiz_cache import get_quiz_cache
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+OPTION_PREFIX_RE = re.compile(r"^[A-ZА-ЯЁ]\)\s*")
+MIN_TOKEN_LEN = 2
+SNIPPET_LEN = 140
+
+
+def tokenize(text: str) -> List[str]:
+    """Слова в нижнем регистре, «ё» приравнена к «е»."""
+    return [t for t in TOKEN_RE.findall(text.lower().replace("ё", "е")) if len(t) >= MIN_TOKEN_LEN]
+
+
+@dataclass
+class SearchHit:
+    path: str
+    question_index: int  # позиция вопроса в разобранном файле, с нуля
+    quiz_name: str
+    snippet: str
+
+
+class SearchIndex:
+    """Инвертированный индекс по тексту, вариантам и темам вопросов всех банков.
+
+    На диске для каждого файла хранятся mtime/размер, краткие тексты
+    вопросов и слова с номерами вопросов; словарь слово → файлы строится
+    в памяти при загрузке. update() разбирает только изменившиеся файлы.
+    Слова запроса ищутся по префиксу: так находятся и другие падежи,
+    и недопечатанное слово.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_path: Optional[str] = None):
+        self.index_path = index_path or os.path.join(FileManager().get_user_cache_dir("search"), "index.json")
+        self._files: Dict[str, Dict] = {}
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    # --- хранение ---
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            return
+        for path, entry in data.get("files", {}).items():
+            self._add_entry(path, entry)
+
+    def save(self):
+        # Снимок берётся под замком: update() в фоне может менять словарь во время записи.
+        # Сохранения идут по очереди, tmp-файл свой у каждого процесса и потока
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = {"version": self.VERSION, "files": dict(self._files)}
+                self._dirty = False
+            tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp_path, self.index_path)
+            except OSError as e:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                print(f"Не удалось сохранить поисковый индекс: {e}")
+
+    # --- построение ---
+
+    def _add_entry(self, path: str, entry: Dict):
+        self._files[path] = entry
+        for token, positions in entry["tokens"].items():
+            self._postings.setdefault(token, {})[path] = positions
+        self._vocabulary = None
+
+    def _remove_entry(self, path: str):
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return
+        for token in entry["tokens"]:
+            files = self._postings.get(token)
+            if files is not None:
+                files.pop(path, None)
+                if not files:
+                    del self._postings[token]
+        self._vocabulary = None
+
+    @staticmethod
+    def _question_tokens(question: Question) -> Set[str]:
+        tokens = set(tokenize(question.text))
+        for option in question.options:
+            tokens.update(tokenize(OPTION_PREFIX_RE.sub("", option)))
+        tokens.update(tokenize(question.source_topic))
+        return tokens
+
+    @classmethod
+    def build_entry(cls, quiz: Quiz, mtime_ns: int, size: int) -> Dict:
+        tokens: Dict[str, List[int]] = {}
+        for position, question in enumerate(quiz.questions):
+            for token in cls._question_tokens(question):
+                tokens.setdefault(token, []).append(position)
+        return {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "name": quiz.name,
+            "snippets": [" ".join(q.text.split())[:SNIPPET_LEN] for q in quiz.questions],
+            "tokens": tokens,
+        }
+
+    def is_fresh(self, path: str, st: Optional[os.stat_result] = None) -> bool:
+        entry = self._files.get(path)
+        if entry is None:
+            return False
+        try:
+            st = st or os.stat(path)
+        except OSError:
+            return False
+        return entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size
+
+    def add_quiz(self, path: str, quiz: Quiz, st: os.stat_result):
+        """Индексирует уже разобранный файл (например, при загрузке теста)."""
+        entry = self.build_entry(quiz, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            self._remove_entry(path)
+            self._add_entry(path, entry)
+            self._dirty = True
+
+    @profiling.timed("search.update")
+    def update(self, paths: Iterable[str], should_stop=None, prune: bool = True) -> int:
+        """Доводит индекс до текущего набора файлов. Возвращает число переиндексированных.
+
+        prune=False — обновить только перечисленные файлы, не забывая остальные.
+        """
+        paths = list(paths)
+        if prune:
+            wanted = set(paths)
+            with self._lock:
+                for stale in [p for p in self._files if p not in wanted]:
+                    self._remove_entry(stale)
+                    self._dirty = True
+
+        updated = 0
+        for path in paths:
+            if should_stop is not None and should_stop():
+                break
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if self.is_fresh(path, st):
+                continue
+            try:
+                # Через общий кэш: файл, уже разобранный загрузкой или прогревом, не читается заново
+                quiz = get_quiz_cache().parse(path)
+            except Exception as e:
+                print(f"Поиск: пропуск {path}: {e}")
+                continue
+            self.add_quiz(path, quiz, st)
+            updated += 1
+        return updated
+
+    # --- поиск ---
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _matches(self, token: str) -> Dict[str, Set[int]]:
+        result: Dict[str, Set[int]] = {}
+        for candidate in self._prefix_tokens(token):
+            for path, positions in self._postings.get(candidate, {}).items():
+                result.setdefault(path, set()).update(positions)
+        return result
+
+    def search(self, query: str, limit: int = 200, paths: Optional[Set[str]] = None) -> List[SearchHit]:
+        """Вопросы, в которых есть слова на каждое слово запроса."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        with self._lock:
+            found: Optional[Dict[str, Set[int]]] = None
+            for token in tokens:
+                matches = self._matches(token)
+                if found is None:
+                    found = matches
+                else:
+                    found = {p: found[p] & pos for p, pos in matches.items() if p in found and found[p] & pos}
+                if not found:
+                    return []
+
+            hits: List[SearchHit] = []
+            for path in sorted(found):
+                if paths is not None and path not in paths:
+                    continue
+                entry = self._files[path]
+                for position in sorted(found[path]):
+                    snippets = entry["snippets"]
+                    snippet = snippets[position] if position < len(snippets) else ""
+                    hits.append(SearchHit(path, position, entry["name"], snippet))
+                    if len(hits) >= limit:
+                        return hits
+            return hits
+
+    @property
+    def file_count(self) -> int:
+        return len(self._files)
+
+
+def questions_for_hits(hits: Iterable[SearchHit]) -> Tuple[List[Question], List[str]]:
+    """Вопросы по найденным позициям; файлы разбираются по одному разу.
+
+    Возвращает вопросы и список файлов, которые не удалось разобрать.
+    """
+    wanted: Dict[str, List[int]] = {}
+    for hit in hits:
+        wanted.setdefault(hit.path, []).append(hit.question_index)
+
+    questions: List[Question] = []
+    failed: List[str] = []
+    for path, positions in wanted.items():
+        try:
+            quiz = get_quiz_cache().parse(path)
+        except Exception:
+            failed.append(path)
+            continue
+        questions.extend(quiz.questions[p] for p in positions if p < len(quiz.questions))
+    return questions, failed
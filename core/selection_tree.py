@@ -0,0 +1,216 @@
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class SelectionNode:
+    """Узел дерева выбора тестов: папка (data — словарь) или файл (path)."""
+
+    __slots__ = (
+        "name", "item_id", "data", "path", "depth", "parent", "expanded",
+        "selected", "questions", "unknown", "_children", "_pending",
+    )
+
+    def __init__(self, name: str, item_id: str, value, depth: int, parent: Optional["SelectionNode"]):
+        self.name = name
+        self.item_id = item_id
+        self.data: Optional[Dict] = value if isinstance(value, dict) else None
+        self.path: Optional[str] = None if self.data is not None else value
+        self.depth = depth
+        self.parent = parent
+        self.expanded = False
+        self.selected = 0  # выбранных файлов в поддереве
+        self.questions = 0  # вопросов в выбранных файлах поддерева (по каталогу)
+        self.unknown = 0  # выбранных файлов, которых нет в каталоге
+        self._children: Optional[List["SelectionNode"]] = None
+        # Выбор всей папки, ещё не переданный детям
+        self._pending: Optional[bool] = None
+
+    @property
+    def is_folder(self) -> bool:
+        return self.data is not None
+
+
+class SelectionTree:
+    """Дерево выбора тестов со счётчиками в папках.
+
+    Каждая папка знает, сколько файлов её поддерева выбрано и сколько их всего.
+    Выбор файла или папки меняет счётчики только у предков — O(глубины).
+    Выбор целой папки запоминается в ней и передаётся детям, когда их
+    впервые открывают, поэтому узлы создаются только для раскрытых папок.
+    Так же, по пути к корню, ведётся и число выбранных вопросов — если
+    задан question_count(path) (обычно из каталога банков).
+    """
+
+    STATE_NONE = "none"
+    STATE_PARTIAL = "partial"
+    STATE_ALL = "all"
+
+    def __init__(self, tree_data: Dict, question_count: Optional[Callable[[str], Optional[int]]] = None):
+        self.root = SelectionNode("", "", tree_data, -1, None)
+        self._totals: Dict[int, int] = {}
+        self._question_count = question_count
+        self._question_totals: Dict[int, Tuple[int, int]] = {}
+
+    @property
+    def roots(self) -> List[SelectionNode]:
+        return self.children(self.root)
+
+    def children(self, node: SelectionNode) -> List[SelectionNode]:
+        if node.data is None:
+            return []
+        if node._children is None:
+            node._children = [
+                SelectionNode(key, os.path.join(node.item_id, key) if node.item_id else key, value, node.depth + 1, node)
+                for key, value in node.data.items()
+            ]
+        if node._pending is not None:
+            for child in node._children:
+                self._fill(child, node._pending)
+            node._pending = None
+        return node._children
+
+    @staticmethod
+    def loaded_children(node: SelectionNode) -> List[SelectionNode]:
+        """Уже созданные дети, без создания новых узлов."""
+        return node._children or []
+
+    def total(self, node: SelectionNode) -> int:
+        """Число файлов в поддереве; каждый словарь считается один раз."""
+        if node.data is None:
+            return 1
+        return self._count_files(node.data)
+
+    def _count_files(self, data: Dict) -> int:
+        cached = self._totals.get(id(data))
+        if cached is None:
+            cached = sum(self._count_files(v) if isinstance(v, dict) else 1 for v in data.values())
+            self._totals[id(data)] = cached
+        return cached
+
+    def _file_questions(self, path: str) -> Tuple[int, int]:
+        count = self._question_count(path) if self._question_count is not None else None
+        return (0, 1) if count is None else (count, 0)
+
+    def question_total(self, node: SelectionNode) -> Tuple[int, int]:
+        """Вопросов в поддереве и файлов без оценки; каждый словарь считается один раз."""
+        if node.data is None:
+            return self._file_questions(node.path)
+        return self._count_questions(node.data)
+
+    def _count_questions(self, data: Dict) -> Tuple[int, int]:
+        cached = self._question_totals.get(id(data))
+        if cached is None:
+            questions = unknown = 0
+            for value in data.values():
+                q, u = self._count_questions(value) if isinstance(value, dict) else self._file_questions(value)
+                questions += q
+                unknown += u
+            cached = (questions, unknown)
+            self._question_totals[id(data)] = cached
+        return cached
+
+    def set_question_counts(self, question_count: Optional[Callable[[str], Optional[int]]]):
+        """Новая оценка вопросов (например, каталог обновился); пересчитывает созданные узлы."""
+        self._question_count = question_count
+        self._question_totals.clear()
+        self._recount(self.root)
+
+    def _recount(self, node: SelectionNode):
+        # Полностью выбранное или пустое поддерево берётся из итогов, остальное — по детям
+        if node.selected <= 0:
+            node.questions = node.unknown = 0
+        elif node.selected >= self.total(node):
+            node.questions, node.unknown = self.question_total(node)
+        else:
+            node.questions = node.unknown = 0
+            for child in self.children(node):
+                self._recount(child)
+                node.questions += child.questions
+                node.unknown += child.unknown
+            return
+        if node._pending is None:  # отложенный выбор пересчитает детей сам
+            for child in self.loaded_children(node):
+                self._recount(child)
+
+    def _fill(self, node: SelectionNode, selected: bool):
+        node.selected = self.total(node) if selected else 0
+        node.questions, node.unknown = self.question_total(node) if selected else (0, 0)
+        if node.data is not None:
+            node._pending = selected
+
+    def _sync(self, node: SelectionNode):
+        """Доставляет отложенный выбор предков до node."""
+        chain = []
+        parent = node.parent
+        while parent is not None:
+            chain.append(parent)
+            parent = parent.parent
+        for ancestor in reversed(chain):
+            if ancestor._pending is not None:
+                self.children(ancestor)
+
+    def set_selected(self, node: SelectionNode, selected: bool):
+        self._sync(node)
+        old = node.selected, node.questions, node.unknown
+        self._fill(node, selected)
+        delta = node.selected - old[0]
+        delta_questions = node.questions - old[1]
+        delta_unknown = node.unknown - old[2]
+        parent = node.parent
+        while parent is not None and (delta or delta_questions or delta_unknown):
+            parent.selected += delta
+            parent.questions += delta_questions
+            parent.unknown += delta_unknown
+            parent = parent.parent
+
+    def select_all(self):
+        self.set_selected(self.root, True)
+
+    def state(self, node: SelectionNode) -> str:
+        self._sync(node)
+        total = self.total(node)
+        if node.selected <= 0 or total == 0:
+            return self.STATE_NONE
+        if node.selected >= total:
+            return self.STATE_ALL
+        return self.STATE_PARTIAL
+
+    def counts(self, node: SelectionNode):
+        self._sync(node)
+        return node.selected, self.total(node)
+
+    @property
+    def selected_count(self) -> int:
+        return self.root.selected
+
+    @property
+    def selected_questions(self) -> Tuple[int, int]:
+        """Вопросов в выбранных файлах и выбранных файлов без оценки — O(1)."""
+        return self.root.questions, self.root.unknown
+
+    def selected_paths(self) -> List[str]:
+        paths: List[str] = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.selected <= 0:
+                continue
+            if node.data is None:
+                paths.append(node.path)
+            elif node.selected >= self.total(node) and node._children is None:
+                paths.extend(self.collect_files(node.data))
+            else:
+                stack.extend(reversed(self.children(node)))
+        return paths
+
+    @staticmethod
+    def collect_files(data: Dict) -> List[str]:
+        files = []
+        stack = [data]
+        while stack:
+            for value in stack.pop().values():
+                if isinstance(value, dict):
+                    stack.append(value)
+                else:
+                    files.append(value)
+        return files
@@ -4,6 +4,7 @@ import re
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional, Union
 
+from core import profiling
 from core.file_manager import FileManager
 
 
@@ -29,6 +30,10 @@ class AppSettings:
     DEFAULT_SAVE_DIR: Optional[str] = None
     THEME: str = "system"  # dark/light/system
     HIDE_BUILTIN_TESTS: bool = False
+    IMAGE_CACHE_MB: int = 96
+    PROFILE: bool = False  # отчёт о скорости этапов в <данные>/profiles
+    LAG_MONITOR: bool = False  # замер задержек интерфейса и стеки зависаний
+    LAST_SELECTION: Optional[List[str]] = None  # файлы прошлого выбора: их банки разбираются заранее
 
 
 class SettingsManager:
@@ -36,6 +41,7 @@ class SettingsManager:
         self.file_manager = FileManager()
         self.path = os.path.join(self.file_manager.get_user_data_dir(), "settings.json")
 
+    @profiling.timed("settings.load")
     def load(self) -> AppSettings:
         defaults = AppSettings()
         if not os.path.isfile(self.path):
@@ -74,12 +80,19 @@ class SettingsManager:
         result["TELEGRAM_SEND_ON_RESULT"] = bool(result["TELEGRAM_SEND_ON_RESULT"])
         result["TELEGRAM_SEND_ON_SAVE"] = bool(result["TELEGRAM_SEND_ON_SAVE"])
         result["HIDE_BUILTIN_TESTS"] = bool(result.get("HIDE_BUILTIN_TESTS", defaults.HIDE_BUILTIN_TESTS))
+        result["PROFILE"] = bool(result.get("PROFILE", defaults.PROFILE))
+        result["LAG_MONITOR"] = bool(result.get("LAG_MONITOR", defaults.LAG_MONITOR))
 
         try:
             result["MAX_QUESTIONS"] = max(0, int(result["MAX_QUESTIONS"]))
         except Exception:
             result["MAX_QUESTIONS"] = defaults.MAX_QUESTIONS
 
+        try:
+            result["IMAGE_CACHE_MB"] = max(0, int(result["IMAGE_CACHE_MB"]))
+        except Exception:
+            result["IMAGE_CACHE_MB"] = defaults.IMAGE_CACHE_MB
+
         try:
             result["PASS_THRESHOLD"] = max(0.0, min(100.0, float(result["PASS_THRESHOLD"])))
         except Exception:
@@ -103,6 +116,12 @@ class SettingsManager:
             if not isinstance(result["DEFAULT_SAVE_DIR"], str):
                 result["DEFAULT_SAVE_DIR"] = None
 
+        selection = result.get("LAST_SELECTION")
+        if isinstance(selection, list):
+            result["LAST_SELECTION"] = [p for p in selection if isinstance(p, str)] or None
+        else:
+            result["LAST_SELECTION"] = None
+
         if result["THEME"] not in {"dark", "light", "system"}:
             result["THEME"] = defaults.THEME
 
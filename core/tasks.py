@@ -0,0 +1,264 @@
+"""Фоновые задания с доставкой результата в поток Tk.
+
+    runner = tasks.get_runner()
+    handle = runner.submit(parse, path, on_done=self._show, on_error=self._fail)
+    handle.cancel()      # обработчики больше не вызовутся
+
+Задание выполняется в общем пуле потоков (или процессов, process=True),
+а его завершение кладётся в одну очередь. Очередь разбирает один опрос
+root.after в потоке Tk, пока есть незавершённые задания, — так on_done
+и on_error всегда вызываются в потоке Tk и окна не заводят собственные
+потоки и таймеры опроса.
+
+PYQUIZ_SYNC_TASKS=1 (или synchronous=True) выполняет задания сразу в
+вызывающем потоке — для отладки и сценарных прогонов.
+
+Задания с critical=True (запись результата, отправка в Telegram) нельзя
+обрывать: перед os._exit приложение ждёт их через wait_critical().
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Hashable, Optional
+
+SYNC_ENV_VAR = "PYQUIZ_SYNC_TASKS"
+POLL_MS = 30
+THREAD_WORKERS = 4
+EXIT_WAIT_S = 10.0
+
+_runner: Optional["TaskRunner"] = None
+_runner_lock = threading.Lock()
+
+
+class TaskHandle:
+    """Задание исполнителя: отмена, состояние и результат."""
+
+    __slots__ = ("future", "name", "on_done", "on_error", "_cancelled")
+
+    def __init__(self, future: Future, name: str, on_done: Optional[Callable[[Any], None]],
+                 on_error: Optional[Callable[[BaseException], None]]):
+        self.future = future
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self._cancelled = False
+
+    def cancel(self) -> bool:
+        """Снимает задание с очереди, если оно не началось; обработчики не вызовутся в любом случае."""
+        self._cancelled = True
+        return self.future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled or self.future.cancelled()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def running(self) -> bool:
+        return self.future.running()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        return self.future.result(timeout)
+
+
+class TaskRunner:
+    """Пулы потоков и процессов плюс доставка завершений в поток Tk."""
+
+    def __init__(self, root=None, synchronous: bool = False, thread_workers: int = THREAD_WORKERS,
+                 process_workers: Optional[int] = None):
+        # Без root завершения копятся до явного process_pending() (CLI, бенчмарки)
+        self.root = root
+        self.synchronous = synchronous
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._completed: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._keys = set()
+        self._critical = set()
+        self._after_id = None
+        self._closed = False
+
+    # --- отправка ---
+
+    def _pool(self, process: bool):
+        with self._lock:
+            if process:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="pyquiz-task")
+            return self._threads
+
+    def submit(self, fn: Callable[..., Any], *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None, process: bool = False,
+               name: Optional[str] = None, critical: bool = False, **kwargs) -> TaskHandle:
+        """Запускает fn(*args, **kwargs) в фоне. Для process=True fn и аргументы должны сериализоваться pickle.
+
+        critical=True — задание дождутся перед выходом (wait_critical).
+        """
+        name = name or getattr(fn, "__qualname__", repr(fn))
+        if self.synchronous:
+            future: Future = Future()
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            handle = TaskHandle(future, name, on_done, on_error)
+            self._deliver(handle)
+            return handle
+
+        if self._closed:
+            raise RuntimeError("Исполнитель фоновых заданий остановлен")
+        future = self._pool(process).submit(fn, *args, **kwargs)
+        handle = TaskHandle(future, name, on_done, on_error)
+        with self._lock:
+            self._pending += 1
+            if critical:
+                self._critical.add(future)
+        future.add_done_callback(lambda _future: self._on_future_done(handle))
+        self._ensure_polling()
+        return handle
+
+    def call_soon(self, fn: Callable[..., None], *args, key: Optional[Hashable] = None):
+        """Выполнить fn в потоке Tk при ближайшем опросе; из рабочего потока — только изнутри задания.
+
+        С key одинаковые ещё не выполненные вызовы склеиваются в один
+        (например, «обнови список» после каждого разобранного файла).
+        """
+        if self.synchronous:
+            fn(*args)
+            return
+        with self._lock:
+            if key is not None:
+                if key in self._keys:
+                    return
+                self._keys.add(key)
+            self._pending += 1
+        self._completed.put((fn, args, key))
+        if threading.current_thread() is threading.main_thread():
+            self._ensure_polling()
+
+    def _on_future_done(self, handle: TaskHandle):
+        with self._lock:
+            self._critical.discard(handle.future)
+        self._completed.put(handle)
+
+    def wait_critical(self, timeout: float = EXIT_WAIT_S) -> bool:
+        """Ждёт критичные задания (без доставки обработчиков). False — не успели за timeout."""
+        with self._lock:
+            futures = list(self._critical)
+        if not futures:
+            return True
+        _done, not_done = wait(futures, timeout)
+        return not not_done
+
+    # --- доставка ---
+
+    def _ensure_polling(self):
+        if self.root is None or self._after_id is not None or self._closed:
+            return
+        try:
+            self._after_id = self.root.after(POLL_MS, self._poll)
+        except Exception:
+            self._after_id = None  # корневое окно уже уничтожено
+
+    def _poll(self):
+        self._after_id = None
+        self.process_pending()
+        with self._lock:
+            pending = self._pending
+        if pending:
+            self._ensure_polling()
+
+    def process_pending(self) -> int:
+        """Вызывает обработчики всех завершившихся заданий. Возвращает их число."""
+        delivered = 0
+        while True:
+            try:
+                item = self._completed.get_nowait()
+            except queue.Empty:
+                return delivered
+            with self._lock:
+                self._pending -= 1
+                if isinstance(item, tuple) and item[2] is not None:
+                    self._keys.discard(item[2])
+            if isinstance(item, tuple):
+                fn, args, _key = item
+                try:
+                    fn(*args)
+                except Exception as e:
+                    print(f"Ошибка в отложенном вызове {getattr(fn, '__qualname__', fn)}: {e}")
+            else:
+                self._deliver(item)
+            delivered += 1
+
+    @staticmethod
+    def _deliver(handle: TaskHandle):
+        if handle.cancelled:
+            return
+        error = handle.future.exception()
+        try:
+            if error is not None:
+                if handle.on_error is not None:
+                    handle.on_error(error)
+                else:
+                    print(f"Фоновое задание {handle.name} завершилось с ошибкой: {error}")
+            elif handle.on_done is not None:
+                handle.on_done(handle.future.result())
+        except Exception as e:
+            print(f"Ошибка в обработчике задания {handle.name}: {e}")
+
+    def shutdown(self):
+        self._closed = True
+        if self._after_id is not None and self.root is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+# --- API модуля ---
+
+def _sync_from_environment() -> bool:
+    return os.environ.get(SYNC_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def install(root, synchronous: Optional[bool] = None) -> TaskRunner:
+    """Общий исполнитель приложения, привязанный к корневому окну."""
+    global _runner
+    with _runner_lock:
+        if _runner is not None:
+            _runner.shutdown()
+        _runner = TaskRunner(root, synchronous=_sync_from_environment() if synchronous is None else synchronous)
+        return _runner
+
+
+def wait_critical(timeout: float = EXIT_WAIT_S) -> bool:
+    """Вызывается перед os._exit: незавершённая запись результата иначе оборвалась бы."""
+    runner = _runner
+    if runner is None:
+        return True
+    ok = runner.wait_critical(timeout)
+    if not ok:
+        print("Не все фоновые задания завершились до выхода")
+    return ok
+
+
+def get_runner() -> TaskRunner:
+    """Исполнитель приложения; без install() — исполнитель без Tk с ручной доставкой."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = TaskRunner(None, synchronous=_sync_from_environment())
+        return _runner
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from PIL import Image
+
+from .file_manager import FileManager
+
+
+class ThumbnailCache:
+    """Постоянный кэш миниатюр в пользовательской папке.
+
+    Ключ — путь, mtime и размер исходника плюс целевая рамка, поэтому
+    изменённый файл просто даёт новый ключ. Старые записи вытесняются
+    по LRU (mtime файла кэша обновляется при чтении), пока суммарный
+    размер не уложится в лимит.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or FileManager().get_user_cache_dir("thumbnails")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _entry_path(self, source_path: str, max_w: int, max_h: int) -> Optional[str]:
+        try:
+            st = os.stat(source_path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(source_path)}|{st.st_mtime_ns}|{st.st_size}|{max_w}x{max_h}"
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.png")
+
+    def get(self, source_path: str, max_w: int, max_h: int) -> Optional[Image.Image]:
+        """Читает миниатюру из кэша либо None при промахе."""
+        entry = self._entry_path(source_path, max_w, max_h)
+        if not entry or not os.path.isfile(entry):
+            return None
+        try:
+            with Image.open(entry) as cached:
+                image = cached.copy()
+            os.utime(entry)
+            return image
+        except Exception:
+            self._remove(entry)
+            return None
+
+    def put(self, source_path: str, max_w: int, max_h: int, image: Image.Image) -> None:
+        """Сохраняет миниатюру; ошибки записи не мешают показу вопроса."""
+        entry = self._entry_path(source_path, max_w, max_h)
+        if not entry:
+            return
+        tmp_path = f"{entry}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry), exist_ok=True)
+            image.save(tmp_path, format="PNG")
+        except Exception:
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            # Миниатюра могла уже лежать (другой поток, изменённый исходник) — её размер из учёта вычитается
+            try:
+                replaced = os.path.getsize(entry)
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmp_path, entry)
+                written = os.path.getsize(entry)
+            except OSError:
+                self._remove(tmp_path)
+                return
+            if self._total_bytes is not None:
+                self._total_bytes += written - replaced
+            over_budget = self._current_size() > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _current_size(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(os.path.getsize(p) for p, _mtime in self._entries())
+        return self._total_bytes
+
+    def _entries(self):
+        entries = []
+        for dirpath, _dirnames, filenames in os.walk(self.cache_dir):
+            for f in filenames:
+                if not f.endswith(".png"):
+                    continue
+                full = os.path.join(dirpath, f)
+                try:
+                    entries.append((full, os.path.getmtime(full)))
+                except OSError:
+                    continue
+        return entries
+
+    def evict(self) -> int:
+        """Удаляет самые давно использованные записи сверх лимита. Возвращает число удалённых."""
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda e: e[1])
+            total = 0
+            sizes = {}
+            for path, _mtime in entries:
+                try:
+                    sizes[path] = os.path.getsize(path)
+                except OSError:
+                    sizes[path] = 0
+                total += sizes[path]
+
+            removed = 0
+            # Сжимаем до 90% лимита, чтобы не чистить кэш на каждой записи
+            target = int(self.max_bytes * 0.9)
+            for path, _mtime in entries:
+                if total <= target:
+                    break
+                if self._remove(path):
+                    total -= sizes[path]
+                    removed += 1
+
+            self._total_bytes = total
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, _mtime in self._entries():
+                self._remove(path)
+            self._total_bytes = 0
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+_shared: Optional[ThumbnailCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Общий кэш процесса: один учёт размера и один обход папки на всех."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ThumbnailCache()
+        return _shared
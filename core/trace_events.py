@@ -0,0 +1,70 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class TraceRecorder:
+    """События begin/end в формате Chrome Trace Event.
+
+    Файл открывается в chrome://tracing, Perfetto UI или speedscope:
+    видно, какой поток (Tk или воркеры) чем занят и где Tk-поток стоит.
+    Хранятся последние MAX_EVENTS событий, старые вытесняются.
+    """
+
+    MAX_EVENTS = 500_000
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self._events = deque(maxlen=max_events)
+        self._t0 = time.perf_counter()
+        self._pid = os.getpid()
+        self._threads: Dict[int, str] = {}
+        self.dropped = 0
+
+    def _append(self, event: Dict[str, Any]):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event["pid"] = self._pid
+        event["tid"] = tid
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        self._events.append(event)
+
+    def _ts(self, perf: Optional[float]) -> float:
+        return round(((perf if perf is not None else time.perf_counter()) - self._t0) * 1_000_000, 1)
+
+    def begin(self, name: str, perf: Optional[float] = None, args: Optional[Dict[str, Any]] = None):
+        event = {"name": name, "ph": "B", "ts": self._ts(perf)}
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    def end(self, name: str, perf: Optional[float] = None):
+        self._append({"name": name, "ph": "E", "ts": self._ts(perf)})
+
+    def instant(self, name: str, args: Optional[Dict[str, Any]] = None):
+        event = {"name": name, "ph": "i", "s": "t", "ts": self._ts(None)}
+        if args:
+            event["args"] = args
+        self._append(event)
+
+    @property
+    def event_count(self) -> int:
+        return len(self._events)
+
+    def write(self, path: str) -> int:
+        """Пишет трассу атомарно. Возвращает число событий."""
+        events = list(self._events)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        metadata.append({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "PyQuiz"}})
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return len(events)
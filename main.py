@@ -1,43 +1,58 @@
 import sys
 import os
 
+import customtkinter as ctk
+
 # Добавляем текущую директорию в путь для импортов
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
+from core import lag_monitor, profiling, tasks
 from core.models import Quiz
-from core.quiz_logic import QuizEngine
-from core.parser import QuizParser
 from core.file_manager import FileManager
+from core.quiz_cache import stop_warming
 from core.settings import SettingsManager, resolve_time_limit_seconds
 
+# Остальные экраны (тест, результаты, Telegram, PIL.ImageTk) импортируются при первом показе:
+# до главного окна грузится только то, что нужно ему самому
 from ui.main_window import MainWindow
-from ui.name_input import NameInputWindow
-from ui.preparation import PreparationWindow
-from ui.quiz_window import QuizWindow
-from ui.results_window import ResultsWindow
-from ui.ui_config import apply_global_appearance
+from ui.navigation import ScreenController
+from ui.ui_config import apply_global_appearance, apply_adaptive_scaling
 
 class PyQuizApp:
     """Основной класс приложения"""
 
     def __init__(self):
         self.quizzes: list[Quiz] = []
-        self.current_quiz_engine: QuizEngine = None
+        self.current_quiz_engine = None
         self.settings_manager = SettingsManager()
         self.settings = self.settings_manager.load()
+        profiling.enable_from_settings(self.settings)
         apply_global_appearance(self.settings)
 
+        # Одно корневое окно на всё время работы; экраны сменяют друг друга внутри него
+        self.root = ctk.CTk()
+        apply_adaptive_scaling(self.root)
+        self.navigator = ScreenController(self.root)
+        # Фоновые задания всех окон доставляют результаты через этот корень
+        tasks.install(self.root)
+        lag_monitor.apply_settings(self.root, self.settings)
+
     def run(self):
         """Запуск приложения"""
         print("Запуск PyQuiz...")
+        self.show_main_window()
+        self.navigator.run()
 
-        # Главное окно выбора тестов
+    @profiling.timed("app.main_window")
+    def show_main_window(self):
+        """Главное окно выбора тестов"""
         self.settings = self.settings_manager.load()
         apply_global_appearance(self.settings)
-        main_window = MainWindow(self.on_tests_selected)
-        main_window.show()
+        lag_monitor.apply_settings(self.root, self.settings)
+        self.navigator.show(MainWindow(self.root, self.on_tests_selected))
 
+    @profiling.timed("app.tests_selected")
     def on_tests_selected(self, quizzes: list[Quiz]):
         """Обработка выбранных тестов"""
         self.settings = self.settings_manager.load()
@@ -54,18 +69,29 @@ class PyQuizApp:
             all_questions = random.sample(all_questions, self.settings.MAX_QUESTIONS)
 
         # Окно ввода имени
-        name_window = NameInputWindow(self.on_name_entered, settings=self.settings)
+        from ui.name_input import NameInputWindow
+        name_window = NameInputWindow(self.root, self.on_name_entered, settings=self.settings, on_cancel=self.restart_app)
         name_window.questions = all_questions
-        name_window.show()
+        self.navigator.show(name_window)
 
     def on_name_entered(self, name: str, questions: list):
         """Обработка введенного имени"""
         # Окно подготовки
-        prep_window = PreparationWindow(name, questions, self.start_quiz, settings=self.settings)
-        prep_window.show()
+        from ui.preparation import PreparationWindow
+        bank_files = [quiz.file_path for quiz in self.quizzes if quiz.file_path]
+        prep_window = PreparationWindow(self.root, name, questions, self.start_quiz, settings=self.settings, on_cancel=self.restart_app,
+                                        bank_files=bank_files)
+        self.navigator.show(prep_window)
 
+    @profiling.timed("app.start_quiz")
     def start_quiz(self, student_name: str, questions: list):
         """Начало тестирования"""
+        # Экзамену — весь процессор: упреждающий разбор банков больше не нужен
+        stop_warming()
+
+        from core.quiz_logic import QuizEngine
+        from ui.quiz_window import QuizWindow
+
         # Создаем движок тестирования
         time_limit = resolve_time_limit_seconds(self.settings.TIMER, len(questions))
 
@@ -78,26 +104,42 @@ class PyQuizApp:
 
         # Окно тестирования
         quiz_window = QuizWindow(
+            self.root,
             self.current_quiz_engine,
             self.on_quiz_finished,
             settings=self.settings,
             on_cancel=self.restart_app
         )
-        quiz_window.show()
+        self.navigator.show(quiz_window)
 
     def on_quiz_finished(self, result):
         """Обработка завершения теста"""
+        # Конец сессии тестирования: киоск может не закрываться днями, поэтому отчёт пишется здесь
+        profiling.write_report()
         # Окно результатов
-        results_window = ResultsWindow(result, self.restart_app, settings=self.settings)
-        results_window.show()
+        from ui.results_window import ResultsWindow
+        results_window = ResultsWindow(self.root, result, self.restart_app, settings=self.settings)
+        self.navigator.show(results_window)
 
     def restart_app(self):
-        """Перезапуск приложения"""
+        """Возврат в главное меню без пересоздания окна"""
         self.quizzes = []
         self.current_quiz_engine = None
-        self.run()
+        self.show_main_window()
 
 if __name__ == "__main__":
+    # Пул процессов импорта картинок в собранном .exe
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    # PYQUIZ_PROFILE=1 — замеры этапов с отчётом в <данные>/profiles
+    profiling.enable_from_environment()
+
+    # Служебные команды: python main.py warm-thumbnails [пути]
+    if len(sys.argv) > 1:
+        from core.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
     # Создаем необходимые директории
     file_manager = FileManager()
     file_manager._setup_directories()
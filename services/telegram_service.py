@@ -3,6 +3,7 @@ import os
 import urllib.request
 import urllib.parse
 from typing import Optional, List
+from core import profiling
 from core.models import TestResult
 
 class TelegramService:
@@ -62,6 +63,7 @@ class TelegramService:
         except Exception:
             return False
 
+    @profiling.timed("telegram.send")
     def send_result(self, result: TestResult) -> bool:
         """Отправка результата в Telegram"""
         if not self.is_configured():
@@ -99,6 +101,9 @@ class TelegramService:
         if result.timeout:
             message += f"\n⏰ *Завершено по таймауту!*"
 
+        if result.focus_incidents:
+            message += f"\n⚠ Выходов из окна теста: {len(result.focus_incidents)}"
+
         if result.time_left:
             mins, secs = result.time_left
             message += f"\n⏱️ Осталось времени: {mins:02d}:{secs:02d}"
@@ -1,32 +1,58 @@
 import customtkinter as ctk
-import tkinter as tk
-from typing import Optional, Callable
+from typing import Callable, List, Tuple
+
+from ui.ui_config import center_window_adaptive
+
+
+def unbind_callback(widget, sequence: str, funcid: str):
+    """Снимает одну привязку bind(..., add="+").
+
+    widget.unbind(sequence, funcid) до Python 3.13 удаляет все обработчики
+    sequence, в том числе чужие, поэтому убираем только строку с funcid.
+    """
+    script = widget.tk.call("bind", widget._w, sequence)
+    kept = [line for line in str(script).split("\n") if line.strip() and funcid not in line]
+    widget.tk.call("bind", widget._w, sequence, "\n".join(kept))
+    widget.deletecommand(funcid)
+
 
 class BaseWindow:
-    """Базовое окно приложения"""
+    """Базовый экран приложения.
 
-    def __init__(self):
-        ctk.set_appearance_mode("light")
-        ctk.set_default_color_theme("blue")
+    Все экраны живут в одном корневом окне: экран строит виджеты во фрейме
+    self.container, а ScreenController показывает его и убирает предыдущий.
+    Собственных CTk() и mainloop() у экранов нет.
+    """
 
-        self.root = ctk.CTk()
-        self._center_window()
+    def __init__(self, root: ctk.CTk):
+        self.root = root
+        self.container = ctk.CTkFrame(root, fg_color="transparent", corner_radius=0)
+        self._root_bindings: List[Tuple[str, str]] = []
 
     def _center_window(self, width: int = 800, height: int = 600):
         """Центрирование окна"""
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
+        center_window_adaptive(self.root, width, height)
 
-        x = (screen_width - width) // 2
-        y = (screen_height - height) // 2
+    def _bind_root(self, sequence: str, func: Callable):
+        """Привязка к корневому окну, которая снимается при уходе с экрана."""
+        funcid = self.root.bind(sequence, func, add="+")
+        self._root_bindings.append((sequence, funcid))
 
-        self.root.geometry(f"{width}x{height}+{x}+{y}")
+    def on_show(self):
+        """Экран стал текущим: заголовок, размер, обработчик закрытия."""
 
-    def run(self):
-        """Запуск основного цикла"""
-        self.root.mainloop()
+    def on_hide(self):
+        """Экран уходит: вернуть корневое окно в исходное состояние."""
+        for sequence, funcid in self._root_bindings:
+            try:
+                unbind_callback(self.root, sequence, funcid)
+            except Exception:
+                pass
+        self._root_bindings.clear()
 
     def destroy(self):
-        """Закрытие окна"""
-        if self.root:
-            self.root.destroy()
\ No newline at end of file
+        """Закрытие экрана"""
+        try:
+            self.container.destroy()
+        except Exception:
+            pass
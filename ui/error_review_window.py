@@ -0,0 +1,153 @@
+import customtkinter as ctk
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.bank_catalog import TYPE_TITLES
+
+
+class ErrorReviewWindow:
+    """Просмотр ошибок постранично с фильтром по теме и типу вопроса.
+
+    На странице не больше PAGE_SIZE карточек; карточки создаются один раз
+    и перезаполняются при листании. Ответы форматируются только для
+    показываемых ошибок и запоминаются.
+    """
+
+    PAGE_SIZE = 10
+    ALL = "Все"
+    NO_TOPIC = "Без темы"
+
+    def __init__(self, parent, errors: List[Dict[str, Any]], format_answer: Callable[[str, Any], str]):
+        self.errors = errors
+        self.format_answer = format_answer
+        self.filtered: List[int] = list(range(len(errors)))
+        self.page = 0
+        self._formatted: Dict[int, Tuple[str, str]] = {}
+        self._cards: List[ctk.CTkFrame] = []
+
+        self.window = ctk.CTkToplevel(parent)
+        self.window.title("Ошибки в тесте")
+        self.window.geometry("800x600")
+        self._setup_ui()
+        self._render()
+
+    def _topic(self, error: Dict[str, Any]) -> str:
+        return error.get("topic") or self.NO_TOPIC
+
+    def _setup_ui(self):
+        filter_frame = ctk.CTkFrame(self.window, fg_color="transparent")
+        filter_frame.pack(fill="x", padx=10, pady=(10, 0))
+
+        topics = sorted({self._topic(e) for e in self.errors})
+        self.topic_var = ctk.StringVar(value=self.ALL)
+        if len(topics) > 1:
+            ctk.CTkLabel(filter_frame, text="Тема:").pack(side="left", padx=(0, 6))
+            ctk.CTkOptionMenu(
+                filter_frame, variable=self.topic_var, values=[self.ALL] + topics, command=lambda _v: self._apply_filter(), width=220
+            ).pack(side="left", padx=(0, 12))
+
+        present = {e.get("question_type") for e in self.errors}
+        self._type_by_title = {title: qtype for qtype, title in TYPE_TITLES.items() if qtype in present}
+        self.type_var = ctk.StringVar(value=self.ALL)
+        if len(self._type_by_title) > 1:
+            ctk.CTkLabel(filter_frame, text="Тип:").pack(side="left", padx=(0, 6))
+            ctk.CTkOptionMenu(
+                filter_frame, variable=self.type_var, values=[self.ALL] + list(self._type_by_title), command=lambda _v: self._apply_filter(), width=160
+            ).pack(side="left")
+
+        self.count_label = ctk.CTkLabel(filter_frame, text="", font=ctk.CTkFont(size=12))
+        self.count_label.pack(side="right")
+
+        self.scroll_frame = ctk.CTkScrollableFrame(self.window)
+        self.scroll_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        nav_frame = ctk.CTkFrame(self.window, fg_color="transparent")
+        nav_frame.pack(fill="x", padx=10, pady=(0, 10))
+
+        self.prev_btn = ctk.CTkButton(nav_frame, text="◀ Назад", command=lambda: self._go(-1), width=100)
+        self.prev_btn.pack(side="left")
+        self.page_label = ctk.CTkLabel(nav_frame, text="")
+        self.page_label.pack(side="left", padx=12)
+        self.next_btn = ctk.CTkButton(nav_frame, text="Вперёд ▶", command=lambda: self._go(1), width=100)
+        self.next_btn.pack(side="left")
+        ctk.CTkButton(nav_frame, text="Закрыть", command=self.window.destroy, width=100).pack(side="right")
+
+        self.window.bind("<Left>", lambda _e: self._go(-1))
+        self.window.bind("<Right>", lambda _e: self._go(1))
+
+    # --- карточки ---
+
+    def _card(self, slot: int) -> ctk.CTkFrame:
+        while len(self._cards) <= slot:
+            card = ctk.CTkFrame(self.scroll_frame, corner_radius=10)
+            card.title = ctk.CTkLabel(card, text="", font=ctk.CTkFont(size=14, weight="bold"), text_color="#F44336")
+            card.title.pack(anchor="w", padx=10, pady=(10, 5))
+            card.question = ctk.CTkLabel(card, text="", font=ctk.CTkFont(size=12), wraplength=700, justify="left")
+            card.question.pack(anchor="w", padx=10, pady=5)
+            card.user = ctk.CTkLabel(card, text="", font=ctk.CTkFont(size=11), text_color="#F44336", wraplength=700, justify="left")
+            card.user.pack(anchor="w", padx=10, pady=2)
+            card.correct = ctk.CTkLabel(card, text="", font=ctk.CTkFont(size=11), text_color="#4CAF50", wraplength=700, justify="left")
+            card.correct.pack(anchor="w", padx=10, pady=(2, 10))
+            self._cards.append(card)
+        return self._cards[slot]
+
+    def _answers(self, index: int) -> Tuple[str, str]:
+        formatted = self._formatted.get(index)
+        if formatted is None:
+            error = self.errors[index]
+            formatted = (
+                self.format_answer(error["question_type"], error["user_answer"]),
+                self.format_answer(error["question_type"], error["correct_answer"]),
+            )
+            self._formatted[index] = formatted
+        return formatted
+
+    def _render(self):
+        pages = max(1, -(-len(self.filtered) // self.PAGE_SIZE))
+        self.page = max(0, min(self.page, pages - 1))
+        shown = self.filtered[self.page * self.PAGE_SIZE:(self.page + 1) * self.PAGE_SIZE]
+
+        for slot, index in enumerate(shown):
+            card = self._card(slot)
+            error = self.errors[index]
+            user_answer, correct_answer = self._answers(index)
+            title = f"Ошибка {index + 1}:"
+            if error.get("topic"):
+                title += f"  {error['topic']}"
+            card.title.configure(text=title)
+            card.question.configure(text=error["question"])
+            card.user.configure(text=f"Ваш ответ: {user_answer}")
+            card.correct.configure(text=f"Правильный ответ: {correct_answer}")
+            if not card.winfo_manager():
+                card.pack(fill="x", pady=5, padx=5)
+        # Видимые карточки всегда идут подряд с начала, поэтому порядок упаковки сохраняется
+        for card in self._cards[len(shown):]:
+            card.pack_forget()
+
+        self.count_label.configure(text=f"Показано ошибок: {len(self.filtered)} из {len(self.errors)}")
+        self.page_label.configure(text=f"Стр. {self.page + 1} из {pages}")
+        self.prev_btn.configure(state="normal" if self.page > 0 else "disabled")
+        self.next_btn.configure(state="normal" if self.page < pages - 1 else "disabled")
+        try:
+            self.scroll_frame._parent_canvas.yview_moveto(0)
+        except Exception:
+            pass
+
+    # --- фильтр и листание ---
+
+    def _apply_filter(self):
+        topic = self.topic_var.get()
+        qtype = self._type_by_title.get(self.type_var.get())
+        self.filtered = [
+            i for i, error in enumerate(self.errors)
+            if (topic == self.ALL or self._topic(error) == topic)
+            and (qtype is None or error.get("question_type") == qtype)
+        ]
+        self.page = 0
+        self._render()
+
+    def _go(self, step: int):
+        pages = max(1, -(-len(self.filtered) // self.PAGE_SIZE))
+        page = self.page + step
+        if 0 <= page < pages:
+            self.page = page
+            self._render()
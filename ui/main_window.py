@@ -1,58 +1,78 @@
 import customtkinter as ctk
 import os
 from tkinter import filedialog, messagebox
-from typing import List, Callable
+from typing import List, Callable, Optional
 
+from core import profiling, tasks
+from core.bank_loader import BankLoadJob, BankLoadResult, error_summary
 from core.models import Quiz
 from core.parser import QuizParser
+from core.quiz_cache import start_warming, stop_warming
 from core.file_manager import FileManager
 from core.settings import SettingsManager
-from ui.test_selection_window import TestSelectionWindow
-from ui.settings_window import SettingsWindow
-from ui.ui_config import apply_adaptive_scaling, center_window_adaptive
+from ui.base_window import BaseWindow
+from ui.ui_config import center_window_adaptive
 
 
-class MainWindow:
-    """Главное окно выбора тестов"""
+class MainWindow(BaseWindow):
+    """Главное окно выбора тестов.
 
-    def __init__(self, on_test_selected: Callable[[List[Quiz]], None]):
-        self.root = ctk.CTk()
+    Выбранные банки разбираются фоновым заданием (BankLoadJob): окно
+    показывает прогресс по файлам и вопросам, загрузку можно отменить,
+    а ошибки собираются в одно сообщение.
+    """
+
+    def __init__(self, root: ctk.CTk, on_test_selected: Callable[[List[Quiz]], None]):
+        super().__init__(root)
         self.on_test_selected = on_test_selected
         self.settings_manager = SettingsManager()
         self.settings = self.settings_manager.load()
 
-        apply_adaptive_scaling(self.root)
+        self._load_job: Optional[BankLoadJob] = None
+        self._load_task: Optional[tasks.TaskHandle] = None
+
         self._setup_ui()
-        self._center_window(780, 560)
 
     def _setup_ui(self):
-        self.root.title("СЭТ")
-
         ctk.CTkLabel(
-            self.root,
+            self.container,
             text="СЭТ - Система Экзаменационного Тестирования",
             font=ctk.CTkFont(size=24, weight="bold"),
             wraplength=740,
             justify="center",
         ).pack(pady=(26, 18))
 
-        button_frame = ctk.CTkFrame(self.root)
+        button_frame = ctk.CTkFrame(self.container)
         button_frame.pack(pady=16, padx=48, fill="both", expand=True)
 
         button_style = {"height": 54, "font": ctk.CTkFont(size=16), "corner_radius": 10}
 
-        ctk.CTkButton(button_frame, text="📁 Выбрать тест из готовых", command=self._select_from_existing, **button_style).pack(pady=8, fill="x")
-        ctk.CTkButton(button_frame, text="🚀 Запустить все тесты", command=self._run_all_tests, **button_style).pack(pady=8, fill="x")
-        ctk.CTkButton(button_frame, text="📤 Загрузить свой файл теста", command=self._load_custom_file, **button_style).pack(pady=8, fill="x")
-        ctk.CTkButton(button_frame, text="⚙ Настройки", command=self._open_settings, **button_style).pack(pady=8, fill="x")
+        # Кнопки, запускающие загрузку тестов, на время загрузки выключаются
+        self._load_buttons = [
+            ctk.CTkButton(button_frame, text="📁 Выбрать тест из готовых", command=self._select_from_existing, **button_style),
+            ctk.CTkButton(button_frame, text="🚀 Запустить все тесты", command=self._run_all_tests, **button_style),
+            ctk.CTkButton(button_frame, text="📤 Загрузить свой файл теста", command=self._load_custom_file, **button_style),
+            ctk.CTkButton(button_frame, text="⚙ Настройки", command=self._open_settings, **button_style),
+        ]
+        for button in self._load_buttons:
+            button.pack(pady=8, fill="x")
         ctk.CTkButton(button_frame, text="ℹ О программе", command=self._show_about, **button_style).pack(pady=8, fill="x")
         ctk.CTkButton(button_frame, text="🚪 Закрыть программу", command=self._exit_app, fg_color="#F44336", **button_style).pack(pady=8, fill="x")
 
-        ctk.CTkLabel(
-            self.root,
+        self.load_frame = ctk.CTkFrame(self.container)
+        self.load_label = ctk.CTkLabel(self.load_frame, text="", font=ctk.CTkFont(size=13))
+        self.load_label.pack(side="top", anchor="w", padx=12, pady=(8, 2))
+        self.load_progress = ctk.CTkProgressBar(self.load_frame)
+        self.load_progress.pack(side="left", fill="x", expand=True, padx=(12, 8), pady=(2, 10))
+        self.load_cancel_btn = ctk.CTkButton(self.load_frame, text="Отмена", width=100, command=self._cancel_loading, fg_color="#9E9E9E")
+        self.load_cancel_btn.pack(side="right", padx=(0, 12), pady=(2, 10))
+
+        self.footer_label = ctk.CTkLabel(
+            self.container,
             text="© СЭТ - 2.2 | 2026 год | Михаил Пышенко | @sir_rumata",
             font=ctk.CTkFont(size=12)
-        ).pack(pady=10)
+        )
+        self.footer_label.pack(pady=10)
 
     def _show_about(self):
         about = ctk.CTkToplevel(self.root)
@@ -96,9 +116,7 @@ class MainWindow:
 
         self.root.wait_window(about)
 
-    def _center_window(self, width: int, height: int):
-        center_window_adaptive(self.root, width, height)
-
+    @profiling.timed("main.select_from_existing")
     def _select_from_existing(self):
         self.settings = self.settings_manager.load()
         file_manager = FileManager()
@@ -108,20 +126,76 @@ class MainWindow:
             messagebox.showinfo("Информация", "Тесты не найдены!")
             return
 
-        selection_window = TestSelectionWindow(self.root, tests_tree, self._on_tests_selected)
+        from ui.test_selection_window import TestSelectionWindow
+
+        selection_window = TestSelectionWindow(self.root, tests_tree, self._on_files_chosen, on_questions_selected=self.on_test_selected)
         selection_window.show()
 
+    def _on_files_chosen(self, selected_files: List[str]):
+        """Выбор из окна запоминается: в следующий раз его банки разберутся заранее."""
+        settings = self.settings_manager.load()
+        settings.LAST_SELECTION = list(selected_files)
+        try:
+            self.settings_manager.save(settings)
+        except OSError as e:
+            print(f"Не удалось запомнить выбор тестов: {e}")
+        self._on_tests_selected(selected_files)
+
     def _on_tests_selected(self, selected_files: List[str]):
-        quizzes = []
-        for filepath in selected_files:
-            try:
-                quizzes.append(QuizParser.parse_question_file(filepath))
-            except Exception as e:
-                messagebox.showerror("Ошибка", f"Ошибка загрузки {filepath}:\n{e}")
-
-        if quizzes:
-            self.root.destroy()
-            self.on_test_selected(quizzes)
+        """Запускает разбор выбранных банков в фоне; экзамен начнётся по его окончании."""
+        if self._load_job is not None or not selected_files:
+            return
+        # Загрузка сама разбирает нужные файлы — упреждающий разбор ей только мешает
+        stop_warming()
+
+        runner = tasks.get_runner()
+        job = self._load_job = BankLoadJob(
+            selected_files, on_progress=lambda: runner.call_soon(self._update_load_progress, key=("load", id(self)))
+        )
+        for button in self._load_buttons:
+            button.configure(state="disabled")
+        self.load_cancel_btn.configure(state="normal", text="Отмена")
+        self.load_progress.set(0)
+        self.load_frame.pack(fill="x", padx=48, pady=(0, 8), before=self.footer_label)
+        self._update_load_progress()
+
+        handle = runner.submit(job.run, on_done=self._on_banks_loaded, on_error=self._on_banks_failed, name="main.load_banks")
+        if self._load_job is job:  # в синхронном режиме загрузка уже завершилась
+            self._load_task = handle
+
+    def _update_load_progress(self):
+        job = self._load_job
+        if job is None:
+            return
+        self.load_progress.set(job.files_done / job.total if job.total else 1)
+        status = "Отмена…" if job.cancelled else "Загрузка тестов"
+        self.load_label.configure(text=f"{status}: файлов {job.files_done} из {job.total} · вопросов {job.questions}")
+
+    def _finish_loading(self):
+        self._load_job = self._load_task = None
+        self.load_frame.pack_forget()
+        for button in self._load_buttons:
+            button.configure(state="normal")
+
+    def _on_banks_loaded(self, result: BankLoadResult):
+        self._finish_loading()
+        if result.cancelled:
+            self._start_speculative_parse()
+            return
+        if result.errors:
+            messagebox.showerror("Ошибка", error_summary(result.errors))
+        if result.quizzes:
+            self.on_test_selected(result.quizzes)
+
+    def _on_banks_failed(self, error: BaseException):
+        self._finish_loading()
+        messagebox.showerror("Ошибка", f"Ошибка загрузки тестов:\n{error}")
+
+    def _cancel_loading(self):
+        if self._load_job is not None:
+            self._load_job.cancel()
+            self.load_cancel_btn.configure(state="disabled")
+            self._update_load_progress()
 
     def _run_all_tests(self):
         self.settings = self.settings_manager.load()
@@ -146,12 +220,13 @@ class MainWindow:
             file_manager = FileManager()
             new_path = file_manager.copy_to_user_tests(filepath)
             quiz = QuizParser.parse_question_file(new_path)
-            self.root.destroy()
             self.on_test_selected([quiz])
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка загрузки файла:\n{e}")
 
     def _open_settings(self):
+        from ui.settings_window import SettingsWindow
+
         settings_window = SettingsWindow(self.root)
         settings_window.show()
 
@@ -166,9 +241,34 @@ class MainWindow:
             self.root.destroy()
         except Exception:
             pass
+        # Результат прошлого теста мог ещё записываться или отправляться в Telegram
+        tasks.wait_critical()
+        # os._exit не вызывает atexit — отчёт профилирования пишем сами
+        profiling.write_report()
         # Принудительное завершение защищает от подвисших after-скриптов CTk
         os._exit(0)
 
-    def show(self):
+    def on_hide(self):
+        super().on_hide()
+        if self._load_job is not None:
+            self._load_job.cancel()
+        if self._load_task is not None:
+            self._load_task.cancel()
+        self._load_job = self._load_task = None
+
+    def on_show(self):
+        self.root.title("СЭТ")
+        self._center_window(780, 560)
         self.root.protocol("WM_DELETE_WINDOW", self._exit_app)
-        self.root.mainloop()
+        self._start_speculative_parse()
+
+    def _start_speculative_parse(self):
+        """Пока ученик в меню, банки разбираются в фоне: сначала прошлый выбор, потом «все тесты»."""
+        last_selection = list(self.settings.LAST_SELECTION or [])
+        include_base = not self.settings.HIDE_BUILTIN_TESTS
+
+        def plan():
+            yield last_selection
+            yield FileManager().get_all_test_files(include_base=include_base)
+
+        start_warming(plan)
@@ -4,32 +4,32 @@ from typing import List, Callable, Optional
 
 from core.file_manager import FileManager
 from core.settings import AppSettings
-from ui.ui_config import apply_adaptive_scaling, center_window_adaptive
+from ui.base_window import BaseWindow
 
-class NameInputWindow:
+class NameInputWindow(BaseWindow):
     """Окно ввода имени пользователя"""
 
-    def __init__(self, on_name_entered: Callable[[str, List], None], settings: Optional[AppSettings] = None):
+    def __init__(self, root: ctk.CTk, on_name_entered: Callable[[str, List], None], settings: Optional[AppSettings] = None,
+                 on_cancel: Optional[Callable] = None):
+        super().__init__(root)
         self.on_name_entered = on_name_entered
+        self.on_cancel = on_cancel
         self.questions = []
         self.settings = settings or AppSettings()
 
-        self.root = ctk.CTk()
-        apply_adaptive_scaling(self.root)
         self._setup_ui()
-        self._center_window(500, 350)
 
-        # Защита от двойного закрытия
+        # Защита от двойного перехода
         self._is_closing = False
 
-    def _setup_ui(self):
+    def on_show(self):
         self.root.title("Ввод данных")
+        self._center_window(500, 350)
+        self.root.protocol("WM_DELETE_WINDOW", self._cancel)
 
-        # Обработчик закрытия окна
-        self.root.protocol("WM_DELETE_WINDOW", self._safe_destroy)
-
+    def _setup_ui(self):
         # Основной фрейм
-        main_frame = ctk.CTkFrame(self.root)
+        main_frame = ctk.CTkFrame(self.container)
         main_frame.pack(fill="both", expand=True, padx=20, pady=20)
 
         # Заголовок
@@ -138,16 +138,6 @@ class NameInputWindow:
         )
         cancel_btn.pack(side="right", padx=10)
 
-    def _center_window(self, width: int, height: int):
-        """Центрирование окна"""
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-
-        x = (screen_width - width) // 2
-        y = (screen_height - height) // 2
-
-        center_window_adaptive(self.root, width, height)
-
     def _submit(self):
         """Обработка введенного имени"""
         if self._is_closing:
@@ -176,52 +166,17 @@ class NameInputWindow:
         file_manager = FileManager()
         file_manager.save_name(name)
 
-        # Мягко скрываем окно, затем запускаем следующий шаг.
-        # Это снижает вероятность ошибок click_animation/update в CTk after-скриптах.
         self._is_closing = True
-        try:
-            self.root.withdraw()
-        except Exception:
-            pass
-
         try:
             self.on_name_entered(name, self.questions)
         except Exception as e:
             print(f"Ошибка при обработке имени: {e}")
-            try:
-                self.root.deiconify()
-            except Exception:
-                pass
             self._is_closing = False
-            return
-
-        try:
-            self.root.after(180, self._safe_destroy)
-        except Exception:
-            self._safe_destroy()
-
-    def _safe_destroy(self):
-        """Безопасное закрытие окна"""
-        self._is_closing = True
-        try:
-            self.root.destroy()
-        except Exception:
-            pass
 
     def _cancel(self):
-        """Отмена и возврат"""
-        self._safe_destroy()
-        # Импортируем здесь, чтобы избежать циклических импортов
-        import sys
-        import os
-        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        from main import PyQuizApp
-        app = PyQuizApp()
-        app.run()
-
-    def show(self):
-        """Показать окно"""
-        try:
-            self.root.mainloop()
-        except Exception as e:
-            print(f"Ошибка в окне ввода имени: {e}")
\ No newline at end of file
+        """Отмена и возврат в главное меню"""
+        if self._is_closing:
+            return
+        self._is_closing = True
+        if self.on_cancel:
+            self.on_cancel()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import customtkinter as ctk
+from typing import Optional
+
+from core import profiling
+from ui.base_window import BaseWindow
+
+
+class ScreenController:
+    """Единственное корневое окно приложения и смена экранов в нём.
+
+    Переход — это замена фрейма, а не новый CTk() с вложенным mainloop(),
+    поэтому стек вызовов не растёт от цикла к циклу тестирования.
+    """
+
+    # Старый экран удаляется не сразу: CTk-кнопка после command ещё доигрывает click-анимацию
+    DESTROY_DELAY_MS = 200
+
+    def __init__(self, root: ctk.CTk):
+        self.root = root
+        self.current: Optional[BaseWindow] = None
+        self._running = False
+
+    def show(self, screen: BaseWindow):
+        with profiling.span(f"screen.show {type(screen).__name__}"):
+            self._show(screen)
+
+    def _show(self, screen: BaseWindow):
+        previous, self.current = self.current, screen
+        if previous is not None:
+            previous.on_hide()
+            try:
+                previous.container.pack_forget()
+            except Exception:
+                pass
+            try:
+                self.root.after(self.DESTROY_DELAY_MS, previous.destroy)
+            except Exception:
+                previous.destroy()
+
+        screen.container.pack(fill="both", expand=True)
+        screen.on_show()
+
+    def run(self):
+        """Единственный mainloop приложения."""
+        if self._running:
+            return
+        self._running = True
+        try:
+            self.root.mainloop()
+        finally:
+            self._running = False
@@ -1,23 +1,32 @@
 import customtkinter as ctk
 from typing import List, Callable, Optional
 
+from core import profiling
+from core.bank_catalog import describe_types, get_bank_catalog
 from core.settings import AppSettings, resolve_time_limit_seconds
-from ui.ui_config import apply_adaptive_scaling, center_window_adaptive
+from ui.base_window import BaseWindow
 
 
-class PreparationWindow:
+class PreparationWindow(BaseWindow):
     """Окно подготовки к тесту"""
 
-    def __init__(self, student_name: str, questions: List, on_start: Callable, settings: Optional[AppSettings] = None):
+    def __init__(self, root: ctk.CTk, student_name: str, questions: List, on_start: Callable, settings: Optional[AppSettings] = None,
+                 on_cancel: Optional[Callable] = None, bank_files: Optional[List[str]] = None):
+        super().__init__(root)
         self.student_name = student_name
         self.questions = questions
         self.on_start = on_start
         self.settings = settings or AppSettings()
+        self.on_cancel = on_cancel
+        self.bank_files = bank_files or []
+        self._is_closing = False
 
-        self.root = ctk.CTk()
-        apply_adaptive_scaling(self.root)
         self._setup_ui()
+
+    def on_show(self):
+        self.root.title("Подготовка к тесту")
         self._center_window(760, 520)
+        self.root.protocol("WM_DELETE_WINDOW", self._cancel)
 
     def _format_estimated_time(self) -> str:
         secs = resolve_time_limit_seconds(self.settings.TIMER, len(self.questions))
@@ -29,10 +38,25 @@ class PreparationWindow:
             return f"⏳ Расчётное время: {h} ч {m:02d} мин"
         return f"⏳ Расчётное время: {mins:02d}:{sec:02d}"
 
-    def _setup_ui(self):
-        self.root.title("Подготовка к тесту")
+    def _format_bank_details(self) -> str:
+        """Состав выбранных банков по каталогу — без повторного разбора файлов."""
+        if not self.bank_files:
+            return ""
+        catalog = get_bank_catalog()
+        total, unknown = catalog.estimate_questions(self.bank_files)
+        if not total:
+            return ""
+        lines = [f"🗂 Вопросов в выбранных банках: {'≈' if unknown else ''}{total}"]
+        types = describe_types(catalog.type_totals(self.bank_files))
+        if types:
+            lines.append(f"    {types}")
+        warnings = sum(len(info.warnings) for info in map(catalog.get, self.bank_files) if info is not None)
+        if warnings:
+            lines.append(f"⚠ Пропущено при разборе: {warnings} (подробнее: python main.py catalog)")
+        return "\n".join(lines) + "\n"
 
-        main_frame = ctk.CTkFrame(self.root)
+    def _setup_ui(self):
+        main_frame = ctk.CTkFrame(self.container)
         main_frame.pack(fill="both", expand=True, padx=26, pady=26)
 
         ctk.CTkLabel(
@@ -48,6 +72,7 @@ class PreparationWindow:
         details = (
             f"👤 Участник: {self.student_name}\n"
             f"📚 Количество вопросов: {len(self.questions)}\n"
+            f"{self._format_bank_details()}"
             f"{self._format_estimated_time()}\n\n"
             "✨ Рекомендации перед стартом:\n"
             "• Убедитесь, что вас ничего не отвлекает\n"
@@ -87,40 +112,21 @@ class PreparationWindow:
             fg_color="#9E9E9E",
         ).pack(pady=8)
 
-    def _center_window(self, width: int, height: int):
-        center_window_adaptive(self.root, width, height)
-
-    def _safe_destroy(self):
-        try:
-            self.root.destroy()
-        except Exception:
-            pass
-
     def _start_test(self):
-        try:
-            self.root.withdraw()
-        except Exception:
-            pass
-
+        if self._is_closing:
+            return
+        self._is_closing = True
+        profiling.instant("click: Начать тест", questions=len(self.questions))
         try:
             self.on_start(self.student_name, self.questions)
         except Exception:
-            try:
-                self.root.deiconify()
-            except Exception:
-                pass
+            self._is_closing = False
             raise
 
-        try:
-            self.root.after(180, self._safe_destroy)
-        except Exception:
-            self._safe_destroy()
-
     def _cancel(self):
-        self._safe_destroy()
-        from main import PyQuizApp
-        app = PyQuizApp()
-        app.run()
+        if self._is_closing:
+            return
+        self._is_closing = True
+        if self.on_cancel:
+            self.on_cancel()
 
-    def show(self):
-        self.root.mainloop()
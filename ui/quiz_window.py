@@ -3,55 +3,85 @@ import tkinter as tk
 from tkinter import messagebox, TclError
 from typing import Optional, Dict, Any
 import os
-from PIL import Image, ImageTk
+from PIL import ImageTk
 
+from core import lag_monitor, profiling
 from core.models import Question, QuestionType
 from core.quiz_logic import QuizEngine
 from core.settings import AppSettings
-from core.file_manager import FileManager
+from core.image_cache import ImageMemoryCache, estimate_image_bytes
+from core.image_loader import ImagePrefetcher
+from core.image_pyramid import ImagePyramid
+from core.thumbnail_cache import get_thumbnail_cache
 from ui.widgets.custom_dropdown import CustomDropdown
+from ui.widgets.zoom_viewer import ZoomImageView
+from ui.base_window import BaseWindow, unbind_callback
 from ui.ui_config import apply_adaptive_scaling
 
 
-class QuizWindow:
+class QuizWindow(BaseWindow):
     """Окно тестирования с поддержкой изображений"""
 
-    def __init__(self, quiz_engine: QuizEngine, on_finish: callable, settings: Optional[AppSettings] = None, on_cancel: Optional[callable] = None):
+    FOCUS_WATCHDOG_MS = 5000
+
+    @profiling.timed("quiz.init")
+    def __init__(self, root: ctk.CTk, quiz_engine: QuizEngine, on_finish: callable, settings: Optional[AppSettings] = None, on_cancel: Optional[callable] = None):
+        super().__init__(root)
         self.quiz_engine = quiz_engine
         self.on_finish = on_finish
         self.settings = settings or AppSettings()
         self.on_cancel = on_cancel
 
         self._closed = False
-        self.root = ctk.CTk()
         self.scale, self.font_scale = apply_adaptive_scaling(self.root)
         self._setup_ui()
 
-        self._apply_fullscreen_safe()
-
-        if self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS:
-            try:
-                self.root.attributes("-topmost", True)
-            except Exception:
-                pass
-            self.root.bind("<Unmap>", self._prevent_minimize)
-
         self.current_question: Optional[Question] = None
         self.user_inputs: Dict[str, Any] = {}
-        self.images_cache = []
-        self._image_path_cache = {}
+        # Переживает смену вопросов: возврат из карусели и повторное увеличение не декодируют заново
+        self.images_cache = ImageMemoryCache(self.settings.IMAGE_CACHE_MB * 1024 * 1024)
+        self.prefetcher = ImagePrefetcher(cache=get_thumbnail_cache())
         self.image_overlay = None
-        self.image_overlay_label = None
+        self.image_overlay_view = None
+        self._overlay_pyramid = None
+        self._overlay_escape_id: Optional[str] = None
         self._timer_after_id = None
         self._focus_guard_after_id = None
         self._allow_external_focus = False
+        self._focus_check_pending = False
 
         # Карусель пропущенных вопросов
         self.pending_questions = []
         self.answered_ids = set()
 
-        self._load_next_question()
-        self._schedule_focus_guard()
+    def on_show(self):
+        self.root.title("Тестирование")
+        self.root.protocol("WM_DELETE_WINDOW", self._exit_test)
+        self._apply_fullscreen_safe()
+
+        if self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS:
+            try:
+                self.root.attributes("-topmost", True)
+            except Exception:
+                pass
+
+        if self.current_question is None and not self._closed:
+            lag_monitor.start_session()
+            self._load_next_question()
+            self._install_focus_guard()
+            if profiling.is_enabled():
+                # Tk-поток освободился: первый вопрос отрисован
+                self.root.after_idle(lambda: profiling.instant("quiz.first_question_idle"))
+
+    def on_hide(self):
+        """Корневое окно общее: снимаем полноэкранный режим и привязки теста."""
+        super().on_hide()
+        self._closed = True
+        for attr in ("-fullscreen", "-topmost"):
+            try:
+                self.root.attributes(attr, False)
+            except Exception:
+                pass
 
     def _apply_fullscreen_safe(self):
         """Безопасное включение полноэкранного режима (с fallback)."""
@@ -96,17 +126,15 @@ class QuizWindow:
             self.root.geometry(f"{screen_width}x{screen_height}")
 
     def _setup_ui(self):
-        self.root.title("Тестирование")
-
         # Создаем основную сетку
-        self.root.grid_rowconfigure(0, weight=0)  # верхняя панель (таймер)
-        self.root.grid_rowconfigure(1, weight=1)  # вопрос
-        self.root.grid_rowconfigure(2, weight=1)  # ответы
-        self.root.grid_rowconfigure(3, weight=0)  # кнопки
-        self.root.grid_columnconfigure(0, weight=1)
+        self.container.grid_rowconfigure(0, weight=0)  # верхняя панель (таймер)
+        self.container.grid_rowconfigure(1, weight=1)  # вопрос
+        self.container.grid_rowconfigure(2, weight=1)  # ответы
+        self.container.grid_rowconfigure(3, weight=0)  # кнопки
+        self.container.grid_columnconfigure(0, weight=1)
 
         # Верхняя панель с таймером и прогрессом
-        top_frame = ctk.CTkFrame(self.root)
+        top_frame = ctk.CTkFrame(self.container)
         top_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=(10, 5))
         top_frame.grid_columnconfigure(0, weight=1)
         top_frame.grid_columnconfigure(1, weight=0)
@@ -131,15 +159,15 @@ class QuizWindow:
         self.progress_label.grid(row=0, column=1, sticky="e", padx=12, pady=5)
 
         # Фрейм с вопросом
-        self.question_frame = ctk.CTkScrollableFrame(self.root)
+        self.question_frame = ctk.CTkScrollableFrame(self.container)
         self.question_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
 
         # Фрейм с ответами
-        self.answers_frame = ctk.CTkScrollableFrame(self.root)
+        self.answers_frame = ctk.CTkScrollableFrame(self.container)
         self.answers_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=5)
 
         # КОНТЕЙНЕР ДЛЯ КНОПОК - ВСЕГДА ВИДИМЫЙ
-        bottom_frame = ctk.CTkFrame(self.root, height=80)  # фиксированная высота
+        bottom_frame = ctk.CTkFrame(self.container, height=80)  # фиксированная высота
         bottom_frame.grid(row=3, column=0, sticky="nsew", padx=10, pady=(5, 10))
         bottom_frame.grid_propagate(False)  # фиксируем высоту
 
@@ -211,41 +239,111 @@ class QuizWindow:
         # Обновляем геометрию для правильного распределения
         self.root.update_idletasks()
 
-    def _schedule_focus_guard(self):
+    def _install_focus_guard(self):
+        """Защита от сворачивания и ухода фокуса: реакция на события окна, а не постоянный опрос."""
+        if not self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS:
+            return
+        self._bind_root("<FocusOut>", self._on_focus_out)
+        self._bind_root("<Unmap>", self._on_unmap)
+        self._bind_root("<Visibility>", self._on_visibility)
+        self._schedule_focus_watchdog()
+
+    def _schedule_focus_watchdog(self):
+        """Редкая страховочная проверка на случай, если оконный менеджер не прислал событие."""
         if self._closed or not self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS:
             return
         try:
-            self._focus_guard_after_id = self.root.after(350, self._enforce_focus_guard)
+            self._focus_guard_after_id = self.root.after(self.FOCUS_WATCHDOG_MS, self._focus_watchdog)
         except Exception:
             self._focus_guard_after_id = None
 
-    def _enforce_focus_guard(self):
+    def _focus_watchdog(self):
         self._focus_guard_after_id = None
-        if self._closed or not self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS or self._allow_external_focus:
+        if self._closed:
             return
+        if not self._allow_external_focus and self._focus_is_lost():
+            self._register_focus_loss("watchdog")
+        self._schedule_focus_watchdog()
 
+    def _focus_is_lost(self) -> bool:
         try:
             if self.root.state() == "iconic":
-                self.root.deiconify()
-            self.root.attributes("-topmost", True)
-            self.root.lift()
-            self.root.focus_force()
+                return True
+            return self.root.focus_get() is None
+        except (KeyError, TclError):
+            # focus_get падает на виджетах, которых нет в дереве Tkinter (например, системный диалог)
+            return False
+
+    def _on_focus_out(self, _event):
+        # FocusOut приходит и при переходе фокуса между своими виджетами — проверяем после обработки событий
+        if self._closed or self._allow_external_focus or self._focus_check_pending:
+            return
+        self._focus_check_pending = True
+        self.root.after_idle(self._check_focus_after_event)
+
+    def _check_focus_after_event(self):
+        self._focus_check_pending = False
+        if self._closed or self._allow_external_focus:
+            return
+        if self._focus_is_lost():
+            self._register_focus_loss("focus_out")
+
+    def _on_unmap(self, event):
+        if event.widget is not self.root or self._closed or self._allow_external_focus:
+            return
+        self._register_focus_loss("minimize")
+
+    def _on_visibility(self, event):
+        if event.widget is not self.root or self._closed or self._allow_external_focus:
+            return
+        if str(event.state) in ("VisibilityPartiallyObscured", "VisibilityFullyObscured"):
+            # Окно закрыл собственный список выбора или просмотрщик картинки — это не списывание
+            if self._own_popup_open():
+                return
+            self._register_focus_loss("obscured")
+
+    def _own_popup_open(self) -> bool:
+        """Показано ли поверх теста собственное окно приложения (Toplevel корня)."""
+        try:
+            return any(
+                isinstance(child, tk.Toplevel) and child.winfo_ismapped()
+                for child in self.root.winfo_children()
+            )
+        except TclError:
+            return False
+
+    def _register_focus_loss(self, kind: str):
+        """Пишет инцидент в журнал результата и возвращает окно на передний план."""
+        self.quiz_engine.record_focus_incident(kind)
+        try:
+            self.root.after_idle(self._restore_focus)
         except Exception:
             pass
 
-        self._schedule_focus_guard()
-
-    def _prevent_minimize(self, _event):
-        if not self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS:
+    def _restore_focus(self):
+        # lift() корня спрятал бы открытый список ответов под окно теста
+        if self._closed or self._allow_external_focus or self._own_popup_open():
             return
         try:
             if self.root.state() == "iconic":
                 self.root.deiconify()
-                self.root.lift()
-                self.root.after(80, self.root.focus_force)
+            self.root.attributes("-topmost", True)
+            self.root.lift()
+            self.root.focus_force()
         except Exception:
             pass
 
+    def _show_warning(self, title: str, message: str):
+        """Предупреждение внутри теста: собственный диалог не считается уходом фокуса."""
+        previous = self._allow_external_focus
+        self._allow_external_focus = True
+        try:
+            messagebox.showwarning(title, message)
+        finally:
+            self._allow_external_focus = previous
+        if self.settings.DISABLE_MINIMIZE_AND_FOCUS_LOSS:
+            self._restore_focus()
+
     def _update_timer(self):
         if self._closed or not self.quiz_engine.timer_active:
             return
@@ -288,10 +386,11 @@ class QuizWindow:
             self._finish_test()
             return
 
-        self.images_cache.clear()
-        self._display_question()
-        self._display_answers()
-        self._update_progress()
+        with profiling.span("question.render"):
+            self._display_question()
+            self._display_answers()
+            self._update_progress()
+        self._prefetch_upcoming()
 
     def _ensure_buttons_visible(self):
         """Гарантирует, что кнопки всегда видны."""
@@ -299,8 +398,8 @@ class QuizWindow:
 
         # Получаем координаты нижнего фрейма
         try:
-            bottom_frame_y = self.root.grid_bbox(row=3, column=0)[1]
-            screen_height = self.root.winfo_height()
+            bottom_frame_y = self.container.grid_bbox(row=3, column=0)[1]
+            screen_height = self.container.winfo_height()
 
             # Если нижний фрейм вне экрана, корректируем размеры
             if bottom_frame_y > screen_height * 0.8:  # Если занимает больше 80% экрана
@@ -322,77 +421,37 @@ class QuizWindow:
         }
         return mapping.get(qtype, "Неизвестный тип")
 
-    def _resolve_image_path(self, image_path: str) -> Optional[str]:
-        """Надежно резолвит путь к картинке в рантайме."""
-        if not image_path:
-            return None
-
-        normalized = image_path.strip().replace("\\", os.sep).replace("/", os.sep)
-        if os.path.exists(normalized):
-            return normalized
-
-        file_manager = FileManager()
-        rooted_candidates = [
-            os.path.join(os.getcwd(), normalized),
-            os.path.join(file_manager.get_base_tests_dir(), normalized),
-            os.path.join(file_manager.get_user_tests_dir(), normalized),
-            os.path.join(file_manager.get_base_tests_dir(), "images", normalized),
-            os.path.join(file_manager.get_user_tests_dir(), "images", normalized),
-        ]
-        for candidate in rooted_candidates:
-            if os.path.exists(candidate):
-                return candidate
-
-        filename = os.path.basename(normalized)
-        key = filename.lower()
-        if key in self._image_path_cache:
-            cached = self._image_path_cache[key]
-            return cached if cached and os.path.exists(cached) else None
-
-        roots = [
-            os.getcwd(),
-            os.path.join(os.getcwd(), "images"),
-            file_manager.get_base_tests_dir(),
-            os.path.join(file_manager.get_base_tests_dir(), "images"),
-            file_manager.get_user_tests_dir(),
-            os.path.join(file_manager.get_user_tests_dir(), "images"),
-        ]
-
-        # Локальный поиск рядом с CWD в ограниченную глубину
-        for root in roots:
-            if not root or not os.path.isdir(root):
-                continue
-            try:
-                for dirpath, _dirnames, files in os.walk(root):
-                    for f in files:
-                        if f.lower() == key:
-                            found = os.path.join(dirpath, f)
-                            self._image_path_cache[key] = found
-                            return found
-            except Exception:
-                continue
+    def _thumbnail_size(self):
+        if self.root.winfo_screenwidth() <= 1366:
+            return 220, 180
+        return 280, 220
 
-        self._image_path_cache[key] = None
-        return None
+    def _load_tk_image(self, image_path: str, max_w: int, max_h: int, base_dir: str = ""):
+        """Берёт подготовленную миниатюру и возвращает ImageTk.PhotoImage либо None."""
+        key = (image_path, max_w, max_h, base_dir)
+        hit = self.images_cache.get(key)
+        if hit is not None:
+            return hit
 
-    def _load_tk_image(self, image_path: str, max_w: int, max_h: int):
-        """Грузит картинку и возвращает ImageTk.PhotoImage либо None."""
-        resolved = self._resolve_image_path(image_path)
-        if not resolved:
-            return None, None
+        image, resolved = self.prefetcher.get(image_path, max_w, max_h, base_dir)
+        if image is None:
+            return None, resolved
         try:
-            with Image.open(resolved) as src:
-                image = src.convert("RGBA")
-            image.thumbnail((max_w, max_h), Image.Resampling.LANCZOS)
-            if image.width <= 0 or image.height <= 0:
-                return None, resolved
-
             tk_image = ImageTk.PhotoImage(image, master=self.root)
-            self.images_cache.append(tk_image)
+            self.images_cache.put(key, (tk_image, resolved), estimate_image_bytes(image))
             return tk_image, resolved
         except Exception:
             return None, resolved
 
+    def _prefetch_upcoming(self):
+        """Заранее декодирует картинки ближайших вопросов в фоне."""
+        upcoming = self.quiz_engine.peek_upcoming(self.prefetcher.lookahead)
+        if len(upcoming) < self.prefetcher.lookahead:
+            carousel = [q for q in self.pending_questions if id(q) not in self.answered_ids]
+            upcoming.extend(carousel[:self.prefetcher.lookahead - len(upcoming)])
+        max_w, max_h = self._thumbnail_size()
+        self.prefetcher.prefetch(upcoming, max_w, max_h)
+
     def _display_question(self):
         for widget in self.question_frame.winfo_children():
             widget.destroy()
@@ -403,11 +462,10 @@ class QuizWindow:
         if screen_width <= 1366:
             info_font_size = 12
             question_font_size = 18
-            image_size = (220, 180)
         else:
             info_font_size = 14
             question_font_size = 20
-            image_size = (280, 220)
+        image_size = self._thumbnail_size()
 
         info_label = ctk.CTkLabel(
             self.question_frame,
@@ -442,7 +500,7 @@ class QuizWindow:
 
             for desc, img_path in self.current_question.images:
                 max_w, max_h = image_size
-                tk_image, resolved = self._load_tk_image(img_path, max_w, max_h)
+                tk_image, resolved = self._load_tk_image(img_path, max_w, max_h, self.current_question.image_base_dir)
 
                 if tk_image is None:
                     miss = resolved or img_path
@@ -475,8 +533,9 @@ class QuizWindow:
                              font=ctk.CTkFont(size=10),
                              wraplength=img_frame_width - 20).pack(pady=2)
 
-    def _open_image_popup(self, image_path: str, description: str):
-        """Показывает увеличенное изображение поверх текущего окна с затемнением."""
+    @profiling.timed("quiz.image_popup")
+    def _open_image_popup(self, image_path: str, description: str, base_dir: str = ""):
+        """Показывает изображение с зумом и сдвигом поверх текущего окна с затемнением."""
         self._close_image_overlay()
         self.root.update_idletasks()
 
@@ -485,14 +544,20 @@ class QuizWindow:
         margin_x = max(60, int(sw * 0.08))
         margin_y = max(60, int(sh * 0.1))
         max_w = max(320, sw - margin_x * 2)
-        max_h = max(240, sh - margin_y * 2 - 50)
+        max_h = max(240, sh - margin_y * 2 - 90)
 
-        tk_image, resolved = self._load_tk_image(image_path, max_w, max_h)
-        if tk_image is None:
-            messagebox.showwarning("Изображение", f"Не удалось открыть изображение: {os.path.basename(image_path)}")
+        resolved = self.prefetcher.resolve(image_path, base_dir)
+        pyramid = self.images_cache.get(("pyramid", resolved)) if resolved else None
+        if pyramid is None and resolved:
+            try:
+                pyramid = ImagePyramid(resolved)
+            except Exception:
+                pyramid = None
+        if pyramid is None:
+            self._show_warning("Изображение", f"Не удалось открыть изображение: {os.path.basename(image_path)}")
             return
 
-        self.image_overlay = ctk.CTkFrame(self.root, fg_color=("#000000", "#000000"), corner_radius=0)
+        self.image_overlay = ctk.CTkFrame(self.container, fg_color=("#000000", "#000000"), corner_radius=0)
         self.image_overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
         self.image_overlay.lift()
 
@@ -500,29 +565,52 @@ class QuizWindow:
         container.place(relx=0.5, rely=0.5, anchor="center")
 
         try:
-            self.image_overlay_label = tk.Label(container, image=tk_image, bd=0, highlightthickness=0)
-            self.image_overlay_label._image_ref = tk_image
-            self.image_overlay_label.pack(padx=18, pady=(18, 8))
-        except TclError:
+            self.image_overlay_view = ZoomImageView(container, pyramid, width=max_w, height=max_h)
+            self.image_overlay_view.pack(padx=18, pady=(18, 8))
+        except (TclError, OSError):
             ctk.CTkLabel(container, text="Не удалось отобразить изображение", text_color="#FF9800").pack(padx=18, pady=18)
             return
+        self._overlay_pyramid = (resolved, pyramid)
 
         if description:
-            ctk.CTkLabel(container, text=description, justify="center", wraplength=max_w).pack(padx=14, pady=(0, 12))
-
-        # Любой клик закрывает overlay
+            ctk.CTkLabel(container, text=description, justify="center", wraplength=max_w).pack(padx=14, pady=(0, 4))
+
+        footer = ctk.CTkFrame(container, fg_color="transparent")
+        footer.pack(fill="x", padx=14, pady=(0, 12))
+        ctk.CTkLabel(
+            footer,
+            text="Колесо мыши — масштаб, перетаскивание — сдвиг, двойной клик — вписать",
+            font=ctk.CTkFont(size=11),
+            text_color=("#5f5f5f", "#b5b5b5"),
+        ).pack(side="left")
+        ctk.CTkButton(footer, text="Закрыть", width=110, command=self._close_image_overlay).pack(side="right")
+
+        # Клик по затемнению или Escape закрывает overlay; клики по картинке — для сдвига
         self.image_overlay.bind("<Button-1>", lambda _e: self._close_image_overlay())
-        container.bind("<Button-1>", lambda _e: self._close_image_overlay())
-        self.image_overlay_label.bind("<Button-1>", lambda _e: self._close_image_overlay())
+        self._overlay_escape_id = self.root.bind("<Escape>", lambda _e: self._close_image_overlay(), add="+")
 
     def _close_image_overlay(self):
         if self.image_overlay is not None:
+            if self._overlay_escape_id is not None:
+                try:
+                    unbind_callback(self.root, "<Escape>", self._overlay_escape_id)
+                except Exception:
+                    pass
+                self._overlay_escape_id = None
             try:
                 self.image_overlay.destroy()
             except Exception:
                 pass
         self.image_overlay = None
-        self.image_overlay_label = None
+        self.image_overlay_view = None
+
+        if self._overlay_pyramid is not None:
+            resolved, pyramid = self._overlay_pyramid
+            # Полное разрешение не держим, уровни попроще пригодятся при повторном открытии
+            if pyramid.max_level > 0:
+                pyramid.release_finest(1)
+            self.images_cache.put(("pyramid", resolved), pyramid, pyramid.nbytes)
+            self._overlay_pyramid = None
 
     def _display_answers(self):
         for widget in self.answers_frame.winfo_children():
@@ -642,8 +730,8 @@ class QuizWindow:
                 self.pending_questions.append(self.current_question)
 
         self._load_next_question()
-        self._schedule_focus_guard()
 
+    @profiling.timed("quiz.next_question")
     def _next_question(self):
         if not self._validate_answer():
             return
@@ -655,25 +743,24 @@ class QuizWindow:
             self.answered_ids.add(qid)
 
         self._load_next_question()
-        self._schedule_focus_guard()
 
     def _validate_answer(self) -> bool:
         if self.current_question.question_type == QuestionType.FREEFORM:
             freeform_text = self.freeform_entry.get().strip() if hasattr(self, "freeform_entry") else self.freeform_var.get().strip()
             if not freeform_text:
-                messagebox.showwarning("Внимание", "Введите ответ!")
+                self._show_warning("Внимание", "Введите ответ!")
                 return False
 
         elif self.current_question.question_type in [QuestionType.SINGLE, QuestionType.MULTIPLE]:
             selected = [l for l, v in self.user_inputs.items() if v.get()]
             if not selected:
-                messagebox.showwarning("Внимание", "Выберите хотя бы один вариант!")
+                self._show_warning("Внимание", "Выберите хотя бы один вариант!")
                 return False
 
         elif self.current_question.question_type == QuestionType.MATCHING:
             for dropdown in self.matching_inputs.values():
                 if not dropdown.get().strip():
-                    messagebox.showwarning("Внимание", "Заполните все сопоставления!")
+                    self._show_warning("Внимание", "Заполните все сопоставления!")
                     return False
 
         return True
@@ -755,6 +842,7 @@ class QuizWindow:
         dlg.protocol("WM_DELETE_WINDOW", lambda: _close_dialog(False))
         self.root.wait_window(dlg)
 
+    @profiling.timed("quiz.finish")
     def _finish_test(self, timeout: bool = False, cancelled: bool = False):
         self._closed = True
         self._allow_external_focus = True
@@ -774,6 +862,13 @@ class QuizWindow:
         self._focus_guard_after_id = None
 
         self._close_image_overlay()
+        self.prefetcher.shutdown()
+        profiler = profiling.get_profiler()
+        if profiler is not None:
+            # Статистика кэша картинок последнего теста — в отчёт профилирования
+            stats = self.images_cache.stats()
+            profiler.add_section("image_cache", lambda: stats)
+        self.images_cache.clear()
 
         if cancelled:
             try:
@@ -782,10 +877,6 @@ class QuizWindow:
                 pass
 
             def _close_and_restart():
-                try:
-                    self.root.destroy()
-                except Exception:
-                    pass
                 if self.on_cancel:
                     self.on_cancel()
 
@@ -797,6 +888,7 @@ class QuizWindow:
 
         self.quiz_engine.timeout_occurred = timeout
         result = self.quiz_engine.calculate_result()
+        result.event_loop_lag = lag_monitor.session_summary()
 
         try:
             self.root.attributes("-topmost", False)
@@ -804,10 +896,6 @@ class QuizWindow:
             pass
 
         def _close_and_finish():
-            try:
-                self.root.destroy()
-            except Exception:
-                pass
             self.on_finish(result)
 
         try:
@@ -815,5 +903,3 @@ class QuizWindow:
         except Exception:
             _close_and_finish()
 
-    def show(self):
-        self.root.mainloop()
@@ -1,35 +1,49 @@
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
-import json
 import os
 from datetime import datetime
 from typing import Dict, Callable, Optional
 
+from core import profiling, tasks
 from core.models import TestResult
-from core.file_manager import FileManager
-from services.telegram_service import TelegramService
+from core.file_manager import FileManager, write_json_atomic
 from core.settings import AppSettings
-from ui.ui_config import apply_adaptive_scaling, center_window_adaptive
+from ui.base_window import BaseWindow
+from ui.error_review_window import ErrorReviewWindow
 
-class ResultsWindow:
+class ResultsWindow(BaseWindow):
     """Окно отображения результатов теста"""
 
-    def __init__(self, result: TestResult, on_restart: Callable, settings: Optional[AppSettings] = None):
+    def __init__(self, root: ctk.CTk, result: TestResult, on_restart: Callable, settings: Optional[AppSettings] = None):
+        super().__init__(root)
         self.result = result
         self.on_restart = on_restart
         self.settings = settings or AppSettings()
+        self._is_closing = False
+        self._errors_window: Optional[ErrorReviewWindow] = None
+        self._save_task: Optional[tasks.TaskHandle] = None
+        self._telegram_task: Optional[tasks.TaskHandle] = None
 
-        self.root = ctk.CTk()
-        apply_adaptive_scaling(self.root)
         self._setup_ui()
-        self._center_window(700, 600)
 
-    def _setup_ui(self):
+    def on_show(self):
         self.root.title("Результаты теста")
+        self._center_window(700, 600)
         self.root.protocol("WM_DELETE_WINDOW", self._new_test)
 
+    def on_hide(self):
+        super().on_hide()
+        # Окно ошибок принадлежит корню и иначе пережило бы экран результатов
+        if self._errors_window is not None:
+            try:
+                self._errors_window.window.destroy()
+            except Exception:
+                pass
+            self._errors_window = None
+
+    def _setup_ui(self):
         # Основной контейнер с прокруткой
-        main_frame = ctk.CTkScrollableFrame(self.root)
+        main_frame = ctk.CTkScrollableFrame(self.container)
         main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         # Заголовок
@@ -96,6 +110,9 @@ class ResultsWindow:
         if self.result.timeout:
             info_text += "\n⏰ Тест завершен по таймауту!"
 
+        if self.result.focus_incidents:
+            info_text += f"\n⚠ Выходов из окна теста: {len(self.result.focus_incidents)}"
+
         info_label = ctk.CTkLabel(
             result_card,
             text=info_text,
@@ -135,7 +152,7 @@ class ResultsWindow:
         button_frame.pack(pady=30, padx=20, fill="x")
 
         # Кнопка сохранения
-        save_btn = ctk.CTkButton(
+        self.save_btn = ctk.CTkButton(
             button_frame,
             text="💾 Сохранить результат",
             command=self._save_result,
@@ -144,7 +161,7 @@ class ResultsWindow:
             font=ctk.CTkFont(size=14),
             fg_color="#2196F3"
         )
-        save_btn.pack(pady=5)
+        self.save_btn.pack(pady=5)
 
         # Кнопка просмотра ошибок
         if self.settings.SHOW_STATS_BUTTON and self.result.correct_answers < self.result.total_questions:
@@ -172,7 +189,7 @@ class ResultsWindow:
         new_test_btn.pack(pady=5)
 
         # Кнопка выхода
-        exit_btn = ctk.CTkButton(
+        self.exit_btn = ctk.CTkButton(
             button_frame,
             text="🚪 Выйти",
             command=self._exit_app,
@@ -181,23 +198,15 @@ class ResultsWindow:
             font=ctk.CTkFont(size=14),
             fg_color="#9E9E9E"
         )
-        exit_btn.pack(pady=5)
+        self.exit_btn.pack(pady=5)
 
         if self.settings.TELEGRAM_SEND_ON_RESULT:
             self._send_to_telegram()
 
-    def _center_window(self, width: int, height: int):
-        """Центрирование окна"""
-        screen_width = self.root.winfo_screenwidth()
-        screen_height = self.root.winfo_screenheight()
-
-        x = (screen_width - width) // 2
-        y = (screen_height - height) // 2
-
-        center_window_adaptive(self.root, width, height)
-
     def _save_result(self):
         """Сохранение результата в файл"""
+        if self._save_task is not None:
+            return
         file_manager = FileManager()
 
         # Подготовка данных для сохранения
@@ -211,8 +220,11 @@ class ResultsWindow:
             'grade_5': self.result.grade_5,
             'passed': self.result.passed,
             'timeout': self.result.timeout,
-            'detailed_results': self.result.detailed_results
+            'detailed_results': self.result.detailed_results,
+            'focus_incidents': self.result.focus_incidents
         }
+        if self.result.event_loop_lag:
+            result_data['event_loop_lag'] = self.result.event_loop_lag
 
         if self.result.time_left:
             result_data['time_left_minutes'] = self.result.time_left[0]
@@ -239,20 +251,43 @@ class ResultsWindow:
             if not filepath:
                 return
 
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, ensure_ascii=False, indent=2)
+        # Запись на сетевой диск может идти секундами — не в потоке Tk.
+        # Пока файл пишется, сохранить повторно или выйти нельзя
+        self._set_save_pending(True)
+        self._save_task = tasks.get_runner().submit(
+            self._write_result, filepath, result_data,
+            on_done=self._on_result_saved, on_error=self._on_save_failed, name="result.save", critical=True,
+        )
+
+    def _set_save_pending(self, pending: bool):
+        state = "disabled" if pending else "normal"
+        for button in (self.save_btn, self.exit_btn):
+            try:
+                button.configure(state=state)
+            except Exception:
+                pass  # экран уже скрыт
 
-            messagebox.showinfo("Успех", f"Результат сохранён в файл:\n{filepath}")
+    @staticmethod
+    def _write_result(filepath: str, result_data: Dict) -> str:
+        with profiling.span("result.save"):
+            write_json_atomic(filepath, result_data)
 
             # Также сохраняем в пользовательскую директорию
-            file_manager.save_result(result_data)
+            FileManager().save_result(result_data)
+        return filepath
+
+    def _on_result_saved(self, filepath: str):
+        self._save_task = None
+        self._set_save_pending(False)
+        messagebox.showinfo("Успех", f"Результат сохранён в файл:\n{filepath}")
 
-            if self.settings.TELEGRAM_SEND_ON_SAVE:
-                self._send_to_telegram()
+        if self.settings.TELEGRAM_SEND_ON_SAVE:
+            self._send_to_telegram()
 
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{e}")
+    def _on_save_failed(self, error: BaseException):
+        self._save_task = None
+        self._set_save_pending(False)
+        messagebox.showerror("Ошибка", f"Не удалось сохранить файл:\n{error}")
 
     def _show_errors(self):
         """Отображение ошибок"""
@@ -262,74 +297,10 @@ class ResultsWindow:
             messagebox.showinfo("Информация", "У вас нет ошибок!")
             return
 
-        # Создаем окно с ошибками
-        errors_window = ctk.CTkToplevel(self.root)
-        errors_window.title("Ошибки в тесте")
-        errors_window.geometry("800x600")
-
-        # Контейнер с прокруткой
-        scroll_frame = ctk.CTkScrollableFrame(errors_window)
-        scroll_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-        for i, error in enumerate(errors, 1):
-            error_frame = ctk.CTkFrame(scroll_frame, corner_radius=10)
-            error_frame.pack(fill="x", pady=5, padx=5)
-
-            # Заголовок ошибки
-            error_title = ctk.CTkLabel(
-                error_frame,
-                text=f"Ошибка {i}:",
-                font=ctk.CTkFont(size=14, weight="bold"),
-                text_color="#F44336"
-            )
-            error_title.pack(anchor="w", padx=10, pady=(10, 5))
-
-            # Вопрос
-            question_label = ctk.CTkLabel(
-                error_frame,
-                text=error['question'],
-                font=ctk.CTkFont(size=12),
-                wraplength=700,
-                justify="left"
-            )
-            question_label.pack(anchor="w", padx=10, pady=5)
-
-            # Ваш ответ
-            user_answer = self._format_answer_for_display(
-                error['question_type'],
-                error['user_answer']
-            )
-
-            user_label = ctk.CTkLabel(
-                error_frame,
-                text=f"Ваш ответ: {user_answer}",
-                font=ctk.CTkFont(size=11),
-                text_color="#F44336"
-            )
-            user_label.pack(anchor="w", padx=10, pady=2)
-
-            # Правильный ответ
-            correct_answer = self._format_answer_for_display(
-                error['question_type'],
-                error['correct_answer']
-            )
-
-            correct_label = ctk.CTkLabel(
-                error_frame,
-                text=f"Правильный ответ: {correct_answer}",
-                font=ctk.CTkFont(size=11),
-                text_color="#4CAF50"
-            )
-            correct_label.pack(anchor="w", padx=10, pady=(2, 10))
-
-        # Кнопка закрытия
-        close_btn = ctk.CTkButton(
-            scroll_frame,
-            text="Закрыть",
-            command=errors_window.destroy,
-            width=100
-        )
-        close_btn.pack(pady=20)
+        if self._errors_window is not None and self._errors_window.window.winfo_exists():
+            self._errors_window.window.lift()
+            return
+        self._errors_window = ErrorReviewWindow(self.root, errors, self._format_answer_for_display)
 
     def _format_answer_for_display(self, qtype: str, answer) -> str:
         """Форматирование ответа для отображения"""
@@ -346,47 +317,44 @@ class ResultsWindow:
         return str(answer)
 
     def _send_to_telegram(self):
-        """Отправка результата в Telegram"""
-        try:
-            telegram_service = TelegramService()
-            if telegram_service.is_configured():
-                telegram_service.send_result(self.result)
-        except Exception:
-            pass  # Игнорируем ошибки Telegram
-
-    def _safe_destroy(self):
-        try:
-            self.root.destroy()
-        except Exception:
-            pass
+        """Отправка результата в Telegram в фоне: сеть не задерживает экран результатов"""
+        # Ошибки Telegram по-прежнему игнорируются
+        self._telegram_task = tasks.get_runner().submit(
+            self._telegram_send, self.result, on_error=lambda e: None, name="telegram.send", critical=True,
+        )
 
-    def _new_test(self):
-        """Запуск нового теста"""
-        try:
-            self.root.withdraw()
-        except Exception:
-            pass
+    @staticmethod
+    def _telegram_send(result: TestResult):
+        # urllib и http.client нужны только при отправке
+        from services.telegram_service import TelegramService
 
-        def _restart():
-            self._safe_destroy()
-            self.on_restart()
+        telegram_service = TelegramService()
+        if telegram_service.is_configured():
+            telegram_service.send_result(result)
 
-        try:
-            self.root.after(80, _restart)
-        except Exception:
-            _restart()
+    def _new_test(self):
+        """Запуск нового теста"""
+        if self._is_closing:
+            return
+        self._is_closing = True
+        self.on_restart()
 
     def _exit_app(self):
         """Выход из приложения"""
+        if self._save_task is not None:
+            return
         if messagebox.askyesno("Подтверждение", "Вы уверены, что хотите выйти?"):
             try:
                 self.root.quit()
             except Exception:
                 pass
-            self._safe_destroy()
+            try:
+                self.root.destroy()
+            except Exception:
+                pass
+            # Дожидаемся записи результата и отправки в Telegram, иначе os._exit их оборвёт
+            tasks.wait_critical()
+            # os._exit не вызывает atexit — отчёт профилирования пишем сами
+            profiling.write_report()
             # Гарантированно завершаем процесс, чтобы не оставлять фоновые CTk after-сценарии
             os._exit(0)
-
-    def show(self):
-        """Показать окно"""
-        self.root.mainloop()
\ No newline at end of file
@@ -74,6 +74,15 @@ class SettingsWindow:
         self.theme_var = ctk.StringVar(value=self.settings.THEME)
         ctk.CTkOptionMenu(theme_frame, variable=self.theme_var, values=["dark", "light", "system"]).pack(side="right", padx=8, pady=8)
 
+        self.image_cache_var = ctk.StringVar(value=str(self.settings.IMAGE_CACHE_MB))
+        self._entry_row(frame, "Память под картинки (МБ)", "Кэш изображений во время теста; 0 = без кэша (для слабых ПК)", self.image_cache_var)
+
+        self.profile_var = ctk.BooleanVar(value=self.settings.PROFILE)
+        self._switch_row(frame, "Профилирование: отчёт о скорости этапов в папку profiles (со следующего запуска)", self.profile_var)
+
+        self.lag_monitor_var = ctk.BooleanVar(value=self.settings.LAG_MONITOR)
+        self._switch_row(frame, "Монитор зависаний: задержки интерфейса и их причины в результате теста", self.lag_monitor_var)
+
         actions = ctk.CTkFrame(frame)
         actions.pack(fill="x", padx=20, pady=8)
         ctk.CTkButton(actions, text="Выбрать папку сохранения", command=self._pick_dir).pack(side="left", padx=8, pady=8)
@@ -119,6 +128,9 @@ class SettingsWindow:
         self.telegram_on_save_var.set(settings.TELEGRAM_SEND_ON_SAVE)
         self.default_save_var.set("" if settings.DEFAULT_SAVE_DIR is None else str(settings.DEFAULT_SAVE_DIR))
         self.theme_var.set(settings.THEME)
+        self.image_cache_var.set(str(settings.IMAGE_CACHE_MB))
+        self.profile_var.set(settings.PROFILE)
+        self.lag_monitor_var.set(settings.LAG_MONITOR)
 
     def _reset_defaults(self):
         if not messagebox.askyesno("Сброс настроек", "Вернуть настройки по умолчанию?"):
@@ -179,6 +191,10 @@ class SettingsWindow:
                 DEFAULT_SAVE_DIR=save_dir,
                 THEME=self.theme_var.get(),
                 HIDE_BUILTIN_TESTS=self.hide_builtin_tests_var.get(),
+                IMAGE_CACHE_MB=int(self.image_cache_var.get() or 0),
+                PROFILE=self.profile_var.get(),
+                LAG_MONITOR=self.lag_monitor_var.get(),
+                LAST_SELECTION=self.settings.LAST_SELECTION,
             )
 
             normalized = self.settings_manager._normalize(settings.__dict__, AppSettings())
@@ -1,22 +1,58 @@
 import customtkinter as ctk
-from tkinter import messagebox
-from typing import List, Dict, Callable
 import os
+import time
+from tkinter import messagebox
+from typing import List, Dict, Callable, Optional
 
+from core import tasks
+from core.bank_catalog import BankCatalog, get_bank_catalog
+from core.models import Quiz
+from core.search_index import SearchHit, SearchIndex, questions_for_hits
+from core.selection_tree import SelectionNode, SelectionTree
 from ui.ui_config import center_window_adaptive
+from ui.widgets.virtual_list import VirtualList
 
 
 class TestSelectionWindow:
-    """Окно выбора тестов"""
+    """Окно выбора тестов.
+
+    Дерево показывается плоским списком видимых узлов через VirtualList:
+    узлы папки создаются при первом раскрытии, виджеты — только для строк на экране.
+    Выбор хранится в SelectionTree со счётчиками по папкам. Поле поиска
+    переключает тот же список на найденные вопросы, из которых можно
+    сразу собрать экзамен. Рядом с файлами показывается сводка из
+    BankCatalog, каталог обновляется в фоне при открытии окна.
+    """
+
+    PARTIAL_COLOR = ("#9E9E9E", "#6b6b6b")
 
-    def __init__(self, parent, tree_data: Dict, on_selected: Callable[[List[str]], None]):
+    ROW_HEIGHT = 32
+    INDENT = 18
+    SEARCH_DELAY_MS = 250
+
+    def __init__(self, parent, tree_data: Dict, on_selected: Callable[[List[str]], None],
+                 on_questions_selected: Optional[Callable[[List[Quiz]], None]] = None):
         self.parent = parent
         self.tree_data = tree_data
         self.on_selected = on_selected
-        self.selected_files = set()
+        self.on_questions_selected = on_questions_selected
+
+        self.model = SelectionTree(tree_data)
+        self.visible_nodes: List[SelectionNode] = list(self.model.roots)
+
+        # Поиск: None — показывается дерево
+        self.search_hits: Optional[List[SearchHit]] = None
+        self.checked_hits = set()
+        self.search_elapsed_ms = 0.0
+        self._search_index: Optional[SearchIndex] = None
+        self._index_task: Optional[tasks.TaskHandle] = None
+        self._index_requested = False
+        self._search_after_id = None
+        self._closing = False
 
-        self.file_items: Dict[str, Dict] = {}
-        self.folder_items: Dict[str, Dict] = {}
+        self.catalog: Optional[BankCatalog] = None
+        self._catalog_revision = -1
+        self._catalog_task: Optional[tasks.TaskHandle] = None
 
         self.window = ctk.CTkToplevel(parent)
         self._setup_ui()
@@ -25,6 +61,8 @@ class TestSelectionWindow:
         self.window.transient(parent)
         self.window.grab_set()
 
+        self._start_catalog_refresh()
+
     def _setup_ui(self):
         self.window.title("Выбор тестов")
 
@@ -36,12 +74,37 @@ class TestSelectionWindow:
             text="Выберите тесты для загрузки",
             font=ctk.CTkFont(size=18, weight="bold")
         )
-        title_label.pack(pady=(10, 20))
+        title_label.pack(pady=(10, 12))
+
+        search_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        search_frame.pack(fill="x", padx=5, pady=(0, 6))
 
-        self.scrollable_frame = ctk.CTkScrollableFrame(main_frame, height=420)
-        self.scrollable_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        self.search_var = ctk.StringVar()
+        search_entry = ctk.CTkEntry(
+            search_frame,
+            textvariable=self.search_var,
+            placeholder_text="🔍 Поиск по тексту вопросов, вариантам и темам",
+            height=34,
+        )
+        search_entry.pack(side="left", fill="x", expand=True)
+        search_entry.bind("<KeyRelease>", lambda _e: self._schedule_search())
 
-        self._display_tree(self.scrollable_frame, self.tree_data)
+        self.search_exam_btn = ctk.CTkButton(
+            search_frame, text="Экзамен по найденному", command=self._start_search_exam, width=190, height=34, fg_color="#4CAF50"
+        )
+
+        self.search_status = ctk.CTkLabel(main_frame, text="", font=ctk.CTkFont(size=12), text_color=("#5f5f5f", "#b5b5b5"))
+        self.search_status.pack(anchor="w", padx=8)
+
+        self.tree_list = VirtualList(
+            main_frame,
+            row_height=self.ROW_HEIGHT,
+            create_row=self._create_row,
+            bind_row=self._bind_row,
+            count=len(self.visible_nodes),
+            height=420,
+        )
+        self.tree_list.pack(fill="both", expand=True, padx=5, pady=5)
 
         button_frame = ctk.CTkFrame(main_frame)
         button_frame.pack(fill="x", pady=15, padx=20)
@@ -52,145 +115,333 @@ class TestSelectionWindow:
         ctk.CTkButton(button_frame, text="Загрузить выбранные", command=self._load_selected, width=170, height=35, fg_color="#4CAF50").pack(side="right", padx=5)
         ctk.CTkButton(button_frame, text="Отмена", command=self.window.destroy, width=120, height=35, fg_color="#9E9E9E").pack(side="right", padx=5)
 
-    def _display_tree(self, parent_frame, node, path="", depth=0):
-        for key, value in node.items():
-            is_folder = isinstance(value, dict)
-            item_path = os.path.join(path, key) if path else key
-
-            item_holder = ctk.CTkFrame(parent_frame, fg_color="transparent")
-            item_holder.pack(fill="x", padx=(depth * 18, 0), pady=1, anchor="w")
-
-            row = ctk.CTkFrame(item_holder, fg_color="transparent")
-            row.pack(fill="x", anchor="w")
-
-            if is_folder:
-                folder_var = ctk.BooleanVar(value=False)
-
-                toggle_btn = ctk.CTkButton(
-                    row,
-                    text="▶",
-                    width=26,
-                    height=26,
-                    corner_radius=6,
-                    fg_color="transparent",
-                    text_color=("#404040", "#c8c8c8"),
-                    hover_color=("#e8e8e8", "#2f2f2f"),
-                )
-                toggle_btn.pack(side="left", padx=(0, 4))
-
-                checkbox = ctk.CTkCheckBox(
-                    row,
-                    text=f"📁 {key}",
-                    variable=folder_var,
-                    command=lambda fp=item_path, v=folder_var: self._on_folder_toggle(fp, v.get()),
-                    font=ctk.CTkFont(size=14),
-                )
-                checkbox.pack(anchor="w", side="left")
-
-                children_container = ctk.CTkFrame(item_holder, fg_color="transparent")
-                # По умолчанию папки свернуты
-                expanded = False
-
-                self.folder_items[item_path] = {
-                    "var": folder_var,
-                    "toggle_btn": toggle_btn,
-                    "children_container": children_container,
-                    "expanded": expanded,
-                }
-
-                toggle_btn.configure(command=lambda fp=item_path: self._toggle_folder(fp))
-
-                self._display_tree(children_container, value, item_path, depth + 1)
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
+
+    def _visible_subtree(self, node: SelectionNode) -> List[SelectionNode]:
+        """Потомки, которые видны при раскрытом node (с учётом раскрытых подпапок)."""
+        result = []
+        stack = list(reversed(self.model.children(node)))
+        while stack:
+            child = stack.pop()
+            result.append(child)
+            if child.is_folder and child.expanded:
+                stack.extend(reversed(self.model.children(child)))
+        return result
+
+    # --- строки списка ---
+
+    def _create_row(self, parent):
+        row = ctk.CTkFrame(parent, fg_color="transparent", corner_radius=0)
+        row.node = None
+        row.index = -1
+        row.var = ctk.BooleanVar(value=False)
+
+        row.indent = ctk.CTkFrame(row, width=1, height=1, fg_color="transparent")
+        row.indent.pack(side="left")
+
+        row.toggle_btn = ctk.CTkButton(
+            row,
+            text="▶",
+            width=26,
+            height=26,
+            corner_radius=6,
+            fg_color="transparent",
+            text_color=("#404040", "#c8c8c8"),
+            hover_color=("#e8e8e8", "#2f2f2f"),
+            command=lambda r=row: self._toggle_folder(r.index),
+        )
+        row.toggle_btn.pack(side="left", padx=(0, 4))
+
+        row.checkbox = ctk.CTkCheckBox(
+            row,
+            text="",
+            variable=row.var,
+            command=lambda r=row: self._on_row_checked(r),
+            font=ctk.CTkFont(size=14),
+        )
+        row.checkbox.pack(anchor="w", side="left")
+        row.default_fg = row.checkbox.cget("fg_color")
+        return row
+
+    def _bind_row(self, row, index: int):
+        if self.search_hits is not None:
+            self._bind_hit_row(row, index)
+            return
+
+        node = self.visible_nodes[index]
+        row.node = node
+        row.index = index
+        row.indent.configure(width=max(1, node.depth * self.INDENT))
+
+        if node.is_folder:
+            if not row.toggle_btn.winfo_manager():
+                row.toggle_btn.pack(side="left", padx=(0, 4), before=row.checkbox)
+            row.toggle_btn.configure(text="▼" if node.expanded else "▶")
+            selected, total = self.model.counts(node)
+            state = self.model.state(node)
+            counter = f"  ({selected}/{total})" if selected else ""
+            # Частичный выбор: отмечено приглушённым цветом
+            row.checkbox.configure(
+                text=f"📁 {node.name}{counter}",
+                fg_color=self.PARTIAL_COLOR if state == SelectionTree.STATE_PARTIAL else row.default_fg,
+            )
+            row.var.set(state != SelectionTree.STATE_NONE)
+        else:
+            row.toggle_btn.pack_forget()
+            info = self.catalog.get(node.path) if self.catalog is not None else None
+            summary = f"   ·  {info.summary()}" if info is not None else ""
+            row.checkbox.configure(text=f"📄 {node.name}{summary}", fg_color=row.default_fg)
+            row.var.set(self.model.state(node) == SelectionTree.STATE_ALL)
+
+    def _bind_hit_row(self, row, index: int):
+        hit = self.search_hits[index]
+        row.node = None
+        row.index = index
+        row.indent.configure(width=1)
+        row.toggle_btn.pack_forget()
+        row.checkbox.configure(
+            text=f"📄 {os.path.basename(hit.path)} · №{hit.question_index + 1}: {hit.snippet}",
+            fg_color=row.default_fg,
+        )
+        row.var.set(index in self.checked_hits)
+
+    def _on_row_checked(self, row):
+        if self.search_hits is not None:
+            if row.var.get():
+                self.checked_hits.add(row.index)
             else:
-                file_var = ctk.BooleanVar(value=False)
-                checkbox = ctk.CTkCheckBox(
-                    row,
-                    text=f"📄 {key}",
-                    variable=file_var,
-                    command=lambda fid=item_path, p=value, v=file_var: self._on_file_toggle(fid, p, v.get()),
-                    font=ctk.CTkFont(size=14),
-                )
-                checkbox.pack(anchor="w", side="left")
-
-                self.file_items[item_path] = {"var": file_var, "path": value}
-
-    def _toggle_folder(self, folder_path: str):
-        item = self.folder_items.get(folder_path)
-        if not item:
-            return
-
-        item["expanded"] = not item["expanded"]
-        if item["expanded"]:
-            item["toggle_btn"].configure(text="▼")
-            item["children_container"].pack(fill="x", padx=0, pady=(2, 0), anchor="w")
+                self.checked_hits.discard(row.index)
+            self._update_search_status()
+            return
+
+        node = row.node
+        if node is None:
+            return
+        if node.is_folder and self.model.state(node) == SelectionTree.STATE_PARTIAL:
+            # Клик по частично выбранной папке выбирает её целиком
+            self.model.set_selected(node, True)
+        else:
+            self.model.set_selected(node, row.var.get())
+        self.tree_list.refresh()
+        self._update_selection_status()
+
+    # --- раскрытие ---
+
+    def _toggle_folder(self, index: int):
+        if not 0 <= index < len(self.visible_nodes):
+            return
+        node = self.visible_nodes[index]
+        if not node.is_folder:
+            return
+
+        if node.expanded:
+            end = index + 1
+            while end < len(self.visible_nodes) and self.visible_nodes[end].depth > node.depth:
+                end += 1
+            del self.visible_nodes[index + 1:end]
+            node.expanded = False
         else:
-            item["toggle_btn"].configure(text="▶")
-            item["children_container"].pack_forget()
+            node.expanded = True
+            self.visible_nodes[index + 1:index + 1] = self._visible_subtree(node)
+
+        self._show_current_list()
 
     def _expand_all(self):
-        for folder_path in self.folder_items.keys():
-            item = self.folder_items[folder_path]
-            if not item["expanded"]:
-                self._toggle_folder(folder_path)
+        stack = list(self.model.roots)
+        while stack:
+            node = stack.pop()
+            if node.is_folder:
+                node.expanded = True
+                stack.extend(self.model.children(node))
+        self._rebuild_visible()
 
     def _collapse_all(self):
-        for folder_path in self.folder_items.keys():
-            item = self.folder_items[folder_path]
-            if item["expanded"]:
-                self._toggle_folder(folder_path)
-
-    def _on_folder_toggle(self, folder_name: str, selected: bool):
-        prefix = f"{folder_name}{os.sep}"
-        for file_id, item in self.file_items.items():
-            if file_id.startswith(prefix):
-                item["var"].set(selected)
-                if selected:
-                    self.selected_files.add(item["path"])
-                else:
-                    self.selected_files.discard(item["path"])
-
-        self._update_all_folder_states()
-
-    def _on_file_toggle(self, file_id: str, file_path: str, selected: bool):
-        if selected:
-            self.selected_files.add(file_path)
+        stack = list(self.model.roots)
+        while stack:
+            node = stack.pop()
+            if node.is_folder:
+                node.expanded = False
+                stack.extend(self.model.loaded_children(node))
+        self._rebuild_visible()
+
+    def _rebuild_visible(self):
+        visible = []
+        stack = list(reversed(self.model.roots))
+        while stack:
+            node = stack.pop()
+            visible.append(node)
+            if node.is_folder and node.expanded:
+                stack.extend(reversed(self.model.children(node)))
+        self.visible_nodes = visible
+        self._show_current_list()
+
+    def _show_current_list(self):
+        if self.search_hits is not None:
+            self.tree_list.set_count(len(self.search_hits))
         else:
-            self.selected_files.discard(file_path)
+            self.tree_list.set_count(len(self.visible_nodes))
+
+    def _select_all(self):
+        self.model.select_all()
+        self.tree_list.refresh()
+        self._update_selection_status()
+
+    # --- каталог банков ---
+
+    def _start_catalog_refresh(self):
+        self._catalog_task = tasks.get_runner().submit(
+            self._refresh_catalog, on_done=lambda _r: self._on_catalog_changed(), on_error=self._on_catalog_failed, name="catalog.refresh"
+        )
+
+    def _refresh_catalog(self):
+        runner = tasks.get_runner()
+        self.catalog = get_bank_catalog()
+        # Список обновляется по ходу разбора: вызовы склеиваются, пока окно не успело перерисоваться
+        self.catalog.refresh(
+            SelectionTree.collect_files(self.tree_data), should_stop=lambda: self._closing, prune=False,
+            on_parsed=lambda *_args: runner.call_soon(self._on_catalog_changed, key=("catalog", id(self))),
+        )
+        self.catalog.save()
+
+    def _on_catalog_changed(self):
+        if self._closing:
+            return
+        if self.catalog is not None and self.catalog.revision != self._catalog_revision:
+            self._catalog_revision = self.catalog.revision
+            self.model.set_question_counts(self.catalog.question_count)
+            if self.search_hits is None:
+                self.tree_list.refresh()
+            self._update_selection_status()
+
+    @staticmethod
+    def _on_catalog_failed(error: BaseException):
+        print(f"Каталог банков не обновлён: {error}")
+
+    def _update_selection_status(self):
+        """Оценка размера выбора по каталогу: счётчики дерева, без обхода выбранных файлов."""
+        if self.search_hits is not None:
+            return
+        if not self.model.selected_count:
+            self.search_status.configure(text="")
+            return
+        text = f"Выбрано файлов: {self.model.selected_count}"
+        if self._catalog_revision >= 0:  # оценки в дереве уже взяты из каталога
+            total, unknown = self.model.selected_questions
+            text += f" · вопросов: {'≈' if unknown else ''}{total}"
+            if unknown:
+                text += f" (ещё {unknown} файлов не в каталоге)"
+        self.search_status.configure(text=text)
+
+    # --- поиск ---
+
+    def _schedule_search(self):
+        if self._search_after_id is not None:
+            self.window.after_cancel(self._search_after_id)
+        self._search_after_id = self.window.after(self.SEARCH_DELAY_MS, self._run_search)
+
+    def _ensure_index(self) -> bool:
+        """True, если индекс готов; иначе запускает фоновое обновление."""
+        if not self._index_requested:
+            self._index_requested = True
+            self._index_task = tasks.get_runner().submit(
+                self._build_index, on_done=self._on_index_ready, on_error=self._on_index_failed, name="search.update"
+            )
+        return self._search_index is not None
+
+    def _build_index(self) -> SearchIndex:
+        index = SearchIndex()
+        # Окно видит только часть банков (например, без встроенных) — остальные записи индекса не трогаем
+        index.update(SelectionTree.collect_files(self.tree_data), should_stop=lambda: self._closing, prune=False)
+        index.save()
+        return index
+
+    def _on_index_ready(self, index: SearchIndex):
+        if self._closing:
+            return
+        self._search_index = index
+        if self._index_task is not None and self.search_var.get().strip():
+            self._run_search()
+
+    def _on_index_failed(self, error: BaseException):
+        if not self._closing:
+            self.search_status.configure(text=f"Поиск недоступен: {error}")
+
+    def _run_search(self):
+        self._search_after_id = None
+        query = self.search_var.get().strip()
+        if not query:
+            self.search_hits = None
+            self.checked_hits.clear()
+            self.search_exam_btn.pack_forget()
+            self.search_status.configure(text="")
+            self._show_current_list()
+            self._update_selection_status()
+            return
 
-        self._update_parent_folder_states(file_id)
+        if not self._ensure_index() or self._search_index is None:
+            self.search_status.configure(text="Индексация банков…")
+            return
+
+        started = time.perf_counter()
+        # В индексе есть и банки, которых нет в этом окне
+        self.search_hits = self._search_index.search(query, paths=set(SelectionTree.collect_files(self.tree_data)))
+        self.search_elapsed_ms = (time.perf_counter() - started) * 1000
+        self.checked_hits = set(range(len(self.search_hits)))
+        if self.on_questions_selected and self.search_hits:
+            if not self.search_exam_btn.winfo_manager():
+                self.search_exam_btn.pack(side="right", padx=(8, 0))
+        else:
+            self.search_exam_btn.pack_forget()
+        self._update_search_status()
+        self.tree_list.offset = 0
+        self._show_current_list()
 
-    def _update_parent_folder_states(self, file_id: str):
-        parent = os.path.dirname(file_id)
-        while parent:
-            self._recompute_folder_state(parent)
-            parent = os.path.dirname(parent)
+    def _update_search_status(self):
+        if self.search_hits is None:
+            return
+        self.search_status.configure(
+            text=f"Найдено вопросов: {len(self.search_hits)} за {self.search_elapsed_ms:.0f} мс, отмечено: {len(self.checked_hits)}"
+        )
 
-    def _update_all_folder_states(self):
-        for folder_path in sorted(self.folder_items.keys(), key=lambda x: x.count(os.sep), reverse=True):
-            self._recompute_folder_state(folder_path)
+    def _start_search_exam(self):
+        if not self.search_hits or not self.on_questions_selected:
+            return
+        hits = [self.search_hits[i] for i in sorted(self.checked_hits)]
+        if not hits:
+            messagebox.showwarning("Внимание", "Отметьте хотя бы один найденный вопрос!")
+            return
 
-    def _recompute_folder_state(self, folder_path: str):
-        prefix = f"{folder_path}{os.sep}"
-        children = [item for fid, item in self.file_items.items() if fid.startswith(prefix)]
-        if not children:
+        questions, failed = questions_for_hits(hits)
+        if failed:
+            messagebox.showwarning("Внимание", "Не удалось прочитать:\n" + "\n".join(failed))
+        if not questions:
             return
 
-        all_selected = all(item["var"].get() for item in children)
-        self.folder_items[folder_path]["var"].set(all_selected)
+        quiz = Quiz(name=f"Поиск: {self.search_var.get().strip()}", questions=questions)
+        self.window.destroy()
+        self.on_questions_selected([quiz])
 
-    def _select_all(self):
-        for item in self.file_items.values():
-            item['var'].set(True)
-            self.selected_files.add(item['path'])
-        self._update_all_folder_states()
+    def _on_destroy(self, event):
+        if event.widget is not self.window:
+            return
+        self._closing = True
+        if self._search_after_id is not None:
+            try:
+                self.window.after_cancel(self._search_after_id)
+            except Exception:
+                pass
+        for task in (self._index_task, self._catalog_task):
+            if task is not None:
+                task.cancel()
 
     def _load_selected(self):
-        if not self.selected_files:
+        if not self.model.selected_count:
             messagebox.showwarning("Внимание", "Выберите хотя бы один тест!")
             return
 
+        selected = self.model.selected_paths()
         self.window.destroy()
-        self.on_selected(list(self.selected_files))
+        self.on_selected(selected)
 
     def _center_window(self, width: int, height: int):
         center_window_adaptive(self.window, width, height)
@@ -1,10 +1,270 @@
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import customtkinter as ctk
 
+from ui.widgets.virtual_list import VirtualList
+
+
+def _normalize(text: str) -> str:
+    return text.lower().replace("ё", "е")
+
+
+def _wrapped_line_count(text: str, font, width: int) -> int:
+    """Сколько строк займёт text при переносе по словам в ширину width (как wraplength у Tk)."""
+    lines = 0
+    for paragraph in text.split("\n"):
+        lines += 1
+        current = ""
+        for word in paragraph.split():
+            candidate = f"{current} {word}" if current else word
+            if current and font.measure(candidate) > width:
+                lines += 1
+                current = word
+            else:
+                current = candidate
+            # Слово длиннее строки Tk режет посимвольно
+            while font.measure(current) > width and len(current) > 1:
+                lines += 1
+                current = current[max(1, len(current) * width // max(1, font.measure(current))):]
+    return max(1, lines)
+
+
+class _DropdownPopup:
+    """Одно всплывающее окно списка на верхнее окно, общее для всех CustomDropdown в нём.
+
+    Окно создаётся при первом открытии и дальше только прячется и
+    показывается; строки списка переиспользуются через VirtualList.
+    Набранный с клавиатуры текст фильтрует варианты, ↑/↓ и Enter выбирают.
+    """
+
+    ROW_HEIGHT = 56  # минимальная высота строки; длинные варианты получают выше
+    ROW_PADDING = 20  # отступы метки и рамки строки вокруг текста
+    MAX_CACHED_HEIGHTS = 2000
+    MIN_HEIGHT = 140
+    MAX_HEIGHT = 400
+    FILTER_HEIGHT = 34
+    ACTIVE_COLOR = ("#dcdcdc", "#3a3a3a")
+    FOCUS_CHECK_MS = 60
+
+    _instances: Dict[str, "_DropdownPopup"] = {}
+
+    @classmethod
+    def for_widget(cls, widget) -> "_DropdownPopup":
+        toplevel = widget.winfo_toplevel()
+        key = str(toplevel)
+        popup = cls._instances.get(key)
+        if popup is None or not popup.exists():
+            popup = cls(toplevel)
+            cls._instances[key] = popup
+        return popup
+
+    def __init__(self, master):
+        self.owner: Optional["CustomDropdown"] = None
+        self.options: List[str] = []
+        self.filtered: List[str] = []
+        self.active = 0
+        self.width = 360
+        self._focus_check_id = None
+        self._heights: Dict[tuple, int] = {}  # (текст, ширина переноса, шрифт) → высота строки
+
+        self.window = ctk.CTkToplevel(master)
+        self.window.withdraw()
+        self.window.overrideredirect(True)
+        self.window.attributes("-topmost", True)
+
+        container = ctk.CTkFrame(self.window, corner_radius=10)
+        container.pack(fill="both", expand=True, padx=1, pady=1)
+
+        self.filter_var = ctk.StringVar()
+        self.filter_entry = ctk.CTkEntry(
+            container,
+            textvariable=self.filter_var,
+            placeholder_text="Начните вводить для поиска…",
+            height=self.FILTER_HEIGHT,
+        )
+        self.filter_entry.pack(fill="x", padx=6, pady=(6, 2))
+        self.filter_var.trace_add("write", lambda *_: self._apply_filter())
+
+        self.list = VirtualList(
+            container,
+            row_height=self.ROW_HEIGHT,
+            create_row=self._create_row,
+            bind_row=self._bind_row,
+            measure_row=lambda index: self._row_height(self.filtered[index]),
+        )
+        self.list.pack(fill="both", expand=True, padx=6, pady=(2, 6))
+
+        self.filter_entry.bind("<Down>", lambda _e: self._move(1))
+        self.filter_entry.bind("<Up>", lambda _e: self._move(-1))
+        self.filter_entry.bind("<Next>", lambda _e: self._move(self._page()))
+        self.filter_entry.bind("<Prior>", lambda _e: self._move(-self._page()))
+        self.filter_entry.bind("<Return>", lambda _e: self._choose_active())
+        self.filter_entry.bind("<Escape>", lambda _e: self.close())
+        # Закрываемся, когда фокус ушёл за пределы списка (проверка отложена: фокус мог уйти внутрь)
+        self.window.bind("<FocusOut>", lambda _e: self._schedule_focus_check(), add="+")
+
+    def exists(self) -> bool:
+        try:
+            return bool(self.window.winfo_exists())
+        except Exception:
+            return False
+
+    # --- строки ---
+
+    def _create_row(self, parent):
+        row = ctk.CTkFrame(parent, corner_radius=8, fg_color="transparent")
+        row.index = -1
+        row.wrap = 0
+        row.font = None
+        row.label = ctk.CTkLabel(row, text="", justify="left", anchor="w", padx=8, pady=4)
+        row.label.pack(fill="both", expand=True, padx=2, pady=2)
+        row.bind("<Button-1>", lambda _e, r=row: self._choose(r.index))
+        row.label.bind("<Button-1>", lambda _e, r=row: self._choose(r.index))
+        return row
+
+    def _wrap_width(self) -> int:
+        return self.width - 44
+
+    def _height_key(self, option: str):
+        font = self.owner.font if self.owner is not None else None
+        return None if font is None else (option, self._wrap_width(), str(font))
+
+    def _known_heights(self, options: List[str]) -> List[int]:
+        """Высоты из кэша, без измерения; неизмеренная строка пока считается минимальной."""
+        font = self.owner.font if self.owner is not None else None
+        if font is None:
+            return [self.ROW_HEIGHT] * len(options)
+        wrap, font_key = self._wrap_width(), str(font)
+        return [self._heights.get((option, wrap, font_key), self.ROW_HEIGHT) for option in options]
+
+    def _row_height(self, option: str) -> int:
+        key = self._height_key(option)
+        if key is None:
+            return self.ROW_HEIGHT
+        font, wrap = self.owner.font, key[1]
+        height = self._heights.get(key)
+        if height is None:
+            if len(self._heights) > self.MAX_CACHED_HEIGHTS:
+                self._heights.clear()  # варианты прошлых вопросов
+            lines = _wrapped_line_count(option, font, wrap)
+            height = max(self.ROW_HEIGHT, lines * font.metrics("linespace") + self.ROW_PADDING)
+            self._heights[key] = height
+        return height
+
+    def _bind_row(self, row, index: int):
+        row.index = index
+        option = self.filtered[index]
+        wrap = self._wrap_width()
+        if row.wrap != wrap:
+            row.wrap = wrap
+            row.label.configure(wraplength=wrap)
+        font = self.owner.font if self.owner is not None else None
+        if font is not None and row.font is not font:
+            row.font = font
+            row.label.configure(font=font)
+        row.label.configure(text=option)
+        selected = self.owner is not None and option == self.owner.selected_value
+        row.configure(fg_color=self.ACTIVE_COLOR if index == self.active or selected else "transparent")
+
+    # --- открытие и закрытие ---
+
+    def open(self, owner: "CustomDropdown"):
+        if self.owner is not None and self.owner is not owner:
+            self.owner.dropdown_open = False
+            self.owner.dropdown_window = None
+        self.owner = owner
+        self.options = list(owner.options)
+        self.width = max(owner.button.winfo_width(), 360)
+
+        self.filter_var.set("")  # вызывает _apply_filter
+        if owner.selected_value in self.filtered:
+            self.active = self.filtered.index(owner.selected_value)
+
+        # Высота окна — по первым вариантам, пока не наберётся MAX_HEIGHT: измерять весь список незачем
+        rows_height = 0
+        for option in self.options:
+            if rows_height >= self.MAX_HEIGHT:
+                break
+            rows_height += self._row_height(option)
+        height = min(self.MAX_HEIGHT, max(self.MIN_HEIGHT, rows_height + self.FILTER_HEIGHT + 24))
+        x, y = owner._calculate_geometry(self.width, height)
+        self.window.geometry(f"{self.width}x{height}+{x}+{y}")
+        self.window.deiconify()
+        self.window.lift()
+        self.window.update_idletasks()
+        self.list.scroll_to(self.active)
+        self.filter_entry.focus_force()
+
+    def close(self):
+        self._cancel_focus_check()
+        if self.owner is not None:
+            self.owner.dropdown_open = False
+            self.owner.dropdown_window = None
+            self.owner = None
+        if self.exists():
+            self.window.withdraw()
+
+    def _schedule_focus_check(self):
+        self._cancel_focus_check()
+        self._focus_check_id = self.window.after(self.FOCUS_CHECK_MS, self._check_focus)
+
+    def _cancel_focus_check(self):
+        if self._focus_check_id is not None:
+            try:
+                self.window.after_cancel(self._focus_check_id)
+            except Exception:
+                pass
+            self._focus_check_id = None
+
+    def _check_focus(self):
+        self._focus_check_id = None
+        try:
+            focused = self.window.focus_get()
+        except Exception:
+            focused = None
+        if focused is None or focused.winfo_toplevel() is not self.window:
+            self.close()
+
+    # --- фильтр и выбор ---
+
+    def _apply_filter(self):
+        query = _normalize(self.filter_var.get().strip())
+        self.filtered = [o for o in self.options if query in _normalize(o)] if query else list(self.options)
+        self.active = 0
+        self.list.offset = 0
+        # Длинный вариант переносится на несколько строк; точная высота по тексту
+        # измеряется, только когда строка видна (measure_row), остальные — из кэша или минимальные
+        self.list.set_count(len(self.filtered), self._known_heights(self.filtered))
+
+    def _page(self) -> int:
+        first, last = self.list.visible_range()
+        return max(1, last - first - 1)
+
+    def _move(self, step: int):
+        if not self.filtered:
+            return "break"
+        self.active = max(0, min(len(self.filtered) - 1, self.active + step))
+        self.list.scroll_to(self.active)
+        return "break"
+
+    def _choose_active(self):
+        self._choose(self.active)
+        return "break"
+
+    def _choose(self, index: int):
+        if self.owner is None or not 0 <= index < len(self.filtered):
+            return
+        owner, option = self.owner, self.filtered[index]
+        self.close()
+        owner.select_option(option)
+
 
 class CustomDropdown(ctk.CTkFrame):
-    """Стабильный кастомный выпадающий список с поддержкой длинных значений."""
+    """Стабильный кастомный выпадающий список с поддержкой длинных значений.
+
+    Всплывающий список общий для всех экземпляров в окне (_DropdownPopup):
+    открытие не создаёт новых окон и виджетов.
+    """
 
     def __init__(
         self,
@@ -69,59 +329,17 @@ class CustomDropdown(ctk.CTkFrame):
         if self.dropdown_open or not self.options:
             return
 
-        self.dropdown_open = True
         self.update_idletasks()
-
-        self.dropdown_window = ctk.CTkToplevel(self)
-        self.dropdown_window.overrideredirect(True)
-        self.dropdown_window.attributes("-topmost", True)
-
-        width = max(self.button.winfo_width(), 360)
-        max_height = min(360, max(140, len(self.options) * 56 + 12))
-        x, y = self._calculate_geometry(width, max_height)
-        self.dropdown_window.geometry(f"{width}x{max_height}+{x}+{y}")
-
-        container = ctk.CTkFrame(self.dropdown_window, corner_radius=10)
-        container.pack(fill="both", expand=True, padx=1, pady=1)
-
-        scrollable = ctk.CTkScrollableFrame(container, corner_radius=8)
-        scrollable.pack(fill="both", expand=True, padx=6, pady=6)
-
-        for option in self.options:
-            selected = option == self.selected_value
-            row = ctk.CTkFrame(
-                scrollable,
-                corner_radius=8,
-                fg_color=("#dcdcdc", "#3a3a3a") if selected else "transparent",
-            )
-            row.pack(fill="x", padx=2, pady=2)
-
-            label = ctk.CTkLabel(
-                row,
-                text=option,
-                justify="left",
-                anchor="w",
-                wraplength=width - 44,
-                font=self.font,
-                padx=8,
-                pady=8,
-            )
-            label.pack(fill="x")
-
-            row.bind("<Button-1>", lambda _e, opt=option: self.select_option(opt))
-            label.bind("<Button-1>", lambda _e, opt=option: self.select_option(opt))
-
-        self.dropdown_window.bind("<Escape>", lambda _e: self.close_dropdown())
-        # закрываем только при клике вне (оставляем FocusOut как fallback)
-        self.dropdown_window.bind("<FocusOut>", lambda _e: self.close_dropdown())
-        self.dropdown_window.focus_force()
+        popup = _DropdownPopup.for_widget(self)
+        self.dropdown_open = True
+        self.dropdown_window = popup.window
+        popup.open(self)
 
     def close_dropdown(self):
-        if self.dropdown_window and self.dropdown_open:
-            try:
-                self.dropdown_window.destroy()
-            except Exception:
-                pass
+        if self.dropdown_open:
+            popup = _DropdownPopup.for_widget(self)
+            if popup.owner is self:
+                popup.close()
         self.dropdown_window = None
         self.dropdown_open = False
 
@@ -143,3 +361,11 @@ class CustomDropdown(ctk.CTkFrame):
     def clear(self):
         self.selected_value = ""
         self.button.configure(text=self.placeholder)
+
+    def destroy(self):
+        # Общий список не должен остаться открытым для удалённого владельца
+        try:
+            self.close_dropdown()
+        except Exception:
+            pass
+        super().destroy()
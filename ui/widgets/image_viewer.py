@@ -1,7 +1,11 @@
 import customtkinter as ctk
-from PIL import Image, ImageTk
-import os
-from typing import Optional, Tuple
+from PIL import ImageTk
+from typing import Callable, Optional
+
+from core.image_loader import load_thumbnail
+from core.image_pyramid import ImagePyramid
+from core.thumbnail_cache import get_thumbnail_cache
+from ui.widgets.zoom_viewer import ZoomImageView
 
 class ImageViewer(ctk.CTkFrame):
     """Виджет для отображения изображений"""
@@ -12,6 +16,7 @@ class ImageViewer(ctk.CTkFrame):
                  description: str = "",
                  max_width: int = 200,
                  max_height: int = 150,
+                 on_open: Optional[Callable[[str, str], None]] = None,
                  **kwargs):
         super().__init__(master, **kwargs)
 
@@ -19,8 +24,8 @@ class ImageViewer(ctk.CTkFrame):
         self.description = description
         self.max_width = max_width
         self.max_height = max_height
+        self.on_open = on_open
         self.thumbnail = None
-        self.full_image = None
 
         self._setup_ui()
 
@@ -30,11 +35,10 @@ class ImageViewer(ctk.CTkFrame):
 
         # Загрузка и обработка изображения
         try:
-            image = Image.open(self.image_path)
-            self.full_image = image
-
-            # Создание миниатюры
-            image.thumbnail((self.max_width, self.max_height), Image.Resampling.LANCZOS)
+            # Миниатюра из дискового кэша; полный размер грузится только по запросу
+            image = load_thumbnail(self.image_path, self.max_width, self.max_height, get_thumbnail_cache())
+            if image is None:
+                raise ValueError(self.image_path)
             self.thumbnail = ImageTk.PhotoImage(image)
 
             # Отображение миниатюры
@@ -72,6 +76,8 @@ class ImageViewer(ctk.CTkFrame):
         if hasattr(self, 'image_label'):
             self.image_label.bind("<Enter>", self._on_enter)
             self.image_label.bind("<Leave>", self._on_leave)
+            if self.thumbnail is not None:
+                self.image_label.bind("<Button-1>", self.show_full_size)
 
     def _on_enter(self, event):
         """При наведении курсора"""
@@ -81,34 +87,41 @@ class ImageViewer(ctk.CTkFrame):
         """При уходе курсора"""
         self.configure(cursor="")
 
-    def show_full_size(self):
-        """Показать изображение в полном размере"""
-        if self.full_image:
-            # Создаем окно для просмотра
-            viewer = ImageViewerWindow(self.full_image, self.description)
-            viewer.show()
+    def show_full_size(self, _event=None):
+        """Показать изображение с зумом: в overlay владельца, если он задан, иначе в отдельном окне"""
+        if self.on_open is not None:
+            self.on_open(self.image_path, self.description)
+            return
+        try:
+            pyramid = ImagePyramid(self.image_path)
+        except Exception:
+            return
+        # Без вложенного mainloop: окно живёт в цикле основного окна
+        ImageViewerWindow(self, pyramid, self.description)
+
 
 class ImageViewerWindow:
-    def __init__(self, image: Image.Image, title: str = ""):
-        self.image = image
+    def __init__(self, master, pyramid: ImagePyramid, title: str = ""):
+        self.pyramid = pyramid
         self.title = title
 
-        self.window = ctk.CTkToplevel()
+        self.window = ctk.CTkToplevel(master)
         self.window.title(title or "Просмотр изображения")
 
         self._setup_ui()
 
     def _setup_ui(self):
         """Настройка интерфейса окна просмотра"""
-        self.window.geometry(f"{self.image.width}x{self.image.height}")
-
-        # Конвертируем изображение для tkinter
-        tk_image = ImageTk.PhotoImage(self.image)
+        # Не больше экрана: оригинал 4000×3000 всё равно не поместится
+        max_w = int(self.window.winfo_screenwidth() * 0.9)
+        max_h = int(self.window.winfo_screenheight() * 0.85) - 50
+        zoom = min(1.0, self.pyramid.fit_zoom(max_w, max_h))
+        width = max(320, int(self.pyramid.width * zoom))
+        height = max(240, int(self.pyramid.height * zoom))
+        self.window.geometry(f"{width}x{height + 50}")
 
-        # Отображаем изображение
-        label = ctk.CTkLabel(self.window, image=tk_image, text="")
-        label.image = tk_image  # Сохраняем ссылку
-        label.pack(fill="both", expand=True)
+        view = ZoomImageView(self.window, self.pyramid, width=width, height=height)
+        view.pack(fill="both", expand=True)
 
         # Кнопка закрытия
         close_btn = ctk.CTkButton(
@@ -125,4 +138,5 @@ class ImageViewerWindow:
 
     def show(self):
         """Показать окно"""
-        self.window.mainloop()
\ No newline at end of file
+        self.window.lift()
+        self.window.focus_force()
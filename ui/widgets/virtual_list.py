@@ -0,0 +1,227 @@
+import bisect
+import math
+import sys
+import tkinter as tk
+from typing import Callable, List, Optional, Sequence
+
+import customtkinter as ctk
+
+
+class VirtualList(ctk.CTkFrame):
+    """Прокручиваемый список с переиспользованием виджетов строк.
+
+    Виджеты создаются только для строк, помещающихся в окно (плюс одна),
+    при прокрутке те же строки перезаполняются данными других элементов.
+    Поэтому стоимость показа не зависит от длины списка.
+
+    create_row(parent) строит пустую строку, bind_row(row, index) заполняет
+    её данными элемента index. Высота строки — row_height, либо своя для
+    каждого элемента через set_count(count, row_heights) (не меньше row_height).
+    Если высоты заранее известны лишь приблизительно, measure_row(index)
+    уточняет их при первом показе строки — измеряются только видимые.
+    """
+
+    def __init__(
+        self,
+        master,
+        row_height: int,
+        create_row: Callable[[tk.Misc], tk.Misc],
+        bind_row: Callable[[tk.Misc, int], None],
+        count: int = 0,
+        measure_row: Optional[Callable[[int], int]] = None,
+        **kwargs,
+    ):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.measure_row = measure_row
+        self.count = count
+        self.offset = 0  # в пикселях экрана
+        self._heights: Optional[List[int]] = None  # высоты строк без масштабирования
+        self._tops: List[int] = [0]  # начало каждой строки в пикселях экрана, последний — общая высота
+        self._tops_scaling: Optional[float] = None
+        self._measured: List[bool] = []  # высота строки уже уточнена через measure_row
+
+        self.body = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self._rows: List[tk.Misc] = []
+
+        # Колесо ловится собственным bindtag: CTk-виджеты сами пробрасывают bind() во вложенные,
+        # и обычная привязка на каждый виджет строки срабатывала бы по нескольку раз
+        self._wheel_tag = f"VirtualListWheel{id(self)}"
+        self.bind_class(self._wheel_tag, "<MouseWheel>", self._on_wheel)
+        self.bind_class(self._wheel_tag, "<Button-4>", lambda _e: self.scroll_units(-3))
+        self.bind_class(self._wheel_tag, "<Button-5>", lambda _e: self.scroll_units(3))
+
+        self.body.bind("<Configure>", lambda _e: self.refresh())
+        self._add_wheel_tag(self.body)
+
+    # --- публичное API ---
+
+    def set_count(self, count: int, row_heights: Optional[Sequence[int]] = None):
+        """Новое число элементов; row_heights — высоты строк, если они разные."""
+        self.count = count
+        self._heights = [max(self.row_height, h) for h in row_heights] if row_heights is not None else None
+        self._measured = [False] * count if self._heights is not None and self.measure_row is not None else []
+        self._tops_scaling = None
+        self.offset = min(self.offset, self._max_offset())
+        self.refresh()
+
+    def refresh(self):
+        """Перезаполнить видимые строки (после изменения данных)."""
+        self._ensure_pool()
+        self._measure_visible()
+        first = self._index_at(self.offset)
+        viewport = self._viewport()
+        for slot, row in enumerate(self._rows):
+            index = first + slot
+            top = self._row_top(index) - self.offset if index < self.count else viewport
+            if top < viewport:
+                self.bind_row(row, index)
+                row.place(x=0, y=top, relwidth=1.0, height=self._row_height_px(index))
+            else:
+                row.place_forget()
+        self._update_scrollbar()
+
+    def scroll_to(self, index: int):
+        """Прокрутить так, чтобы строка index была видна."""
+        self._measure(index)
+        while True:
+            top = self._row_top(index)
+            bottom = top + self._row_height_px(index)
+            if top < self.offset:
+                self.offset = top
+            elif bottom > self.offset + self._viewport():
+                self.offset = bottom - self._viewport()
+            self.offset = max(0, min(self.offset, self._max_offset()))
+            # Уточнённые строки над index могли сдвинуть её — повторяем; каждая строка меряется один раз
+            if not self._measure_visible():
+                break
+        self.refresh()
+
+    def scroll_units(self, units: int):
+        self.offset = max(0, min(self._max_offset(), self.offset + units * self._row_px()))
+        self.refresh()
+
+    def visible_range(self):
+        first = self._index_at(self.offset)
+        return first, min(self.count, self._index_at(self.offset + self._viewport()) + 1)
+
+    # --- внутреннее ---
+
+    def _measure(self, index: int) -> bool:
+        """Уточняет высоту строки index через measure_row. True — высота изменилась."""
+        if not 0 <= index < len(self._measured) or self._measured[index]:
+            return False
+        self._measured[index] = True
+        height = max(self.row_height, self.measure_row(index))
+        if height == self._heights[index]:
+            return False
+        self._heights[index] = height
+        self._tops_scaling = None
+        return True
+
+    def _measure_visible(self) -> bool:
+        """Уточняет высоты видимых строк. True — какая-то из них изменилась."""
+        if not self._measured:
+            return False
+        # Идём от первой видимой строки, считая позиции сами: префиксные суммы
+        # пересчитываются один раз в конце, а не после каждой уточнённой строки
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        index = self._index_at(self.offset)
+        top = self._row_top(index)
+        bottom = self.offset + self._viewport()
+        changed = False
+        while index < self.count and top < bottom:
+            changed = self._measure(index) or changed
+            top += max(1, round(self._heights[index] * scaling))
+            index += 1
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        return changed
+
+    def _row_px(self) -> int:
+        # Строки размещаются place() в пикселях экрана, а CTk-виджеты масштабируются
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        return max(1, round(self.row_height * scaling))
+
+    def _scaled_tops(self) -> List[int]:
+        scaling = ctk.ScalingTracker.get_widget_scaling(self)
+        if self._tops_scaling != scaling:
+            tops = [0]
+            for height in self._heights or ():
+                tops.append(tops[-1] + max(1, round(height * scaling)))
+            self._tops = tops
+            self._tops_scaling = scaling
+        return self._tops
+
+    def _row_top(self, index: int) -> int:
+        if self._heights is None:
+            return index * self._row_px()
+        tops = self._scaled_tops()
+        return tops[min(index, len(tops) - 1)]
+
+    def _row_height_px(self, index: int) -> int:
+        if self._heights is None or not 0 <= index < len(self._heights):
+            return self._row_px()
+        tops = self._scaled_tops()
+        return tops[index + 1] - tops[index]
+
+    def _index_at(self, offset: int) -> int:
+        """Номер строки, на которую приходится пиксель offset."""
+        if self._heights is None:
+            return offset // self._row_px()
+        tops = self._scaled_tops()
+        return max(0, min(len(tops) - 2, bisect.bisect_right(tops, offset) - 1)) if len(tops) > 1 else 0
+
+    def _total_height(self) -> int:
+        return self._row_top(self.count) if self._heights is not None else self.count * self._row_px()
+
+    def _viewport(self) -> int:
+        return max(1, self.body.winfo_height())
+
+    def _max_offset(self) -> int:
+        return max(0, self._total_height() - self._viewport())
+
+    def _ensure_pool(self):
+        needed = math.ceil(self._viewport() / self._row_px()) + 1
+        while len(self._rows) < needed:
+            row = self.create_row(self.body)
+            self._add_wheel_tag(row)
+            self._rows.append(row)
+
+    def _add_wheel_tag(self, widget):
+        tags = widget.bindtags()
+        if self._wheel_tag not in tags:
+            widget.bindtags((self._wheel_tag,) + tags)
+        for child in widget.winfo_children():
+            self._add_wheel_tag(child)
+
+    def _on_wheel(self, event):
+        if sys.platform == "darwin":
+            steps = -event.delta
+        else:
+            steps = -int(event.delta / 120) * 3 or (-1 if event.delta > 0 else 1)
+        self.scroll_units(steps)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            total = max(1, self._total_height())
+            self.offset = int(float(args[0]) * total)
+        elif action == "scroll":
+            amount, what = int(args[0]), args[1]
+            step = self._viewport() if what == "pages" else self._row_px()
+            self.offset += amount * step
+        self.offset = max(0, min(self.offset, self._max_offset()))
+        self.refresh()
+
+    def _update_scrollbar(self):
+        total = self._total_height()
+        if total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self._viewport()) / total))
@@ -0,0 +1,221 @@
+import math
+import tkinter as tk
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageTk
+
+from core import tasks
+from core.image_pyramid import ImagePyramid
+
+
+class ZoomImageView(tk.Canvas):
+    """Просмотр картинки с зумом колесом мыши и перетаскиванием.
+
+    Рисуются только видимые тайлы текущего уровня пирамиды. Пока нужный
+    уровень достраивается в фоне, показывается ближайший готовый.
+    """
+
+    ZOOM_STEP = 1.25
+    MAX_ZOOM = 8.0
+
+    def __init__(self, master, pyramid: ImagePyramid, width: int, height: int, **kwargs):
+        kwargs.setdefault("bg", "#111111")
+        super().__init__(master, width=width, height=height, bd=0, highlightthickness=0, **kwargs)
+        self.pyramid = pyramid
+        self.zoom = 1.0
+        self.min_zoom = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+        # (уровень, tx, ty) -> (id на канвасе, PhotoImage); сбрасывается при смене зума
+        self._tiles: Dict[Tuple[int, int, int], Tuple[int, ImageTk.PhotoImage]] = {}
+        self._drawn_zoom: Optional[float] = None
+        self._drawn_level: Optional[int] = None
+        self._render_after_id = None
+        self._drag_from: Optional[Tuple[int, int]] = None
+        self._pending_build: Optional[tasks.TaskHandle] = None
+        self._build_failed = False  # файл не декодировался — не перезапускать сборку по кругу
+
+        self.bind("<Configure>", self._on_configure)
+        self.bind("<ButtonPress-1>", self._on_press)
+        self.bind("<B1-Motion>", self._on_drag)
+        self.bind("<ButtonRelease-1>", self._on_release)
+        self.bind("<Double-Button-1>", lambda _e: self.fit())
+        self.bind("<MouseWheel>", self._on_wheel)
+        self.bind("<Button-4>", lambda e: self._zoom_at(e.x, e.y, self.ZOOM_STEP))
+        self.bind("<Button-5>", lambda e: self._zoom_at(e.x, e.y, 1 / self.ZOOM_STEP))
+        self.bind("<Destroy>", self._on_destroy, add="+")
+
+        self._fit_pending = True
+
+    # --- управление видом ---
+
+    def fit(self):
+        cw, ch = self._canvas_size()
+        self.zoom = self.min_zoom = min(1.0, self.pyramid.fit_zoom(cw, ch))
+        self.offset_x = (cw - self.pyramid.width * self.zoom) / 2
+        self.offset_y = (ch - self.pyramid.height * self.zoom) / 2
+
+        # Уровень «во весь экран» строится в фоне (PNG/BMP декодируются целиком);
+        # до этого виден ближайший готовый уровень или надпись «Загрузка…»
+        self._clear_tiles()
+        self.schedule_render()
+
+    def _zoom_at(self, x: int, y: int, factor: float):
+        new_zoom = max(self.min_zoom, min(self.MAX_ZOOM, self.zoom * factor))
+        if math.isclose(new_zoom, self.zoom):
+            return
+        ratio = new_zoom / self.zoom
+        self.offset_x = x - (x - self.offset_x) * ratio
+        self.offset_y = y - (y - self.offset_y) * ratio
+        self.zoom = new_zoom
+        self._clamp_offset()
+        self.schedule_render()
+
+    def _clamp_offset(self):
+        cw, ch = self._canvas_size()
+        img_w = self.pyramid.width * self.zoom
+        img_h = self.pyramid.height * self.zoom
+        # Картинка меньше окна — по центру, больше — без пустых полей по краям
+        self.offset_x = (cw - img_w) / 2 if img_w <= cw else min(0.0, max(cw - img_w, self.offset_x))
+        self.offset_y = (ch - img_h) / 2 if img_h <= ch else min(0.0, max(ch - img_h, self.offset_y))
+
+    def _canvas_size(self) -> Tuple[int, int]:
+        return max(1, self.winfo_width()), max(1, self.winfo_height())
+
+    # --- события ---
+
+    def _on_configure(self, _event):
+        if self._fit_pending and self.winfo_width() > 1:
+            self._fit_pending = False
+            self.fit()
+        else:
+            self.schedule_render()
+
+    def _on_wheel(self, event):
+        factor = self.ZOOM_STEP if event.delta > 0 else 1 / self.ZOOM_STEP
+        self._zoom_at(event.x, event.y, factor)
+
+    def _on_press(self, event):
+        self._drag_from = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag_from is None:
+            return
+        dx = event.x - self._drag_from[0]
+        dy = event.y - self._drag_from[1]
+        self._drag_from = (event.x, event.y)
+        old_x, old_y = self.offset_x, self.offset_y
+        self.offset_x += dx
+        self.offset_y += dy
+        self._clamp_offset()
+        # Уже нарисованные тайлы просто сдвигаются, дорисовываются только новые
+        self.move("tile", self.offset_x - old_x, self.offset_y - old_y)
+        self.schedule_render()
+
+    def _on_release(self, _event):
+        self._drag_from = None
+
+    def _on_destroy(self, event):
+        if event.widget is not self:
+            return
+        if self._render_after_id:
+            try:
+                self.after_cancel(self._render_after_id)
+            except Exception:
+                pass
+        self._render_after_id = None
+        self._tiles.clear()
+        if self._pending_build is not None:
+            self._pending_build.cancel()
+            self._pending_build = None
+
+    # --- отрисовка ---
+
+    def schedule_render(self):
+        """Склеивает серию событий колеса/перетаскивания в одну перерисовку."""
+        if self._render_after_id is None:
+            self._render_after_id = self.after_idle(self._render)
+
+    def _clear_tiles(self):
+        self.delete("tile")
+        self._tiles.clear()
+
+    def _show_placeholder(self):
+        self.delete("placeholder")
+        cw, ch = self._canvas_size()
+        text = "Не удалось открыть изображение" if self._build_failed else "Загрузка…"
+        self.create_text(cw / 2, ch / 2, text=text, fill="#BBBBBB", tags="placeholder")
+
+    def _request_level(self, level: int):
+        if self._pending_build is not None or self._build_failed:
+            return
+        runner = tasks.get_runner()
+        handle = runner.submit(
+            self.pyramid.build_level, level, on_done=self._on_level_built, on_error=self._on_level_built, name="pyramid.build_level"
+        )
+        # В синхронном режиме обработчик уже отработал внутри submit
+        self._pending_build = None if runner.synchronous else handle
+
+    def _on_level_built(self, result):
+        self._pending_build = None
+        if result is None or isinstance(result, BaseException):
+            self._build_failed = True
+        self.schedule_render()
+
+    def _render(self):
+        self._render_after_id = None
+        if not self.winfo_exists():
+            return
+
+        wanted_level = self.pyramid.level_for_zoom(self.zoom)
+        level = wanted_level
+        if not self.pyramid.has_level(wanted_level):
+            self._request_level(wanted_level)
+            level = self.pyramid.nearest_built(wanted_level)
+            if level is None:
+                self._show_placeholder()
+                return
+        self.delete("placeholder")
+
+        if self._drawn_zoom != self.zoom or self._drawn_level != level:
+            self._clear_tiles()
+            self._drawn_zoom = self.zoom
+            self._drawn_level = level
+
+        # Масштаб тайла на экране относительно пикселей уровня
+        scale = self.zoom / self.pyramid.level_scale(level)
+        tile_px = ImagePyramid.TILE_SIZE * scale
+        cols, rows = self.pyramid.tile_grid(level)
+        cw, ch = self._canvas_size()
+
+        first_col = max(0, int(-self.offset_x // tile_px))
+        last_col = min(cols - 1, int((cw - self.offset_x) // tile_px))
+        first_row = max(0, int(-self.offset_y // tile_px))
+        last_row = min(rows - 1, int((ch - self.offset_y) // tile_px))
+
+        visible = set()
+        for ty in range(first_row, last_row + 1):
+            for tx in range(first_col, last_col + 1):
+                key = (level, tx, ty)
+                visible.add(key)
+                if key in self._tiles:
+                    continue
+                tile = self.pyramid.tile(level, tx, ty)
+                if tile is None:
+                    continue
+                x0 = round(self.offset_x + tx * tile_px)
+                y0 = round(self.offset_y + ty * tile_px)
+                # Края считаются от соседних координат, чтобы между тайлами не было щелей
+                w = max(1, round(self.offset_x + tx * tile_px + tile.width * scale) - x0)
+                h = max(1, round(self.offset_y + ty * tile_px + tile.height * scale) - y0)
+                if (w, h) != tile.size:
+                    resample = Image.Resampling.BILINEAR if scale < 2 else Image.Resampling.NEAREST
+                    tile = tile.resize((w, h), resample)
+                photo = ImageTk.PhotoImage(tile, master=self)
+                item = self.create_image(x0, y0, image=photo, anchor="nw", tags="tile")
+                self._tiles[key] = (item, photo)
+
+        for key in [k for k in self._tiles if k not in visible]:
+            item, _photo = self._tiles.pop(key)
+            self.delete(item)